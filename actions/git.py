@@ -1,26 +1,62 @@
-import subprocess
+import curses
+import itertools
 import os
+import shlex
+import time
 from typing import Tuple, List, Optional
-from utils.ui import ScrollableWindow, InputDialog, ConfirmDialog, show_message
-from menu import Menu
+from gittui.config.schema import CustomCommand
+from gittui.core.application import Application
+from gittui.core.events import Event, EventBus, EventType
+from gittui.core.loop import InputLoop
+from gittui.git.blame import BlameCache
+from gittui.git.clone import CloneOptions, CloneProgress, clone
+from gittui.git.commands import GitCommands
+from gittui.git.conflicts import ConflictSet
+from gittui.git.diff import DiffCache
+from gittui.git.history import HistoryCache
+from gittui.git.journal import Journal, JournalError
+from gittui.git.maintenance import Maintenance, MaintenanceJob
+from gittui.git.output import LazyLines, decode
+from gittui.git.rebase import RebasePlan, RebasePlanError
+from gittui.git.remotes import RemoteSet
+from gittui.git.repository import Repository
+from gittui.git.search import SearchIndex
+from gittui.git.sizes import SizeAnalyzer
+from gittui.git.sparse import SparseCheckout
+from gittui.git.stash import StashList
+from gittui.git.submodule import SubmoduleSet
+from gittui.git.worktree import Worktree, WorktreeManager
+from gittui.git.staging import StagingEngine, first_error
+from gittui.plugins.manager import PluginManager
+from gittui.plugins.executor import CommandContext, CommandError, CommandExecutor, load_commands, placeholders, tokenize
+from gittui.ui.blameview import BlameView
+from gittui.ui.conflictview import ConflictView
+from gittui.ui.diffview import DiffView
+from gittui.ui.historyview import HistoryView
+from gittui.ui.maintenanceview import MaintenanceView
+from gittui.ui.panels.command import CommandPanel
+from gittui.ui.progress import ProgressDialog, format_bytes
+from gittui.ui.rebaseview import RebaseView
+from gittui.ui.remoteview import RemoteView
+from gittui.ui.searchview import SearchView
+from gittui.ui.sizeview import SizeView
+from gittui.ui.sparseview import SparseView
+from gittui.ui.stashview import StashView
+from gittui.ui.submoduleview import SubmoduleView
+from gittui.ui.widgets import navigation_keys
+from gittui.ui.theme import Theme as PanelTheme
+from utils.ui import Theme, ScrollableWindow, InputDialog, ConfirmDialog, show_message
+from menu import Menu, add_activity_listener, load_config
+
+
+def run_git_command_bytes(command: List[str], cwd: str = ".", input: Optional[bytes] = None) -> Tuple[bool, bytes, bytes]:
+    result = GitCommands(cwd).execute(command, input=input)
+    return result.success, result.stdout, result.stderr
 
 
 def run_git_command(command: List[str], cwd: str = ".") -> Tuple[bool, str, str]:
-    try:
-        result = subprocess.run(
-            command,
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        return result.returncode == 0, result.stdout, result.stderr
-    except subprocess.TimeoutExpired:
-        return False, "", "Command timed out"
-    except FileNotFoundError:
-        return False, "", "Git is not installed or not in PATH"
-    except Exception as e:
-        return False, "", str(e)
+    success, stdout, stderr = run_git_command_bytes(command, cwd)
+    return success, decode(stdout), decode(stderr)
 
 
 def check_git_repo() -> bool:
@@ -31,32 +67,89 @@ def check_git_repo() -> bool:
 class GitActions:
     def __init__(self, stdscr):
         self.stdscr = stdscr
+        self._blame_cache: Optional[BlameCache] = None
+        self._history_cache: Optional[HistoryCache] = None
+        self._journal: Optional[Journal] = None
+        self._maintenance_job: Optional[MaintenanceJob] = None
+        self._size_analyzer: Optional[SizeAnalyzer] = None
+        self._remotes: Optional[RemoteSet] = None
+        self._activity_depth = 0
+        self._maintenance_open = False
+        add_activity_listener(self._on_activity)
+    
+    def _on_activity(self, delta: int):
+        self._activity_depth += delta
+        self._hold_maintenance()
+    
+    def _hold_maintenance(self):
+        job = self._maintenance_job
+        if job is not None:
+            # the maintenance panel runs the job itself; any other action holds it back
+            job.hold(self._activity_depth > 0 and not self._maintenance_open)
+    
+    def close(self):
+        # running blames and paused log readers would outlive the menu otherwise
+        if self._blame_cache is not None:
+            self._blame_cache.clear()
+        if self._history_cache is not None:
+            self._history_cache.clear()
+    
+    def blame_cache(self, repo: Repository) -> BlameCache:
+        if self._blame_cache is None or self._blame_cache.repo.root() != repo.root():
+            if self._blame_cache is not None:
+                self._blame_cache.clear()
+            self._blame_cache = BlameCache(repo, load_config().general.blame_cache_size)
+        return self._blame_cache
+    
+    def panel_view(self):
+        if not check_git_repo():
+            show_message(self.stdscr, "Not a git repository!", "error")
+            return
+        
+        Application().main(self.stdscr)
+    
+    def history_cache(self, repo: Repository) -> HistoryCache:
+        if self._history_cache is None or self._history_cache.repo.root() != repo.root():
+            if self._history_cache is not None:
+                self._history_cache.clear()
+            general = load_config().general
+            self._history_cache = HistoryCache(
+                repo,
+                page_size=general.history_page_size,
+                manage_commit_graph=general.manage_commit_graph,
+            )
+        return self._history_cache
+    
+    def journal(self) -> Journal:
+        repo = Repository()
+        if self._journal is None or self._journal.repo.root() != repo.root():
+            self._journal = Journal(repo)
+        return self._journal
     
     def git_status(self):
         if not check_git_repo():
             show_message(self.stdscr, "Not a git repository!", "error")
             return
         
-        success, stdout, stderr = run_git_command(['git', 'status'])
+        success, stdout, stderr = run_git_command_bytes(['git', 'status'])
         
         if success:
-            lines = stdout.split('\n')
-            ScrollableWindow(self.stdscr, lines, "Git Status").show()
+            ScrollableWindow(self.stdscr, LazyLines(stdout), "Git Status").show()
         else:
-            show_message(self.stdscr, f"Error:\n{stderr}", "error")
+            show_message(self.stdscr, f"Error:\n{decode(stderr)}", "error")
     
     def git_add(self):
         if not check_git_repo():
             show_message(self.stdscr, "Not a git repository!", "error")
             return
         
-        success, stdout, stderr = run_git_command(['git', 'status', '--short'])
+        success, stdout, stderr = run_git_command_bytes(['git', 'status', '--porcelain', '-z'])
         
         if not success:
-            show_message(self.stdscr, f"Error:\n{stderr}", "error")
+            show_message(self.stdscr, f"Error:\n{decode(stderr)}", "error")
             return
         
-        if not stdout.strip():
+        if not stdout:
             show_message(self.stdscr, "No changes to add!", "info")
             return
         
@@ -74,14 +167,56 @@ class GitActions:
         else:
             show_message(self.stdscr, f"Error:\n{stderr}", "error")
     
+    def git_unstage(self):
+        if not check_git_repo():
+            show_message(self.stdscr, "Not a git repository!", "error")
+            return
+        
+        repo = Repository()
+        staged = [entry for entry in repo.status() if entry.staged]
+        
+        if not staged:
+            show_message(self.stdscr, "No staged changes to unstage!", "info")
+            return
+        
+        preview = ', '.join(entry.path for entry in staged[:5])
+        if len(staged) > 5:
+            preview += f", ... ({len(staged)} files)"
+        
+        dialog = InputDialog(self.stdscr, f"Staged: {preview}\nEnter files to unstage (or . for all):", ".")
+        files = dialog.get_input()
+        
+        if files is None:
+            show_message(self.stdscr, "Unstage cancelled.", "info")
+            return
+        
+        if files.strip() == ".":
+            selected = staged
+        else:
+            wanted = set(files.split())
+            selected = [entry for entry in staged if entry.path in wanted]
+        
+        if not selected:
+            show_message(self.stdscr, "None of those files are staged.", "warning")
+            return
+        
+        engine = StagingEngine(repo)
+        engine.unstage(selected)
+        error = first_error(engine.flush())
+        
+        if error:
+            show_message(self.stdscr, f"Error:\n{error}", "error")
+        else:
+            show_message(self.stdscr, f"Unstaged {len(selected)} file(s).", "success")
+    
     def git_commit(self):
         if not check_git_repo():
             show_message(self.stdscr, "Not a git repository!", "error")
             return
         
-        success, stdout, stderr = run_git_command(['git', 'diff', '--cached', '--name-only'])
+        success, stdout, stderr = run_git_command_bytes(['git', 'diff', '--cached', '--name-only', '-z'])
         
-        if not success or not stdout.strip():
+        if not success or not stdout:
             show_message(self.stdscr, "No staged changes to commit!\nUse 'Git Add' first.", "warning")
             return
         
@@ -92,7 +227,8 @@ class GitActions:
             show_message(self.stdscr, "Commit cancelled (empty message).", "info")
             return
         
-        success, stdout, stderr = run_git_command(['git', 'commit', '-m', message])
+        with self.journal().record("commit"):
+            success, stdout, stderr = run_git_command(['git', 'commit', '-m', message])
         
         if success:
             show_message(self.stdscr, f"Commit successful!\n{stdout}", "success")
@@ -136,6 +272,7 @@ class GitActions:
         success, stdout, stderr = run_git_command(['git', 'pull'])
         
         if success:
+            self.refresh_search_index()
             show_message(self.stdscr, f"Pull successful!\n{stdout}", "success")
         else:
             show_message(self.stdscr, f"Pull failed:\n{stderr}", "error")
@@ -150,6 +287,7 @@ class GitActions:
         success, stdout, stderr = run_git_command(['git', 'fetch', '--all'])
         
         if success:
+            self.refresh_search_index()
             show_message(self.stdscr, f"Fetch successful!\n{stdout if stdout else 'All refs up to date.'}", "success")
         else:
             show_message(self.stdscr, f"Fetch failed:\n{stderr}", "error")
@@ -169,13 +307,12 @@ class GitActions:
         branch_menu.run()
     
     def git_list_branches(self):
-        success, stdout, stderr = run_git_command(['git', 'branch', '-a'])
+        success, stdout, stderr = run_git_command_bytes(['git', 'branch', '-a'])
         
         if success:
-            lines = stdout.split('\n')
-            ScrollableWindow(self.stdscr, lines, "All Branches").show()
+            ScrollableWindow(self.stdscr, LazyLines(stdout), "All Branches").show()
         else:
-            show_message(self.stdscr, f"Error:\n{stderr}", "error")
+            show_message(self.stdscr, f"Error:\n{decode(stderr)}", "error")
     
     def git_create_branch(self):
         dialog = InputDialog(self.stdscr, "Enter new branch name:")
@@ -212,7 +349,8 @@ class GitActions:
             show_message(self.stdscr, "Switch cancelled.", "info")
             return
         
-        success, stdout, stderr = run_git_command(['git', 'checkout', branch_name])
+        with self.journal().record(f"checkout {branch_name}", (f"refs/heads/{branch_name}",)):
+            success, stdout, stderr = run_git_command(['git', 'checkout', branch_name])
         
         if success:
             show_message(self.stdscr, f"Switched to branch '{branch_name}'", "success")
@@ -244,13 +382,245 @@ class GitActions:
             show_message(self.stdscr, "Delete cancelled.", "info")
             return
         
-        success, stdout, stderr = run_git_command(['git', 'branch', '-d', branch_name])
+        with self.journal().record(f"delete branch {branch_name}", (f"refs/heads/{branch_name}",)):
+            success, stdout, stderr = run_git_command(['git', 'branch', '-d', branch_name])
         
         if success:
             show_message(self.stdscr, f"Branch '{branch_name}' deleted successfully!", "success")
         else:
             show_message(self.stdscr, f"Error:\n{stderr}\n\nUse 'git branch -D' manually for force delete.", "error")
     
+    def repository_maintenance(self):
+        if not check_git_repo():
+            show_message(self.stdscr, "Not a git repository!", "error")
+            return
+        
+        repo = Repository()
+        job = self._maintenance_job
+        # a job keeps running in the background after leaving the panel
+        if job is not None and job.maintenance.repo.root() != repo.root():
+            job = None
+        
+        config = load_config()
+        theme = PanelTheme(config.theme)
+        theme.setup()
+        keys = navigation_keys(config.keybindings.navigation)
+        view = MaintenanceView(self.stdscr, job.maintenance if job else Maintenance(repo), theme, keys, job)
+        self._maintenance_open = True
+        self._hold_maintenance()
+        try:
+            view.show()
+        finally:
+            self._maintenance_open = False
+            self._maintenance_job = view.job
+            self._hold_maintenance()
+    
+    def submodules(self):
+        if not check_git_repo():
+            show_message(self.stdscr, "Not a git repository!", "error")
+            return
+        
+        config = load_config()
+        theme = PanelTheme(config.theme)
+        theme.setup()
+        keys = navigation_keys(config.keybindings.navigation)
+        submodules = SubmoduleSet(Repository(), config.general.submodule_jobs)
+        SubmoduleView(self.stdscr, submodules, theme, keys).show()
+    
+    def repository_size(self):
+        if not check_git_repo():
+            show_message(self.stdscr, "Not a git repository!", "error")
+            return
+        
+        repo = Repository()
+        analyzer = self._size_analyzer
+        # a finished or running analysis is kept for the next visit
+        if analyzer is None or analyzer.repo.root() != repo.root():
+            analyzer = SizeAnalyzer(repo)
+        
+        config = load_config()
+        theme = PanelTheme(config.theme)
+        theme.setup()
+        keys = navigation_keys(config.keybindings.navigation)
+        view = SizeView(self.stdscr, analyzer, theme, keys)
+        view.show()
+        self._size_analyzer = view.analyzer
+    
+    def git_stash(self):
+        if not check_git_repo():
+            show_message(self.stdscr, "Not a git repository!", "error")
+            return
+        
+        stash_menu = Menu(self.stdscr, "Git Stash", [
+            ("Stash Panel", self.stash_panel),
+            ("Stash Changes", self.stash_push),
+            ("Back", None)
+        ])
+        stash_menu.run()
+    
+    def stash_panel(self):
+        config = load_config()
+        theme = PanelTheme(config.theme)
+        theme.setup()
+        keys = navigation_keys(config.keybindings.navigation)
+        StashView(self.stdscr, StashList(Repository()), theme, keys, config.keybindings.stash).show()
+    
+    def stash_push(self):
+        dialog = InputDialog(self.stdscr, "Stash message (optional):")
+        message = dialog.get_input()
+        if message is None:
+            show_message(self.stdscr, "Stash cancelled.", "info")
+            return
+        
+        confirm = ConfirmDialog(self.stdscr, "Include untracked files?")
+        result = StashList(Repository()).push(message, confirm.confirm())
+        
+        if result.success:
+            show_message(self.stdscr, result.text.strip() or "No local changes to save.", "success")
+        else:
+            show_message(self.stdscr, f"Error:\n{result.error}", "error")
+    
+    def sparse_checkout(self):
+        if not check_git_repo():
+            show_message(self.stdscr, "Not a git repository!", "error")
+            return
+        
+        sparse_menu = Menu(self.stdscr, "Sparse Checkout", [
+            ("Choose Directories", self.sparse_choose_directories),
+            ("Show Patterns", self.sparse_show_patterns),
+            ("Disable Sparse Checkout", self.sparse_disable),
+            ("Back", None)
+        ])
+        sparse_menu.run()
+    
+    def sparse_choose_directories(self):
+        config = load_config()
+        theme = PanelTheme(config.theme)
+        theme.setup()
+        keys = navigation_keys(config.keybindings.navigation)
+        SparseView(self.stdscr, SparseCheckout(Repository()), theme, keys).show()
+    
+    def sparse_show_patterns(self):
+        sparse = SparseCheckout(Repository())
+        if not sparse.enabled():
+            show_message(self.stdscr, "Sparse checkout is not enabled.", "info")
+            return
+        
+        ScrollableWindow(self.stdscr, LazyLines(b"\n".join(sparse.patterns())), "Sparse Checkout Patterns").show()
+    
+    def sparse_disable(self):
+        sparse = SparseCheckout(Repository())
+        if not sparse.enabled():
+            show_message(self.stdscr, "Sparse checkout is not enabled.", "info")
+            return
+        
+        confirm = ConfirmDialog(self.stdscr, "Disable sparse checkout?\nThe full tree will be checked out.")
+        if not confirm.confirm():
+            return
+        
+        show_message(self.stdscr, "Checking out the full tree...", "info", wait=False)
+        result = sparse.disable()
+        
+        if result.success:
+            show_message(self.stdscr, "Sparse checkout disabled.", "success")
+        else:
+            show_message(self.stdscr, f"Error:\n{result.error}", "error")
+    
+    def worktrees(self):
+        if not check_git_repo():
+            show_message(self.stdscr, "Not a git repository!", "error")
+            return
+        
+        worktree_menu = Menu(self.stdscr, "Worktrees", [
+            ("List Worktrees", self.worktree_list),
+            ("Open Worktree", lambda: self.worktree_pick("Open Worktree", self.worktree_open)),
+            ("Add Worktree", self.worktree_add),
+            ("Remove Worktree", lambda: self.worktree_pick("Remove Worktree", self.worktree_remove)),
+            ("Prune Worktrees", self.worktree_prune),
+            ("Back", None)
+        ])
+        worktree_menu.run()
+    
+    def worktree_list(self):
+        lines = []
+        for worktree in WorktreeManager(Repository()).list():
+            flags = [flag for flag, value in (("locked", worktree.locked), ("prunable", worktree.prunable)) if value is not None]
+            suffix = f" [{', '.join(flags)}]" if flags else ""
+            lines.append(f"{worktree.label:<30} {(worktree.head or '')[:8]}  {worktree.path}{suffix}")
+        ScrollableWindow(self.stdscr, lines, "Worktrees").show()
+    
+    def worktree_pick(self, title: str, action):
+        worktrees = WorktreeManager(Repository()).list()
+        if not worktrees:
+            show_message(self.stdscr, "No worktrees found!", "warning")
+            return
+        
+        items = [(f"{wt.label}  {wt.path}", lambda wt=wt: action(wt)) for wt in worktrees]
+        Menu(self.stdscr, title, items + [("Back", None)]).run()
+    
+    def worktree_open(self, worktree: Worktree):
+        if worktree.bare or not os.path.isdir(worktree.path):
+            show_message(self.stdscr, f"Cannot open {worktree.path}", "error")
+            return
+        
+        Application(worktree.path).main(self.stdscr)
+    
+    def worktree_add(self):
+        dialog = InputDialog(self.stdscr, "Enter path for the new worktree:")
+        path = dialog.get_input()
+        
+        if not path:
+            show_message(self.stdscr, "Add worktree cancelled.", "info")
+            return
+        
+        branch_dialog = InputDialog(self.stdscr, "Enter new branch name (empty to check out an existing ref):", "")
+        new_branch = branch_dialog.get_input()
+        
+        commitish = None
+        if not new_branch:
+            commitish = InputDialog(self.stdscr, "Enter branch or commit to check out:", "HEAD").get_input()
+            if not commitish:
+                show_message(self.stdscr, "Add worktree cancelled.", "info")
+                return
+        
+        show_message(self.stdscr, "Creating worktree...", "info", wait=False)
+        result = WorktreeManager(Repository()).add(path, commitish, new_branch or None)
+        
+        if result.success:
+            show_message(self.stdscr, f"Worktree created at {path}\n{result.error}", "success")
+        else:
+            show_message(self.stdscr, f"Error:\n{result.error}", "error")
+    
+    def worktree_remove(self, worktree: Worktree):
+        manager = WorktreeManager(Repository())
+        if worktree.path == manager.list()[0].path:
+            show_message(self.stdscr, "The main worktree cannot be removed!", "error")
+            return
+        
+        confirm = ConfirmDialog(self.stdscr, f"Remove worktree '{worktree.path}'?")
+        if not confirm.confirm():
+            show_message(self.stdscr, "Remove cancelled.", "info")
+            return
+        
+        result = manager.remove(worktree)
+        if not result.success and "--force" in result.error:
+            force = ConfirmDialog(self.stdscr, f"{result.error.strip()}\n\nForce removal and discard changes?")
+            if force.confirm():
+                result = manager.remove(worktree, force=True)
+        
+        if result.success:
+            show_message(self.stdscr, f"Worktree '{worktree.path}' removed.", "success")
+        else:
+            show_message(self.stdscr, f"Error:\n{result.error}", "error")
+    
+    def worktree_prune(self):
+        result = WorktreeManager(Repository()).prune()
+        
+        if result.success:
+            show_message(self.stdscr, f"Pruned stale worktrees.\n{result.error or 'Nothing to prune.'}", "success")
+        else:
+            show_message(self.stdscr, f"Error:\n{result.error}", "error")
+    
     def git_checkout(self):
         if not check_git_repo():
             show_message(self.stdscr, "Not a git repository!", "error")
@@ -263,7 +633,8 @@ class GitActions:
             show_message(self.stdscr, "Checkout cancelled.", "info")
             return
         
-        success, stdout, stderr = run_git_command(['git', 'checkout', target])
+        with self.journal().record(f"checkout {target}", (f"refs/heads/{target}",)):
+            success, stdout, stderr = run_git_command(['git', 'checkout', target])
         
         if success:
             show_message(self.stdscr, f"Checked out: {target}\n{stdout}", "success")
@@ -287,12 +658,13 @@ class GitActions:
             show_message(self.stdscr, "Merge cancelled.", "info")
             return
         
-        success, stdout, stderr = run_git_command(['git', 'merge', branch])
+        with self.journal().record(f"merge {branch}"):
+            success, stdout, stderr = run_git_command(['git', 'merge', branch])
         
         if success:
             show_message(self.stdscr, f"Merge successful!\n{stdout}", "success")
-        else:
-            show_message(self.stdscr, f"Merge failed:\n{stderr}\n\nResolve conflicts manually.", "error")
+        elif not self.offer_conflicts("Merge", stderr or stdout):
+            show_message(self.stdscr, f"Merge failed:\n{stderr}", "error")
     
     def git_rebase(self):
         if not check_git_repo():
@@ -311,41 +683,230 @@ class GitActions:
             show_message(self.stdscr, "Rebase cancelled.", "info")
             return
         
-        success, stdout, stderr = run_git_command(['git', 'rebase', branch])
+        with self.journal().record(f"rebase onto {branch}"):
+            success, stdout, stderr = run_git_command(['git', 'rebase', branch])
         
         if success:
             show_message(self.stdscr, f"Rebase successful!\n{stdout}", "success")
+        elif not self.offer_conflicts("Rebase", stderr or stdout):
+            show_message(self.stdscr, f"Rebase failed:\n{stderr}", "error")
+    
+    def git_rebase_interactive(self):
+        if not check_git_repo():
+            show_message(self.stdscr, "Not a git repository!", "error")
+            return
+        
+        dialog = InputDialog(self.stdscr, "Rebase commits since (branch or commit):", "@{upstream}")
+        upstream = dialog.get_input()
+        if not upstream:
+            show_message(self.stdscr, "Rebase cancelled.", "info")
+            return
+        
+        plan = RebasePlan(Repository(), upstream)
+        try:
+            plan.load()
+        except RebasePlanError as e:
+            show_message(self.stdscr, f"Error:\n{e}", "error")
+            return
+        
+        config = load_config()
+        theme = PanelTheme(config.theme)
+        theme.setup()
+        keys = navigation_keys(config.keybindings.navigation)
+        # branches stacked on the rebased commits may move with --update-refs
+        stacked = tuple(ref for item in plan.items for ref in item.refs)
+        with self.journal().record(f"interactive rebase onto {upstream}", stacked):
+            result = RebaseView(self.stdscr, plan, theme, keys, config.keybindings.commits).show()
+        
+        if result is None:
+            return
+        if result.success:
+            moved = "".join(f"\n  {ref}" for ref in plan.updated_refs())
+            show_message(self.stdscr, f"Rebase successful!{' Updated:' if moved else ''}{moved}", "success")
+        elif not self.offer_conflicts("Rebase", result.error):
+            show_message(self.stdscr, f"Rebase failed:\n{result.error}", "error")
+    
+    def offer_conflicts(self, label: str, output: str) -> bool:
+        conflicts = ConflictSet(Repository())
+        if not conflicts.load():
+            return False
+        
+        confirm = ConfirmDialog(self.stdscr, f"{label} stopped with {len(conflicts.entries)} conflicted file(s).\nOpen the conflict panel?")
+        if confirm.confirm():
+            self.open_conflicts(conflicts)
         else:
-            show_message(self.stdscr, f"Rebase failed:\n{stderr}\n\nResolve conflicts or abort with 'git rebase --abort'.", "error")
+            show_message(self.stdscr, f"{label} stopped with conflicts:\n{output}\n\nUse Resolve Conflicts to continue or abort.", "info")
+        return True
+    
+    def resolve_conflicts(self):
+        if not check_git_repo():
+            show_message(self.stdscr, "Not a git repository!", "error")
+            return
+        
+        conflicts = ConflictSet(Repository())
+        if conflicts.operation() is None and not conflicts.load():
+            show_message(self.stdscr, "No merge, rebase, cherry-pick or revert in progress.", "info")
+            return
+        self.open_conflicts(conflicts)
+    
+    def open_conflicts(self, conflicts: ConflictSet):
+        config = load_config()
+        theme = PanelTheme(config.theme)
+        theme.setup()
+        keys = navigation_keys(config.keybindings.navigation)
+        ConflictView(self.stdscr, conflicts, theme, keys).show()
+    
+    def operation_journal(self):
+        if not check_git_repo():
+            show_message(self.stdscr, "Not a git repository!", "error")
+            return
+        
+        journal_menu = Menu(self.stdscr, "Operation Journal", [
+            ("Undo", self.journal_undo),
+            ("Redo", self.journal_redo),
+            ("Show Journal", self.journal_show),
+            ("Back", None)
+        ])
+        journal_menu.run()
+    
+    def journal_undo(self):
+        journal = self.journal()
+        if not journal.can_undo():
+            show_message(self.stdscr, "Nothing to undo.", "info")
+            return
+        
+        operation = journal.entries[journal.position - 1]
+        confirm = ConfirmDialog(self.stdscr, f"Undo '{operation.label}'?\nRefs and the working tree are moved back.")
+        if not confirm.confirm():
+            return
+        
+        try:
+            journal.undo()
+        except JournalError as e:
+            show_message(self.stdscr, f"Undo failed:\n{e}", "error")
+            return
+        show_message(self.stdscr, f"Undid '{operation.label}'", "success")
+    
+    def journal_redo(self):
+        journal = self.journal()
+        if not journal.can_redo():
+            show_message(self.stdscr, "Nothing to redo.", "info")
+            return
+        
+        try:
+            operation = journal.redo()
+        except JournalError as e:
+            show_message(self.stdscr, f"Redo failed:\n{e}", "error")
+            return
+        show_message(self.stdscr, f"Redid '{operation.label}'", "success")
+    
+    def journal_show(self):
+        journal = self.journal()
+        journal.load()
+        if not journal.entries:
+            show_message(self.stdscr, "The journal is empty.", "info")
+            return
+        
+        lines = []
+        for index, operation in reversed(list(enumerate(journal.entries))):
+            marker = "  " if index < journal.position else "↷ "
+            stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(operation.timestamp))
+            before = (operation.before.head or "")[:8] or "-"
+            after = (operation.after.head or "")[:8] or "-"
+            lines.append(f"{marker}{stamp}  {before} → {after}  {operation.label}")
+        ScrollableWindow(self.stdscr, lines, "Operation Journal (↷ = undone)").show()
     
     def git_log(self):
         if not check_git_repo():
             show_message(self.stdscr, "Not a git repository!", "error")
             return
         
-        success, stdout, stderr = run_git_command(['git', 'log', '--oneline', '--graph', '--decorate', '--all', '-30'])
+        success, stdout, stderr = run_git_command_bytes(['git', 'log', '--oneline', '--graph', '--decorate', '--all', '-30'])
         
         if success:
-            lines = stdout.split('\n')
-            ScrollableWindow(self.stdscr, lines, "Git Log (Last 30 commits)").show()
+            ScrollableWindow(self.stdscr, LazyLines(stdout), "Git Log (Last 30 commits)").show()
         else:
+            show_message(self.stdscr, f"Error:\n{decode(stderr)}", "error")
+    
+    def git_file_history(self):
+        if not check_git_repo():
+            show_message(self.stdscr, "Not a git repository!", "error")
+            return
+        
+        dialog = InputDialog(self.stdscr, "Enter file or directory (or . for current):", ".")
+        path = dialog.get_input()
+        
+        if not path:
+            return
+        
+        success, stdout, stderr = run_git_command(['git', 'rev-parse', '--show-prefix'])
+        if not success:
             show_message(self.stdscr, f"Error:\n{stderr}", "error")
+            return
+        
+        raw_path = os.path.normpath(os.path.join(stdout.strip(), path)).encode('utf-8', 'surrogateescape')
+        if raw_path.startswith(b".."):
+            show_message(self.stdscr, "Path is outside the repository!", "error")
+            return
+        
+        repo = Repository()
+        theme = PanelTheme(load_config().theme)
+        theme.setup()
+        HistoryView(self.stdscr, self.history_cache(repo), theme, raw_path,
+                    blame_cache=self.blame_cache(repo)).show()
+    
+    def search_commits(self):
+        if not check_git_repo():
+            show_message(self.stdscr, "Not a git repository!", "error")
+            return
+        
+        theme = PanelTheme(load_config().theme)
+        theme.setup()
+        SearchView(self.stdscr, SearchIndex(Repository()), theme).show()
+    
+    def refresh_search_index(self):
+        index = SearchIndex(Repository())
+        if index.exists():
+            index.update_async()
     
     def git_diff(self):
         if not check_git_repo():
             show_message(self.stdscr, "Not a git repository!", "error")
             return
         
-        success, stdout, stderr = run_git_command(['git', 'diff'])
+        repo = Repository()
+        cache = DiffCache(repo, load_config().general.diff_context_lines)
+        files = cache.files()
         
-        if success:
-            if not stdout.strip():
-                show_message(self.stdscr, "No differences found in working directory.\n\nTry 'git diff --cached' for staged changes.", "info")
-            else:
-                lines = stdout.split('\n')
-                ScrollableWindow(self.stdscr, lines, "Git Diff").show()
-        else:
-            show_message(self.stdscr, f"Error:\n{stderr}", "error")
+        if not files:
+            show_message(self.stdscr, "No differences found in working directory.\n\nTry 'git diff --cached' for staged changes.", "info")
+            return
+        
+        theme = PanelTheme(load_config().theme)
+        theme.setup()
+        DiffView(self.stdscr, cache, theme, blame_cache=self.blame_cache(repo)).show()
+    
+    def git_blame(self):
+        if not check_git_repo():
+            show_message(self.stdscr, "Not a git repository!", "error")
+            return
+        
+        dialog = InputDialog(self.stdscr, "Enter file to blame:")
+        path = dialog.get_input()
+        
+        if not path:
+            return
+        
+        success, stdout, stderr = run_git_command_bytes(['git', 'ls-files', '--full-name', '-z', '--error-unmatch', '--', path])
+        if not success:
+            show_message(self.stdscr, f"Error:\n{decode(stderr)}", "error")
+            return
+        
+        repo = Repository()
+        theme = PanelTheme(load_config().theme)
+        theme.setup()
+        raw_path = stdout.split(b"\0", 1)[0]
+        BlameView(self.stdscr, self.blame_cache(repo), theme, raw_path).show()
     
     def git_remote(self):
         if not check_git_repo():
@@ -363,16 +924,28 @@ class GitActions:
         remote_menu.run()
     
     def git_list_remotes(self):
-        success, stdout, stderr = run_git_command(['git', 'remote', '-v'])
-        
-        if success:
-            if not stdout.strip():
-                show_message(self.stdscr, "No remotes configured.\n\nUse 'Add Remote' to add one.", "info")
-            else:
-                lines = stdout.split('\n')
-                ScrollableWindow(self.stdscr, lines, "Git Remotes").show()
-        else:
-            show_message(self.stdscr, f"Error:\n{stderr}", "error")
+        self.show_remotes()
+    
+    def show_remotes(self, focus_details: bool = False):
+        config = load_config()
+        repo = Repository()
+        remotes = self._remotes
+        # kept across visits so a check still running in the background lands here
+        if remotes is None or remotes.repo.root() != repo.root():
+            remotes = RemoteSet(repo, config.general.command_workers)
+        remotes.load()
+        self._remotes = remotes
+        if config.general.remote_snapshots:
+            stale = remotes.stale()
+            if stale:
+                remotes.refresh_async(stale)
+        
+        theme = PanelTheme(config.theme)
+        theme.setup()
+        keys = navigation_keys(config.keybindings.navigation)
+        view = RemoteView(self.stdscr, remotes, theme, keys)
+        view.focus_details = focus_details
+        view.show()
     
     def git_add_remote(self):
         name_dialog = InputDialog(self.stdscr, "Enter remote name (e.g., origin):")
@@ -468,34 +1041,22 @@ class GitActions:
             show_message(self.stdscr, f"Error:\n{stderr}", "error")
     
     def git_show_remote(self):
-        success, stdout, stderr = run_git_command(['git', 'remote'])
-        
-        if not success:
-            show_message(self.stdscr, f"Error:\n{stderr}", "error")
-            return
-        
-        remotes = [r.strip() for r in stdout.split('\n') if r.strip()]
-        
-        if not remotes:
-            show_message(self.stdscr, "No remotes configured!", "warning")
-            return
-        
-        dialog = InputDialog(self.stdscr, f"Available: {', '.join(remotes)}\nEnter remote to show:")
-        remote_name = dialog.get_input()
-        
-        if not remote_name:
-            show_message(self.stdscr, "Show cancelled.", "info")
-            return
-        
-        success, stdout, stderr = run_git_command(['git', 'remote', 'show', remote_name])
-        
-        if success:
-            lines = stdout.split('\n')
-            ScrollableWindow(self.stdscr, lines, f"Remote Info: {remote_name}").show()
-        else:
-            show_message(self.stdscr, f"Error:\n{stderr}", "error")
+        # everything shown comes from local refs and cached snapshots, never a blocking `git remote show`
+        self.show_remotes(focus_details=True)
     
     def clone_repository(self):
+        clone_menu = Menu(self.stdscr, "Clone Repository", [
+            ("Full Clone", lambda: self.run_clone()),
+            ("Blobless Clone (--filter=blob:none)", lambda: self.run_clone(filter="blob:none")),
+            ("Shallow Clone (--depth)", lambda: self.run_clone(depth=1)),
+            ("Shallow Single-Branch Clone", lambda: self.run_clone(depth=1, single_branch=True)),
+            ("Sparse Blobless Clone (cone)", lambda: self.run_clone(filter="blob:none", sparse=True)),
+            ("Back", None)
+        ])
+        clone_menu.run()
+    
+    def run_clone(self, filter: Optional[str] = None, depth: Optional[int] = None,
+                  single_branch: bool = False, sparse: bool = False):
         dialog = InputDialog(self.stdscr, "Enter repository URL to clone:")
         repo_url = dialog.get_input()
         
@@ -506,18 +1067,44 @@ class GitActions:
         target_dialog = InputDialog(self.stdscr, "Enter target directory (optional):", "")
         target_dir = target_dialog.get_input()
         
-        show_message(self.stdscr, "Cloning repository...\nThis may take a while.", "info", wait=False)
-        
-        cmd = ['git', 'clone', repo_url]
-        if target_dir:
-            cmd.append(target_dir)
-        
-        success, stdout, stderr = run_git_command(cmd)
-        
-        if success:
-            show_message(self.stdscr, f"Clone successful!\n{stdout}", "success")
+        options = CloneOptions(repo_url, target_dir or None, filter=filter, single_branch=single_branch)
+        
+        if depth is not None:
+            depth_input = InputDialog(self.stdscr, "Enter clone depth:", str(depth)).get_input()
+            if not depth_input or not depth_input.isdigit() or int(depth_input) < 1:
+                show_message(self.stdscr, "Depth must be a positive number.", "error")
+                return
+            options.depth = int(depth_input)
+        
+        if sparse:
+            patterns = InputDialog(self.stdscr, "Enter directories to check out (space separated):").get_input()
+            if not patterns:
+                show_message(self.stdscr, "Clone cancelled.", "info")
+                return
+            options.sparse = patterns.split()
+        
+        theme = PanelTheme(load_config().theme)
+        theme.setup()
+        progress_dialog = ProgressDialog(self.stdscr, theme, f"Cloning {options.target()}")
+        
+        def on_progress(progress: CloneProgress) -> bool:
+            fraction = progress.percent / 100 if progress.percent is not None else 0.0
+            rate = progress.rate or f"{format_bytes(progress.throughput)}/s"
+            progress_dialog.draw(progress.phase, fraction, [
+                f"Objects:    {progress.current}/{progress.total}",
+                f"Received:   {format_bytes(progress.received)}",
+                f"Throughput: {rate}",
+                f"Elapsed:    {progress.elapsed:.1f}s",
+            ])
+            return not progress_dialog.poll_cancel()
+        
+        progress_dialog.draw("Connecting...", 0.0, [repo_url], force=True)
+        result = clone(options, on_progress=on_progress)
+        
+        if result.success:
+            show_message(self.stdscr, f"Clone successful!\n{result.text}", "success")
         else:
-            show_message(self.stdscr, f"Clone failed:\n{stderr}", "error")
+            show_message(self.stdscr, f"Clone failed:\n{result.error}", "error")
     
     def init_repository(self):
         if check_git_repo():
@@ -535,3 +1122,151 @@ class GitActions:
             show_message(self.stdscr, f"Git repository initialized!\n{stdout}", "success")
         else:
             show_message(self.stdscr, f"Error:\n{stderr}", "error")
+    
+    def custom_commands(self):
+        commands = load_commands(load_config().commands)
+        
+        if not commands:
+            show_message(self.stdscr, "No custom commands configured.", "info")
+            return
+        
+        items = []
+        for command in commands:
+            label = f"{command.name} - {command.description}" if command.description else command.name
+            items.append((label, lambda command=command: self.run_custom_command(command)))
+        items.append(("Back", None))
+        
+        Menu(self.stdscr, "Custom Commands", items).run()
+    
+    def run_custom_command(self, command: CustomCommand):
+        config = load_config()
+        
+        try:
+            names = sorted(placeholders(tokenize(command.command)))
+        except CommandError as e:
+            show_message(self.stdscr, f"Error:\n{e}", "error")
+            return
+        
+        choices = []
+        for name in names:
+            default = ""
+            if name == "branch":
+                _, default, _ = run_git_command(['git', 'rev-parse', '--abbrev-ref', 'HEAD'])
+            dialog = InputDialog(self.stdscr, f"Enter {name} (space-separated for several):", default.strip())
+            value = dialog.get_input()
+            try:
+                values = shlex.split(value) if value else []
+            except ValueError as e:
+                show_message(self.stdscr, f"Error:\nCannot parse {name}: {e}", "error")
+                return
+            if not values:
+                show_message(self.stdscr, "Command cancelled.", "info")
+                return
+            choices.append(values)
+        
+        contexts = [CommandContext(extra=dict(zip(names, values))) for values in itertools.product(*choices)]
+        
+        if command.confirm and config.general.confirm_destructive:
+            targets = f" ({len(contexts)} targets)" if len(contexts) > 1 else ""
+            if not ConfirmDialog(self.stdscr, f"Run '{command.name}'{targets}?").confirm():
+                show_message(self.stdscr, "Command cancelled.", "info")
+                return
+        
+        bus = EventBus()
+        executor = CommandExecutor(bus, max_workers=config.general.command_workers)
+        theme = Theme()
+        theme.setup()
+        
+        max_y, max_x = self.stdscr.getmaxyx()
+        self.stdscr.erase()
+        self.stdscr.addstr(0, 0, f" Running: {command.name} ".ljust(max_x), theme.get('header'))
+        self.stdscr.addnstr(max_y - 1, 0, "↑↓: Scroll | q/Esc: Back (stops running commands)", max_x - 1, theme.get('footer'))
+        self.stdscr.noutrefresh()
+        
+        panel = CommandPanel(bus, theme)
+        panel.attach(self.stdscr.derwin(max_y - 2, max_x, 1, 0))
+        
+        def draw():
+            panel.refresh()
+            curses.doupdate()
+        
+        def handle_key(key: int) -> bool:
+            if key in (ord('q'), 27):
+                executor.cancel()
+                return False
+            panel.handle_key(key)
+            return True
+        
+        with InputLoop(self.stdscr, config.general.max_fps) as loop:
+            # output lines arrive as events from the worker threads
+            bus.attach(loop.post)
+            futures = executor.run_many(command, contexts)
+            try:
+                loop.run(draw, handle_key)
+            finally:
+                executor.shutdown()
+                bus.detach()
+        
+        errors = [future.exception() for future in futures if future.done() and not future.cancelled() and future.exception()]
+        if errors:
+            show_message(self.stdscr, f"Error:\n{errors[0]}", "error")
+    
+    def plugins_menu(self):
+        manager = PluginManager(EventBus())
+        manifests = manager.discover()
+        
+        if manager.errors:
+            show_message(self.stdscr, "Some plugins failed to load:\n" + "\n".join(manager.errors), "warning")
+        
+        if not manifests:
+            show_message(self.stdscr, "No plugins installed.\n\nAdd one under ~/.config/gittui/plugins/<name>/plugin.yaml", "info")
+            return
+        
+        items = []
+        for manifest in manifests:
+            label = f"{manifest.name} - {manifest.description}" if manifest.description else manifest.name
+            items.append((label, lambda name=manifest.name: self.run_plugin(manager, name)))
+        items.append(("Back", None))
+        
+        try:
+            Menu(self.stdscr, "Plugins", items).run()
+        finally:
+            manager.shutdown()
+    
+    def run_plugin(self, manager: PluginManager, name: str):
+        events: List[Event] = []
+        manager.bus.subscribe(EventType.PLUGIN_RESULT, events.append)
+        manager.bus.subscribe(EventType.ERROR, events.append)
+        
+        _, branch, _ = run_git_command(['git', 'rev-parse', '--abbrev-ref', 'HEAD'])
+        context = {"repo": os.getcwd(), "branch": branch.strip()}
+        
+        try:
+            manager.invoke(name, context)
+            show_message(self.stdscr, f"Running plugin '{name}'...\n\nEsc: Stop waiting", "info", wait=False)
+            
+            self.stdscr.timeout(50)
+            try:
+                while not events:
+                    manager.poll()
+                    if self.stdscr.getch() == 27:
+                        return
+            finally:
+                self.stdscr.timeout(-1)
+        finally:
+            manager.bus.unsubscribe(EventType.PLUGIN_RESULT, events.append)
+            manager.bus.unsubscribe(EventType.ERROR, events.append)
+        
+        event = events[0]
+        if event.type == EventType.ERROR:
+            lines = event.data["message"].split('\n')
+            ScrollableWindow(self.stdscr, lines, f"Plugin Error: {name}").show()
+            return
+        
+        result = event.data["result"]
+        if result is None:
+            show_message(self.stdscr, f"Plugin '{name}' finished.", "success")
+        elif isinstance(result, (list, tuple)):
+            ScrollableWindow(self.stdscr, [str(line) for line in result], f"Plugin: {name}").show()
+        else:
+            ScrollableWindow(self.stdscr, str(result).split('\n'), f"Plugin: {name}").show()
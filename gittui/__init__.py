@@ -4,9 +4,19 @@ GitTUI - A fast, colorful terminal UI for Git operations.
 Like lazygit but fully customizable with YAML configuration.
 """
 
+from importlib import import_module
+
 __version__ = "1.0.0"
 __author__ = "GitTUI Team"
 
-from gittui.core.application import Application
-
 __all__ = ["Application", "__version__"]
+
+_EXPORTS = {
+    "Application": "gittui.core.application",
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
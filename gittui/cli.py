@@ -0,0 +1,74 @@
+"""Command-line entry point."""
+
+import argparse
+import signal
+import sys
+
+from gittui import __version__
+from gittui.config.loader import ConfigError, ConfigLoader
+from gittui.core.application import Application
+from gittui.core.daemon import DaemonError, RepoDaemon, connect, socket_path
+from gittui.git.repository import Repository
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="gittui", description="Terminal UI for Git")
+    parser.add_argument("path", nargs="?", default=".", help="repository to open")
+    parser.add_argument("-c", "--config", help="path to a YAML or JSON config file")
+    parser.add_argument("--daemon", dest="daemon", action="store_true", default=None,
+                        help="share status, ref and log caches through a per-repository daemon")
+    parser.add_argument("--no-daemon", dest="daemon", action="store_false", help="run git directly")
+    parser.add_argument("--serve", action="store_true", help="run the repository daemon in the foreground")
+    parser.add_argument("--version", action="version", version=f"gittui {__version__}")
+    args = parser.parse_args(argv)
+    
+    try:
+        loader = ConfigLoader(args.config)
+        config = loader.load()
+    except ConfigError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    
+    if not Repository(args.path).is_valid():
+        print(f"Error: {args.path} is not a git repository", file=sys.stderr)
+        return 1
+    
+    if args.serve:
+        return serve(args.path, config)
+    
+    use_daemon = config.general.use_daemon if args.daemon is None else args.daemon
+    repo = connect(args.path, loader.path) if use_daemon else None
+    app = Application(args.path, loader, repo)
+    
+    try:
+        app.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if repo is not None:
+            repo.close()
+    return 0
+
+
+def serve(path: str, config) -> int:
+    repo = Repository(path)
+    daemon = RepoDaemon(
+        repo,
+        socket_path(repo),
+        log_size=config.general.max_log_entries,
+        status_interval=config.general.refresh_interval,
+    )
+    # stopping the daemon with kill still removes its socket
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        daemon.serve()
+    except DaemonError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
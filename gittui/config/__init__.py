@@ -1,6 +1,18 @@
 """Configuration management."""
 
-from gittui.config.loader import ConfigLoader
-from gittui.config.schema import Config
+from importlib import import_module
 
-__all__ = ["ConfigLoader", "Config"]
+__all__ = ["ConfigLoader", "ConfigError", "Config", "Keymap"]
+
+_EXPORTS = {
+    "ConfigLoader": "gittui.config.loader",
+    "ConfigError": "gittui.config.loader",
+    "Config": "gittui.config.schema",
+    "Keymap": "gittui.config.loader",
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
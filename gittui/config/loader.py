@@ -0,0 +1,237 @@
+"""Configuration file loading, validation and keymap compilation."""
+
+import json
+import os
+from dataclasses import fields
+from typing import Any, Dict, Optional, Tuple, get_args, get_origin, get_type_hints
+
+import yaml
+
+from gittui.config.schema import (
+    ColorPair,
+    CommandsConfig,
+    Config,
+    CustomCommand,
+    GeneralConfig,
+    KeybindingsConfig,
+    LayoutConfig,
+    ThemeConfig,
+)
+from gittui.ui.keys import KeyParseError, parse_key
+
+CONFIG_NAMES = ("config.yaml", "config.yml", "config.json")
+
+SECTIONS = {
+    "general": GeneralConfig,
+    "theme": ThemeConfig,
+    "keybindings": KeybindingsConfig,
+    "commands": CommandsConfig,
+    "layout": LayoutConfig,
+}
+
+BASE_CONTEXTS = ("global_keys", "navigation")
+
+
+class ConfigError(ValueError):
+    pass
+
+
+def default_config_dir() -> str:
+    base = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    return os.path.join(base, "gittui")
+
+
+def find_config_path() -> Optional[str]:
+    env_path = os.environ.get("GITTUI_CONFIG")
+    if env_path:
+        return env_path
+    
+    config_dir = default_config_dir()
+    for name in CONFIG_NAMES:
+        path = os.path.join(config_dir, name)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _check_type(value: Any, hint: Any, where: str):
+    if hint is Any:
+        return
+    
+    origin = get_origin(hint)
+    if origin is list:
+        if not isinstance(value, list):
+            raise ConfigError(f"{where}: expected a list")
+        (item_hint,) = get_args(hint)
+        for idx, item in enumerate(value):
+            _check_type(item, item_hint, f"{where}[{idx}]")
+        return
+    
+    if origin is dict:
+        if not isinstance(value, dict):
+            raise ConfigError(f"{where}: expected a mapping")
+        key_hint, value_hint = get_args(hint)
+        for key, item in value.items():
+            _check_type(key, key_hint, where)
+            _check_type(item, value_hint, f"{where}.{key}")
+        return
+    
+    if origin is not None:
+        args = [arg for arg in get_args(hint) if arg is not type(None)]
+        if value is None:
+            return
+        for arg in args:
+            try:
+                _check_type(value, arg, where)
+                return
+            except ConfigError:
+                continue
+        raise ConfigError(f"{where}: invalid value {value!r}")
+    
+    if hint is float and isinstance(value, int) and not isinstance(value, bool):
+        return
+    if hint in (int, float) and isinstance(value, bool):
+        raise ConfigError(f"{where}: expected {hint.__name__}, got bool")
+    if not isinstance(value, hint):
+        raise ConfigError(f"{where}: expected {hint.__name__}, got {type(value).__name__}")
+
+
+def _check_fields(cls, data: Any, where: str, required: Tuple[str, ...] = ()):
+    if not isinstance(data, dict):
+        raise ConfigError(f"{where}: expected a mapping")
+    
+    hints = get_type_hints(cls)
+    known = {f.name for f in fields(cls)}
+    for key, value in data.items():
+        if key not in known:
+            raise ConfigError(f"{where}: unknown option {key!r}")
+        _check_type(value, hints[key], f"{where}.{key}")
+    
+    for key in required:
+        if key not in data:
+            raise ConfigError(f"{where}: missing required option {key!r}")
+
+
+def validate(data: Any) -> Dict[str, Any]:
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise ConfigError("config: expected a mapping at the top level")
+    
+    for section, values in data.items():
+        if section not in SECTIONS:
+            raise ConfigError(f"config: unknown section {section!r}")
+        _check_fields(SECTIONS[section], values, section)
+    
+    for name, color in data.get("theme", {}).get("colors", {}).items():
+        _check_fields(ColorPair, color, f"theme.colors.{name}")
+    
+    for section, bindings in data.get("keybindings", {}).items():
+        for action, spec in bindings.items():
+            try:
+                parse_key(spec)
+            except KeyParseError as e:
+                raise ConfigError(f"keybindings.{section}.{action}: {e}")
+    
+    for idx, command in enumerate(data.get("commands", {}).get("custom", [])):
+        _check_fields(CustomCommand, command, f"commands.custom[{idx}]", ("name", "command"))
+    
+    return data
+
+
+class Keymap:
+    def __init__(self, contexts: Dict[str, Dict[int, str]]):
+        self.contexts = contexts
+    
+    def lookup(self, key: int, context: str = "global_keys") -> Optional[str]:
+        table = self.contexts.get(context) or self.contexts["global_keys"]
+        return table.get(key)
+    
+    def context(self, name: str) -> Dict[int, str]:
+        return self.contexts.get(name) or self.contexts["global_keys"]
+
+
+def compile_keymap(keybindings: KeybindingsConfig) -> Keymap:
+    base: Dict[int, str] = {}
+    for section in BASE_CONTEXTS:
+        for action, spec in getattr(keybindings, section).items():
+            base[parse_key(spec)] = action
+    
+    contexts = {}
+    for f in fields(keybindings):
+        table = dict(base)
+        if f.name not in BASE_CONTEXTS:
+            for action, spec in getattr(keybindings, f.name).items():
+                table[parse_key(spec)] = action
+        contexts[f.name] = table
+    
+    return Keymap(contexts)
+
+
+class ConfigLoader:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path if path is not None else find_config_path()
+        self.error: Optional[str] = None
+        self._config: Optional[Config] = None
+        self._keymap: Optional[Keymap] = None
+        self._stamp: Optional[Tuple[int, int]] = None
+    
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        if not self.path:
+            return None
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+    
+    def _parse(self) -> Config:
+        if self._stamp is None:
+            return Config()
+        
+        try:
+            with open(self.path, "r") as f:
+                if self.path.endswith(".json"):
+                    data = json.load(f)
+                else:
+                    data = yaml.safe_load(f)
+        except (json.JSONDecodeError, yaml.YAMLError) as e:
+            raise ConfigError(f"{self.path}: {e}")
+        except OSError as e:
+            # a directory or an unreadable file in place of the config
+            raise ConfigError(f"{self.path}: {e.strerror or e}")
+        
+        return Config.from_dict(validate(data))
+    
+    def load(self) -> Config:
+        stamp = self._stat()
+        if self._config is None or stamp != self._stamp:
+            self._stamp = stamp
+            self._config = self._parse()
+            self._keymap = None
+            self.error = None
+        return self._config
+    
+    def reload_if_changed(self) -> bool:
+        if self._config is not None and self._stat() == self._stamp:
+            return False
+        
+        previous = self._config
+        try:
+            self.load()
+        except ConfigError as e:
+            self.error = str(e)
+            self._config = previous or Config()
+            return False
+        return True
+    
+    @property
+    def keymap(self) -> Keymap:
+        config = self.load()
+        if self._keymap is None:
+            self._keymap = compile_keymap(config.keybindings)
+        return self._keymap
+
+
+def load_config(path: Optional[str] = None) -> Config:
+    return ConfigLoader(path).load()
@@ -52,6 +52,7 @@ class KeybindingsConfig:
         "quit": "q",
         "help": "?",
         "refresh": "r",
+        "search": "/",
         "focus_next": "tab",
         "focus_prev": "shift+tab",
         "panel_1": "1",
@@ -78,6 +79,8 @@ class KeybindingsConfig:
         "discard": "d",
         "edit": "e",
         "open": "o",
+        "blame": "b",
+        "history": "H",
     })
     commits: Dict[str, str] = field(default_factory=lambda: {
         "commit": "c",
@@ -157,7 +160,16 @@ class GeneralConfig:
     confirm_destructive: bool = True
     auto_refresh: bool = True
     max_log_entries: int = 100
+    command_workers: int = 4
     diff_context_lines: int = 3
+    blame_cache_size: int = 32
+    history_page_size: int = 200
+    manage_commit_graph: bool = True
+    auto_maintenance: bool = False
+    use_daemon: bool = False
+    submodule_jobs: int = 8
+    max_fps: int = 30
+    remote_snapshots: bool = False
 
 
 @dataclass 
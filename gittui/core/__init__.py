@@ -1,6 +1,17 @@
 """Core application components."""
 
-from gittui.core.application import Application
-from gittui.core.events import EventBus, Event
+from importlib import import_module
 
 __all__ = ["Application", "EventBus", "Event"]
+
+_EXPORTS = {
+    "Application": "gittui.core.application",
+    "EventBus": "gittui.core.events",
+    "Event": "gittui.core.events",
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
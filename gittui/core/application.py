@@ -0,0 +1,205 @@
+"""Multi-panel application driving the layout, panels and key dispatch."""
+
+import curses
+from typing import Optional
+
+from gittui.config.loader import ConfigLoader
+from gittui.core.events import Event, EventBus, EventType
+from gittui.core.loop import InputLoop
+from gittui.git.blame import BlameCache
+from gittui.git.diff import DiffCache
+from gittui.git.history import HistoryCache
+from gittui.git.maintenance import Maintenance, MaintenanceJob
+from gittui.git.repository import Repository
+from gittui.git.search import SearchIndex
+from gittui.ui.blameview import BlameView
+from gittui.ui.diffview import DiffView
+from gittui.ui.historyview import HistoryView
+from gittui.ui.layout import LayoutManager
+from gittui.ui.searchview import SearchView
+from gittui.ui.panels.command import CommandPanel
+from gittui.ui.panels.commits import CommitsPanel
+from gittui.ui.panels.files import FilesPanel
+from gittui.ui.panels.status import StatusPanel
+from gittui.ui.theme import Theme
+from gittui.ui.widgets import ARROW_KEYS, navigation_keys
+
+FOOTER = "tab: Next panel | 1-4: Focus | space/a/u: Stage | enter: Diff | b: Blame | H: History | /: Search | r: Refresh | q: Quit"
+
+FLUSH_DELAY_MS = 150
+
+LOCAL_CHANGES = (EventType.FILE_STAGED, EventType.FILE_UNSTAGED, EventType.COMMIT_CREATED, EventType.BRANCH_CHANGED)
+
+
+class Application:
+    def __init__(self, path: str = ".", config_loader: Optional[ConfigLoader] = None,
+                 repo: Optional[Repository] = None):
+        self.path = path
+        self.loader = config_loader or ConfigLoader()
+        self.config = self.loader.load()
+        self.bus = EventBus()
+        self.repo = repo or Repository(path)
+        self.blame_cache = BlameCache(self.repo, self.config.general.blame_cache_size)
+        self.history_cache = HistoryCache(
+            self.repo,
+            page_size=self.config.general.history_page_size,
+            manage_commit_graph=self.config.general.manage_commit_graph,
+        )
+        self.maintenance_job: Optional[MaintenanceJob] = None
+        self.loop: Optional[InputLoop] = None
+        self.layout: Optional[LayoutManager] = None
+        self.stdscr = None
+        self.theme: Optional[Theme] = None
+        self.running = False
+    
+    def run(self):
+        curses.wrapper(self.main)
+    
+    def main(self, stdscr):
+        stdscr.keypad(True)
+        curses.cbreak()
+        curses.noecho()
+        curses.curs_set(0)
+        
+        self.stdscr = stdscr
+        self.theme = theme = Theme(self.config.theme)
+        theme.setup()
+        
+        # local changes must reach a shared cache before the panels reload
+        for event_type in LOCAL_CHANGES:
+            self.bus.subscribe(event_type, self._on_local_change)
+        
+        self.layout = LayoutManager(stdscr, self.config.layout, self.bus, theme)
+        self.layout.add(StatusPanel(self.bus, self.repo, theme))
+        self.layout.add(FilesPanel(self.bus, self.repo, theme))
+        self.layout.add(CommitsPanel(self.bus, self.repo, theme, self.config.general.max_log_entries))
+        self.layout.add(CommandPanel(self.bus, theme))
+        self.layout.set_footer(FOOTER)
+        
+        self.bus.subscribe(EventType.QUIT, self._on_quit)
+        
+        stdscr.erase()
+        stdscr.noutrefresh()
+        self.layout.relayout()
+        self.bus.emit_simple(EventType.REFRESH)
+        
+        if self.config.general.auto_maintenance:
+            self.start_maintenance()
+        
+        self.running = True
+        try:
+            with InputLoop(stdscr, self.config.general.max_fps) as loop:
+                self.loop = loop
+                # background threads emit into the loop instead of drawing from their own thread
+                self.bus.attach(loop.post)
+                loop.run(self.layout.render, self._handle_key, self._idle_timeout, self._on_idle, self._on_resize)
+        finally:
+            self.bus.detach()
+            self.loop = None
+            if self.maintenance_job is not None:
+                self.maintenance_job.cancel()
+            for panel in self.layout.panels.values():
+                panel.flush()
+            self.blame_cache.clear()
+            self.history_cache.clear()
+    
+    def _pending(self) -> bool:
+        return any(panel.has_pending() for panel in self.layout.panels.values())
+    
+    def _idle_timeout(self) -> Optional[float]:
+        if self._pending():
+            return FLUSH_DELAY_MS / 1000
+        general = self.config.general
+        return general.refresh_interval if general.auto_refresh else None
+    
+    def _on_idle(self):
+        if self._pending():
+            for panel in self.layout.panels.values():
+                panel.flush()
+            return
+        self.bus.emit_simple(EventType.REFRESH)
+        self.loader.reload_if_changed()
+    
+    def _on_resize(self):
+        self.bus.emit_simple(EventType.RESIZE)
+    
+    def _handle_key(self, key: int) -> bool:
+        if self.maintenance_job is not None:
+            self.maintenance_job.touch()
+        self.dispatch(key)
+        return self.running
+    
+    def start_maintenance(self):
+        maintenance = Maintenance(self.repo)
+        tasks = maintenance.health().recommended()
+        if tasks:
+            # tasks wait until no key has been pressed for a while
+            self.maintenance_job = MaintenanceJob(maintenance, tasks)
+            self.maintenance_job.start()
+    
+    def dispatch(self, key: int):
+        panel = self.layout.focused
+        context = panel.context if panel is not None else "global_keys"
+        action = self.loader.keymap.lookup(key, context) or ARROW_KEYS.get(key)
+        
+        if action == "quit":
+            self.bus.emit_simple(EventType.QUIT)
+        elif action == "refresh":
+            self.repo.invalidate()
+            self.bus.emit_simple(EventType.REFRESH)
+        elif action == "search":
+            with self.loop.suspended():
+                SearchView(self.stdscr, SearchIndex(self.repo), self.theme).show()
+            self.layout.relayout()
+        elif action == "focus_next":
+            self.layout.focus_next(1)
+        elif action == "focus_prev":
+            self.layout.focus_next(-1)
+        elif action is not None and action.startswith("panel_"):
+            names = self.layout.visible_names()
+            index = int(action[len("panel_"):]) - 1
+            if 0 <= index < len(names):
+                self.layout.focus_panel(names[index])
+        elif action == "select" and isinstance(panel, FilesPanel) and panel.selected_item is not None:
+            self.open_diff(panel)
+        elif action == "blame" and isinstance(panel, FilesPanel) and panel.selected_item is not None:
+            self.open_blame(panel.selected_item.raw_path)
+        elif action == "history" and isinstance(panel, FilesPanel) and panel.selected_item is not None:
+            self.open_history(panel.selected_item.raw_path)
+        elif panel is not None:
+            if action is None or not panel.handle_action(action):
+                panel.handle_key(key)
+    
+    def open_diff(self, panel: FilesPanel):
+        panel.flush()
+        entry = panel.selected_item
+        staged = entry.staged and entry.worktree == " "
+        
+        cache = DiffCache(self.repo, self.config.general.diff_context_lines)
+        keys = navigation_keys(self.config.keybindings.navigation)
+        with self.loop.suspended():
+            DiffView(self.stdscr, cache, self.theme, entry.raw_path, staged, keys, self.blame_cache).show()
+        
+        self.bus.emit_simple(EventType.FILE_STAGED)
+        self.layout.relayout()
+    
+    def open_blame(self, raw_path: bytes):
+        keys = navigation_keys(self.config.keybindings.navigation)
+        with self.loop.suspended():
+            BlameView(self.stdscr, self.blame_cache, self.theme, raw_path, keys=keys).show()
+        self.layout.relayout()
+    
+    def open_history(self, raw_path: bytes):
+        keys = navigation_keys(self.config.keybindings.navigation)
+        with self.loop.suspended():
+            HistoryView(self.stdscr, self.history_cache, self.theme, raw_path, keys=keys,
+                        blame_cache=self.blame_cache).show()
+        self.layout.relayout()
+    
+    def _on_local_change(self, event: Event):
+        self.repo.invalidate()
+    
+    def _on_quit(self, event: Event):
+        self.running = False
+        if self.loop is not None:
+            self.loop.stop()
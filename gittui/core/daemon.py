@@ -0,0 +1,439 @@
+"""Optional per-repository daemon sharing status, ref and log snapshots over a Unix socket."""
+
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from gittui.git.journal import JournalError, RefReader
+from gittui.git.repository import BranchInfo, Commit, FileStatus, Repository
+
+SOCKET_NAME = os.path.join("gittui", "daemon.sock")
+# sun_path is 104 bytes on macOS and 108 on Linux
+MAX_SOCKET_PATH = 100
+PROTOCOL = 1
+
+SECTIONS = ("status", "branch", "head", "log")
+REF_SECTIONS = ("branch", "head", "log", "status")
+
+WATCH_INTERVAL = 0.5
+WAIT_TIMEOUT = 30.0
+IDLE_EXIT = 600.0
+CONNECT_TIMEOUT = 3.0
+# a daemon stuck in a slow git call must not freeze the UI thread
+REQUEST_TIMEOUT = 5.0
+
+MISSING = object()
+
+
+class DaemonError(Exception):
+    pass
+
+
+def socket_path(repo: Repository) -> Optional[str]:
+    git_dir = repo.git_dir()
+    if git_dir is None:
+        return None
+    path = os.path.join(git_dir, SOCKET_NAME)
+    if len(os.fsencode(path)) < MAX_SOCKET_PATH:
+        return path
+    # deep repositories fall back to a private per-user directory
+    digest = hashlib.sha1(os.fsencode(git_dir)).hexdigest()[:16]
+    return os.path.join(runtime_dir(), f"{digest}.sock")
+
+
+def runtime_dir() -> str:
+    return os.path.join(tempfile.gettempdir(), f"gittui-{os.getuid()}")
+
+
+def ensure_private(directory: str):
+    # anyone can create names in /tmp, so the directory must provably be ours
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+    except OSError as e:
+        raise DaemonError(f"Cannot create {directory}: {e}")
+    st = os.lstat(directory)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or stat.S_IMODE(st.st_mode) != 0o700:
+        raise DaemonError(f"{directory} is not a private directory owned by this user")
+
+
+def encode_status(entries: List[FileStatus]) -> List[List[Optional[str]]]:
+    return [
+        [entry.index, entry.worktree, os.fsdecode(entry.raw_path),
+         os.fsdecode(entry.raw_orig_path) if entry.raw_orig_path is not None else None]
+        for entry in entries
+    ]
+
+
+def decode_status(data: List[List[Optional[str]]]) -> List[FileStatus]:
+    return [
+        FileStatus(index, worktree, os.fsencode(path), os.fsencode(orig) if orig is not None else None)
+        for index, worktree, path, orig in data
+    ]
+
+
+def encode_log(commits: List[Commit]) -> List[List[str]]:
+    return [[c.sha, c.short_sha, c.author, os.fsdecode(c.raw_subject)] for c in commits]
+
+
+def decode_log(data: List[List[str]]) -> List[Commit]:
+    return [Commit(sha, short_sha, author, os.fsencode(subject)) for sha, short_sha, author, subject in data]
+
+
+class RepoState:
+    def __init__(self, repo: Repository, log_size: int = 100, status_interval: float = 2.0):
+        self.repo = repo
+        self.log_size = log_size
+        self.status_interval = status_interval
+        self.version = 0
+        self.sections: Dict[str, Tuple[int, Any]] = {}
+        self.changed = threading.Condition()
+        self.refs = RefReader(repo)
+        self._stamps: Dict[str, Any] = {}
+        self._status_at = 0.0
+        self._polling = threading.Lock()
+    
+    def prime(self):
+        self._stamps = self.stamps()
+        self.update(SECTIONS)
+    
+    def _compute(self, name: str) -> Any:
+        if name == "status":
+            self._status_at = time.monotonic()
+            return encode_status(self.repo.status())
+        if name == "branch":
+            return asdict(self.repo.branch_info())
+        if name == "head":
+            return self.repo.head_oid()
+        return encode_log(self.repo.log(self.log_size))
+    
+    def update(self, names: Iterable[str]) -> int:
+        # git runs outside the lock so waiting clients are not held up
+        values = {name: self._compute(name) for name in names if name in SECTIONS}
+        with self.changed:
+            for name, value in values.items():
+                current = self.sections.get(name)
+                if current is None or current[1] != value:
+                    self.version += 1
+                    self.sections[name] = (self.version, value)
+            self.changed.notify_all()
+            return self.version
+    
+    def delta(self, since: int = 0) -> Dict[str, Any]:
+        with self.changed:
+            sections = {name: value for name, (version, value) in self.sections.items() if version > since}
+            return {"version": self.version, "sections": sections}
+    
+    def wait(self, since: int, timeout: float = WAIT_TIMEOUT) -> Dict[str, Any]:
+        with self.changed:
+            self.changed.wait_for(lambda: self.version > since, timeout)
+        return self.delta(since)
+    
+    def _stat(self, path: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+    
+    def stamps(self) -> Dict[str, Any]:
+        git_dir, common_dir = self.refs.dirs()
+        # loose ref updates rename a lock file into place, which touches the directory
+        ref_dirs = []
+        for root, _, _ in os.walk(os.path.join(common_dir, "refs")):
+            ref_dirs.append((root, self._stat(root)))
+        return {
+            "refs": (
+                self._stat(os.path.join(git_dir, "HEAD")),
+                self._stat(os.path.join(common_dir, "packed-refs")),
+                tuple(ref_dirs),
+            ),
+            "index": self._stat(os.path.join(git_dir, "index")),
+        }
+    
+    def poll(self) -> List[str]:
+        with self._polling:
+            stamps = self.stamps()
+            names = []
+            if stamps["refs"] != self._stamps.get("refs"):
+                names.extend(REF_SECTIONS)
+            elif stamps["index"] != self._stamps.get("index") or \
+                    time.monotonic() - self._status_at >= self.status_interval:
+                # edits in the working tree only show up in a fresh status
+                names.append("status")
+            self._stamps = stamps
+            if names:
+                self.update(names)
+            return names
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        daemon = self.server.daemon
+        daemon.connected(1)
+        try:
+            for line in self.rfile:
+                response = daemon.handle(json.loads(line))
+                self.wfile.write(json.dumps(response).encode() + b"\n")
+                self.wfile.flush()
+        except (OSError, ValueError):
+            pass
+        finally:
+            daemon.connected(-1)
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class RepoDaemon:
+    def __init__(self, repo: Repository, path: str, log_size: int = 100,
+                 status_interval: float = 2.0, idle_exit: float = IDLE_EXIT):
+        self.repo = repo
+        self.path = path
+        self.state = RepoState(repo, log_size, status_interval)
+        self.idle_exit = idle_exit
+        self.clients = 0
+        self._idle_since = time.monotonic()
+        self._lock = threading.Lock()
+        self._server: Optional[_Server] = None
+    
+    def connected(self, delta: int):
+        with self._lock:
+            self.clients += delta
+            if self.clients == 0:
+                self._idle_since = time.monotonic()
+    
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        op = request.get("op")
+        if op == "hello":
+            return {"protocol": PROTOCOL, "root": self.repo.root(), "log_size": self.state.log_size}
+        if op == "snapshot":
+            # a new client must not start from state older than the files on disk
+            self.state.poll()
+            return self.state.delta(0)
+        if op == "wait":
+            return self.state.wait(int(request.get("since", 0)), float(request.get("timeout", WAIT_TIMEOUT)))
+        if op == "refresh":
+            since = self.state.version
+            self.state.update(request.get("sections") or SECTIONS)
+            return self.state.delta(since)
+        return {"error": f"unknown op {op!r}"}
+    
+    def _watch(self):
+        while True:
+            time.sleep(WATCH_INTERVAL)
+            with self._lock:
+                idle = self.clients == 0 and time.monotonic() - self._idle_since >= self.idle_exit
+            if idle:
+                self._server.shutdown()
+                return
+            try:
+                self.state.poll()
+            except (OSError, JournalError):
+                continue
+    
+    def _claim(self):
+        directory = os.path.dirname(self.path)
+        if directory == runtime_dir():
+            ensure_private(directory)
+        else:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        if os.path.exists(self.path):
+            try:
+                DaemonClient(self.path).close()
+            except DaemonError:
+                # left behind by a daemon that did not shut down cleanly
+                os.unlink(self.path)
+            else:
+                raise DaemonError(f"A daemon is already serving {self.path}")
+    
+    def serve(self):
+        self._claim()
+        self.state.prime()
+        self._server = _Server(self.path, _Handler)
+        self._server.daemon = self
+        threading.Thread(target=self._watch, name="gittui-daemon-watch", daemon=True).start()
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+
+class DaemonClient:
+    def __init__(self, path: str, timeout: Optional[float] = CONNECT_TIMEOUT,
+                 request_timeout: Optional[float] = REQUEST_TIMEOUT):
+        self.path = path
+        self._lock = threading.Lock()
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self._sock.settimeout(timeout)
+            self._sock.connect(path)
+            self._sock.settimeout(request_timeout)
+        except OSError as e:
+            self._sock.close()
+            raise DaemonError(f"Cannot connect to {path}: {e}")
+        self._file = self._sock.makefile("rwb")
+    
+    def request(self, op: str, **data) -> Dict[str, Any]:
+        with self._lock:
+            try:
+                self._file.write(json.dumps(dict(data, op=op)).encode() + b"\n")
+                self._file.flush()
+                line = self._file.readline()
+            except socket.timeout:
+                # a late answer would be read as the next one, so the connection is done
+                raise DaemonError("Daemon did not answer in time")
+            except OSError as e:
+                raise DaemonError(str(e))
+        if not line:
+            raise DaemonError("Daemon closed the connection")
+        response = json.loads(line)
+        if "error" in response:
+            raise DaemonError(response["error"])
+        return response
+    
+    def close(self):
+        try:
+            self._file.close()
+        finally:
+            self._sock.close()
+
+
+class DaemonRepository(Repository):
+    def __init__(self, path: str, socket_file: str, request_timeout: float = REQUEST_TIMEOUT):
+        super().__init__(path)
+        self.socket_file = socket_file
+        self._client = DaemonClient(socket_file, request_timeout=request_timeout)
+        hello = self._client.request("hello")
+        if hello.get("protocol") != PROTOCOL:
+            self._client.close()
+            raise DaemonError("Daemon speaks a different protocol version")
+        self.log_size = hello.get("log_size", 0)
+        self.version = 0
+        self.sections: Dict[str, Any] = {}
+        self.connected = True
+        self._stale = set()
+        self._lock = threading.Lock()
+        self._apply(self._client.request("snapshot"))
+        self._closing = False
+        self._thread = threading.Thread(target=self._follow, name="gittui-daemon-client", daemon=True)
+        self._thread.start()
+    
+    def _apply(self, response: Dict[str, Any]):
+        with self._lock:
+            self.sections.update(response.get("sections", {}))
+            self.version = max(self.version, response.get("version", 0))
+    
+    def _follow(self):
+        try:
+            watcher = DaemonClient(self.socket_file, request_timeout=WAIT_TIMEOUT + REQUEST_TIMEOUT)
+        except DaemonError:
+            self.connected = False
+            return
+        try:
+            while not self._closing:
+                self._apply(watcher.request("wait", since=self.version, timeout=WAIT_TIMEOUT))
+        except (DaemonError, ValueError):
+            # reads fall back to running git directly
+            self.connected = False
+        finally:
+            watcher.close()
+    
+    def invalidate(self, *sections: str):
+        self._stale.update(sections or SECTIONS)
+    
+    def _section(self, name: str) -> Any:
+        if not self.connected:
+            return MISSING
+        if self._stale:
+            stale, self._stale = sorted(self._stale), set()
+            try:
+                self._apply(self._client.request("refresh", sections=stale))
+            except (DaemonError, ValueError):
+                self.connected = False
+                return MISSING
+        with self._lock:
+            return self.sections.get(name, MISSING)
+    
+    def status(self) -> List[FileStatus]:
+        value = self._section("status")
+        return super().status() if value is MISSING else decode_status(value)
+    
+    def branch_info(self) -> BranchInfo:
+        value = self._section("branch")
+        return super().branch_info() if value is MISSING else BranchInfo.from_dict(value)
+    
+    def head_oid(self) -> Optional[str]:
+        value = self._section("head")
+        return super().head_oid() if value is MISSING else value
+    
+    def log(self, max_count: int = 100, *revisions: str) -> List[Commit]:
+        value = MISSING if revisions or max_count > self.log_size else self._section("log")
+        return super().log(max_count, *revisions) if value is MISSING else decode_log(value)[:max_count]
+    
+    def close(self):
+        self._closing = True
+        self.connected = False
+        self._client.close()
+
+
+def spawn_daemon(path: str, config_path: Optional[str] = None) -> subprocess.Popen:
+    argv = [sys.executable, "-m", "gittui.cli", "--serve"]
+    if config_path:
+        argv.extend(["--config", config_path])
+    argv.append(path)
+    return subprocess.Popen(
+        argv,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def connect(path: str, config_path: Optional[str] = None, start: bool = True) -> Optional[DaemonRepository]:
+    socket_file = socket_path(Repository(path))
+    if socket_file is None:
+        return None
+    if os.path.dirname(socket_file) == runtime_dir():
+        try:
+            ensure_private(os.path.dirname(socket_file))
+        except DaemonError:
+            return None
+    try:
+        return DaemonRepository(path, socket_file)
+    except DaemonError:
+        if not start:
+            return None
+    
+    process = spawn_daemon(path, config_path)
+    deadline = time.monotonic() + CONNECT_TIMEOUT
+    while time.monotonic() < deadline and process.poll() is None:
+        time.sleep(0.05)
+        if not os.path.exists(socket_file):
+            continue
+        try:
+            return DaemonRepository(path, socket_file)
+        except DaemonError:
+            continue
+    # a racing instance may have won the socket
+    try:
+        return DaemonRepository(path, socket_file)
+    except DaemonError:
+        return None
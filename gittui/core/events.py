@@ -1,5 +1,6 @@
 """Event system for cross-panel communication."""
 
+import threading
 from dataclasses import dataclass, field
 from typing import Callable, Dict, List, Any, Optional
 from enum import Enum, auto
@@ -13,6 +14,7 @@ class EventType(Enum):
     COMMIT_CREATED = auto()
     BRANCH_CHANGED = auto()
     COMMAND_OUTPUT = auto()
+    PLUGIN_RESULT = auto()
     ERROR = auto()
     STATUS_UPDATE = auto()
     QUIT = auto()
@@ -30,6 +32,17 @@ class EventBus:
     def __init__(self):
         self._subscribers: Dict[EventType, List[Callable[[Event], None]]] = {}
         self._global_subscribers: List[Callable[[Event], None]] = []
+        self._post: Optional[Callable[[Callable[[], None]], None]] = None
+        self._owner: Optional[int] = None
+    
+    def attach(self, post: Callable[[Callable[[], None]], None]):
+        # events emitted on other threads are delivered on the attaching thread's loop
+        self._post = post
+        self._owner = threading.get_ident()
+    
+    def detach(self):
+        self._post = None
+        self._owner = None
     
     def subscribe(self, event_type: EventType, callback: Callable[[Event], None]):
         if event_type not in self._subscribers:
@@ -44,6 +57,13 @@ class EventBus:
             self._subscribers[event_type].remove(callback)
     
     def emit(self, event: Event):
+        post = self._post
+        if post is not None and threading.get_ident() != self._owner:
+            post(lambda: self._deliver(event))
+            return
+        self._deliver(event)
+    
+    def _deliver(self, event: Event):
         for callback in self._global_subscribers:
             try:
                 callback(event)
@@ -0,0 +1,229 @@
+"""Input loop that drains pending keys, renders at most once per frame and runs work posted from other threads."""
+
+import curses
+import os
+import selectors
+import signal
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, List, Optional, Union
+
+DEFAULT_FPS = 30
+
+Timeout = Union[None, float, Callable[[], Optional[float]]]
+
+_loops: List["InputLoop"] = []
+_winch_installed = False
+
+
+def resize_terminal(fd: Optional[int] = None) -> bool:
+    try:
+        columns, lines = os.get_terminal_size(sys.stdin.fileno() if fd is None else fd)
+        if curses.isendwin():
+            return False
+        # ncurses queues a KEY_RESIZE for whoever reads keys next
+        curses.resizeterm(lines, columns)
+    except (OSError, curses.error):
+        return False
+    curses.update_lines_cols()
+    return True
+
+
+def _on_winch(signum, frame):
+    loop = _loops[-1] if _loops else None
+    if loop is not None and loop.running and not loop.suspended_views:
+        # select() would otherwise sleep through the resize until the next key
+        loop.request_resize()
+    else:
+        # a blocking view is reading keys and gets KEY_RESIZE straight away
+        resize_terminal(loop.input_fd if loop is not None else None)
+
+
+def _install_winch():
+    global _winch_installed
+    if _winch_installed or not hasattr(signal, "SIGWINCH"):
+        return
+    try:
+        signal.signal(signal.SIGWINCH, _on_winch)
+    except ValueError:
+        # not the main thread: ncurses keeps reporting KEY_RESIZE on its own
+        return
+    _winch_installed = True
+
+
+class InputLoop:
+    def __init__(self, stdscr, fps: int = DEFAULT_FPS, input_fd: Optional[int] = None):
+        self.stdscr = stdscr
+        self.frame = 1.0 / fps if fps > 0 else 0.0
+        self.input_fd = sys.stdin.fileno() if input_fd is None else input_fd
+        self.keys: Deque[int] = deque()
+        self.dirty = True
+        self.running = False
+        self.suspended_views = 0
+        self._resize_pending = False
+        self.size = (0, 0)
+        self._posted: Deque[Callable[[], None]] = deque()
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._wake_r = self._wake_w = -1
+        self._last_frame = 0.0
+    
+    def open(self) -> "InputLoop":
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self.input_fd, selectors.EVENT_READ)
+        self._selector.register(self._wake_r, selectors.EVENT_READ)
+        self.stdscr.timeout(0)
+        self.size = self.stdscr.getmaxyx()
+        _install_winch()
+        _loops.append(self)
+        return self
+    
+    def close(self):
+        if self in _loops:
+            _loops.remove(self)
+        # keys typed ahead of leaving belong to whatever view comes next
+        self._push_back()
+        self.stdscr.timeout(-1)
+        if self._selector is not None:
+            self._selector.close()
+            self._selector = None
+        for fd in (self._wake_r, self._wake_w):
+            if fd >= 0:
+                os.close(fd)
+        self._wake_r = self._wake_w = -1
+    
+    def __enter__(self) -> "InputLoop":
+        return self.open()
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def post(self, callback: Callable[[], None]):
+        # deque appends are atomic, so any thread may post
+        self._posted.append(callback)
+        self.wake()
+    
+    def wake(self):
+        try:
+            os.write(self._wake_w, b"\0")
+        except OSError:
+            # a full pipe already holds a wake-up, a closed one has nobody to wake
+            pass
+    
+    def request_resize(self):
+        self._resize_pending = True
+        self.wake()
+    
+    def invalidate(self):
+        self.dirty = True
+    
+    def stop(self):
+        self.running = False
+    
+    def _drain(self):
+        while True:
+            key = self.stdscr.getch()
+            if key == -1:
+                return
+            if key == curses.KEY_RESIZE:
+                # any number of resize steps collapse into one relayout
+                self._resize_pending = True
+                continue
+            self.keys.append(key)
+    
+    def _push_back(self):
+        # ungetch is a stack, so the last key goes back first
+        while self.keys:
+            try:
+                curses.ungetch(self.keys.pop())
+            except curses.error:
+                pass
+    
+    def _clear_wakeups(self):
+        try:
+            while os.read(self._wake_r, 4096):
+                pass
+        except BlockingIOError:
+            pass
+    
+    def _run_posted(self) -> bool:
+        ran = False
+        while self._posted:
+            self._posted.popleft()()
+            ran = True
+        return ran
+    
+    def _wait(self, timeout: Optional[float]) -> bool:
+        events = self._selector.select(timeout)
+        self._clear_wakeups()
+        return bool(events)
+    
+    @contextmanager
+    def suspended(self):
+        # hand the terminal to a blocking modal view, typed-ahead keys included
+        self._push_back()
+        self.stdscr.timeout(-1)
+        self.suspended_views += 1
+        try:
+            yield
+        finally:
+            self.suspended_views -= 1
+            self.stdscr.timeout(0)
+            # the terminal may have been resized while the view had it
+            self._resize_pending |= self.stdscr.getmaxyx() != self.size
+            self.dirty = True
+    
+    def _resize(self, on_resize: Optional[Callable[[], None]]):
+        if resize_terminal(self.input_fd):
+            self._drain()
+        self._resize_pending = False
+        self.size = self.stdscr.getmaxyx()
+        if on_resize is not None:
+            on_resize()
+        self.dirty = True
+    
+    def run(self, draw: Callable[[], None], handle_key: Callable[[int], Optional[bool]],
+            timeout: Timeout = None, on_idle: Optional[Callable[[], None]] = None,
+            on_resize: Optional[Callable[[], None]] = None):
+        self.running = True
+        while self.running:
+            if self._resize_pending:
+                self._resize(on_resize)
+            
+            if self.dirty and not self.keys:
+                now = time.monotonic()
+                if now - self._last_frame >= self.frame:
+                    draw()
+                    self.dirty = False
+                    self._last_frame = now
+            
+            if not self.keys:
+                # keys pushed back by a modal view sit in curses, not in the input fd
+                self._drain()
+            if not self.keys and not self._posted:
+                limit = timeout() if callable(timeout) else timeout
+                frame_wait = None
+                if self.dirty:
+                    frame_wait = max(0.0, self._last_frame + self.frame - time.monotonic())
+                    if limit is None or frame_wait < limit:
+                        limit = frame_wait
+                    else:
+                        frame_wait = None
+                ready = self._wait(limit)
+                self._drain()
+                if not ready and frame_wait is None and on_idle is not None:
+                    on_idle()
+                    self.dirty = True
+            if self._run_posted():
+                self.dirty = True
+            
+            # every queued key updates state before the next frame is drawn
+            while self.keys and self.running:
+                key = self.keys.popleft()
+                self.dirty = True
+                if handle_key(key) is False:
+                    self.running = False
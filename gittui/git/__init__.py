@@ -1,6 +1,18 @@
 """Git command execution and repository management."""
 
-from gittui.git.commands import GitCommands
-from gittui.git.repository import Repository
+from importlib import import_module
 
-__all__ = ["GitCommands", "Repository"]
+__all__ = ["GitCommands", "GitResult", "LazyLines", "Repository"]
+
+_EXPORTS = {
+    "GitCommands": "gittui.git.commands",
+    "GitResult": "gittui.git.commands",
+    "LazyLines": "gittui.git.output",
+    "Repository": "gittui.git.repository",
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
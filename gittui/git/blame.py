@@ -0,0 +1,165 @@
+"""Streaming `git blame` annotations with an LRU cache per (commit, path)."""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from gittui.git.output import LazyLines, decode
+from gittui.git.repository import Repository
+
+
+@dataclass
+class BlameCommit:
+    sha: str
+    author: str = ""
+    author_time: int = 0
+    summary: str = ""
+    boundary: bool = False
+    
+    @property
+    def short_sha(self) -> str:
+        return self.sha[:8]
+    
+    @property
+    def date(self) -> str:
+        if not self.author_time:
+            return ""
+        return time.strftime("%Y-%m-%d", time.localtime(self.author_time))
+
+
+def parse_incremental(stream: Iterable[bytes]) -> Iterator[Tuple[BlameCommit, int, int]]:
+    commits: Dict[str, BlameCommit] = {}
+    current: Optional[BlameCommit] = None
+    start = count = 0
+    
+    for raw in stream:
+        line = raw.rstrip(b"\n")
+        if current is None:
+            parts = line.split(b" ")
+            if len(parts) < 4:
+                continue
+            sha = parts[0].decode("ascii")
+            start, count = int(parts[2]), int(parts[3])
+            current = commits.get(sha)
+            if current is None:
+                current = commits[sha] = BlameCommit(sha)
+            continue
+        
+        key, _, value = line.partition(b" ")
+        if key == b"author":
+            current.author = decode(value)
+        elif key == b"author-time":
+            current.author_time = int(value)
+        elif key == b"summary":
+            current.summary = decode(value)
+        elif key == b"boundary":
+            current.boundary = True
+        elif key == b"filename":
+            # every group ends with the filename header
+            yield current, start, count
+            current = None
+
+
+class Blame:
+    def __init__(self, rev: str, raw_path: bytes, content: bytes):
+        self.rev = rev
+        self.raw_path = raw_path
+        self.lines = LazyLines(content)
+        self.annotations: List[Optional[BlameCommit]] = [None] * len(self.lines)
+        self.annotated = 0
+        self.done = False
+        self.error: Optional[str] = None
+        self._process = None
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def path(self) -> str:
+        return decode(self.raw_path)
+    
+    def start(self, repo: Repository):
+        self._process = repo.root_git().spawn(
+            "blame", "--incremental", "--porcelain", self.rev, "--", decode(self.raw_path)
+        )
+        self._thread = threading.Thread(target=self._read, name="gittui-blame", daemon=True)
+        self._thread.start()
+    
+    def _read(self):
+        process = self._process
+        try:
+            with process.stdout:
+                for commit, start, count in parse_incremental(process.stdout):
+                    for index in range(start - 1, min(start - 1 + count, len(self.annotations))):
+                        self.annotations[index] = commit
+                    self.annotated += count
+            if process.wait() != 0 and self.error is None:
+                self.error = f"git blame exited with code {process.returncode}"
+        except Exception as e:
+            # the view polls done, so a parse or pipe error must still end the blame
+            if self.error is None:
+                self.error = f"Cannot read git blame output: {e}"
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+        finally:
+            self.done = True
+    
+    def cancel(self):
+        if self._process is not None and self._process.poll() is None:
+            self.error = "cancelled"
+            self._process.kill()
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.done
+
+
+class BlameCache:
+    def __init__(self, repo: Repository, max_entries: int = 32):
+        self.repo = repo
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Tuple[str, bytes], Blame]" = OrderedDict()
+    
+    def resolve(self, rev: str = "HEAD") -> Optional[str]:
+        result = self.repo.git.run("rev-parse", "--verify", "--quiet", f"{rev}^{{commit}}")
+        return result.text.strip() if result.success else None
+    
+    def get(self, raw_path: bytes, rev: str = "HEAD") -> Blame:
+        oid = self.resolve(rev)
+        if oid is None:
+            blame = Blame(rev, raw_path, b"")
+            blame.error, blame.done = f"Unknown revision: {rev}", True
+            return blame
+        
+        key = (oid, raw_path)
+        blame = self._entries.get(key)
+        if blame is not None and not (blame.done and blame.error):
+            self._entries.move_to_end(key)
+            return blame
+        
+        content = self.repo.root_git().run("cat-file", "blob", f"{oid}:{decode(raw_path)}")
+        blame = Blame(oid, raw_path, content.stdout if content.success else b"")
+        if not content.success:
+            blame.error, blame.done = f"{blame.path} is not a file in {oid[:8]}", True
+            return blame
+        
+        blame.start(self.repo)
+        self._entries[key] = blame
+        while len(self._entries) > self.max_entries:
+            _, evicted = self._entries.popitem(last=False)
+            evicted.cancel()
+        return blame
+    
+    def release(self):
+        # blames still running are dropped rather than left to finish for nobody
+        for key, blame in list(self._entries.items()):
+            if not blame.done:
+                blame.cancel()
+                del self._entries[key]
+    
+    def clear(self):
+        for blame in self._entries.values():
+            blame.cancel()
+        self._entries.clear()
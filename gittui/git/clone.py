@@ -0,0 +1,158 @@
+"""`git clone` with streamed progress, partial clone and sparse checkout options."""
+
+import os
+import re
+import subprocess
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from gittui.git.commands import GitCommands, GitResult
+from gittui.git.output import decode
+
+PROGRESS = re.compile(
+    r"^(?:remote: )?(?P<phase>[A-Za-z ]+):\s+"
+    r"(?:(?P<percent>\d+)% \((?P<current>\d+)/(?P<total>\d+)\)|(?P<count>\d+))"
+    r"(?:, (?P<size>[\d.]+ [KMGT]?i?B)(?: \| (?P<rate>[\d.]+ [KMGT]?i?B/s))?)?"
+)
+
+UNITS = {"B": 1, "KiB": 1 << 10, "MiB": 1 << 20, "GiB": 1 << 30, "TiB": 1 << 40}
+
+READ_SIZE = 4096
+
+
+@dataclass
+class CloneOptions:
+    url: str
+    directory: Optional[str] = None
+    filter: Optional[str] = None
+    depth: Optional[int] = None
+    single_branch: bool = False
+    branch: Optional[str] = None
+    sparse: List[str] = field(default_factory=list)
+    
+    def args(self) -> List[str]:
+        args = ["clone", "--progress"]
+        if self.filter:
+            args.append(f"--filter={self.filter}")
+        if self.depth:
+            args.append(f"--depth={self.depth}")
+        if self.single_branch:
+            args.append("--single-branch")
+        if self.branch:
+            args.extend(["--branch", self.branch])
+        if self.sparse:
+            args.append("--sparse")
+        # the directory is always given, so sparse checkout runs where git cloned to
+        args.extend(["--", self.url, self.target()])
+        return args
+    
+    def target(self) -> str:
+        if self.directory:
+            return self.directory
+        # the same steps as git's own guess: trailing slashes, then /.git, then .git
+        name = self.url.rstrip("/")
+        if name.endswith("/.git"):
+            name = name[:-len("/.git")].rstrip("/")
+        if name.endswith(".git"):
+            name = name[:-len(".git")]
+        return re.split(r"[/:]", name)[-1]
+
+
+@dataclass
+class CloneProgress:
+    phase: str = ""
+    percent: Optional[int] = None
+    current: int = 0
+    total: int = 0
+    received: int = 0
+    rate: str = ""
+    started: float = field(default_factory=time.monotonic)
+    
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+    
+    @property
+    def throughput(self) -> float:
+        elapsed = self.elapsed
+        return self.received / elapsed if elapsed > 0 else 0.0
+
+
+def parse_size(text: str) -> int:
+    number, _, unit = text.partition(" ")
+    return int(float(number) * UNITS.get(unit, 1))
+
+
+def update_progress(progress: CloneProgress, line: str) -> bool:
+    match = PROGRESS.match(line)
+    if match is None:
+        return False
+    
+    progress.phase = match.group("phase").strip()
+    if match.group("percent") is not None:
+        progress.percent = int(match.group("percent"))
+        progress.current = int(match.group("current"))
+        progress.total = int(match.group("total"))
+    else:
+        progress.percent = None
+        progress.current = progress.total = int(match.group("count"))
+    if match.group("size"):
+        progress.received = parse_size(match.group("size"))
+    if match.group("rate"):
+        progress.rate = match.group("rate")
+    return True
+
+
+def stream_progress(process: subprocess.Popen, progress: CloneProgress,
+                    on_progress: Optional[Callable[[CloneProgress], bool]] = None) -> List[str]:
+    messages: List[str] = []
+    pending = b""
+    
+    with process.stderr:
+        while True:
+            chunk = process.stderr.read1(READ_SIZE)
+            if not chunk:
+                break
+            # progress lines are redrawn in place with \r
+            parts = re.split(rb"[\r\n]", pending + chunk)
+            pending = parts.pop()
+            for raw in parts:
+                line = decode(raw).strip()
+                if not line:
+                    continue
+                if update_progress(progress, line):
+                    if on_progress is not None and on_progress(progress) is False:
+                        # SIGTERM lets git remove the half-written clone on its way out
+                        process.terminate()
+                        process.wait()
+                        messages.append("Cancelled.")
+                        return messages
+                else:
+                    messages.append(line)
+        if pending.strip():
+            messages.append(decode(pending).strip())
+    return messages
+
+
+def clone(options: CloneOptions, cwd: str = ".", git_path: str = "git",
+          on_progress: Optional[Callable[[CloneProgress], bool]] = None) -> GitResult:
+    if not options.target():
+        return GitResult(128, b"", f"Cannot derive a directory name from '{options.url}'.".encode())
+    git = GitCommands(cwd, git_path)
+    progress = CloneProgress()
+    process = git.spawn(*options.args(), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    messages = stream_progress(process, progress, on_progress)
+    returncode = process.wait()
+    
+    if returncode == 0 and options.sparse:
+        target = GitCommands(os.path.join(cwd, options.target()), git_path, timeout=None)
+        result = target.run("sparse-checkout", "set", "--cone", "--", *options.sparse)
+        if not result.success:
+            messages.append(result.error.strip())
+            returncode = result.returncode
+    
+    summary = "\n".join(messages)
+    if returncode == 0:
+        return GitResult(0, summary.encode(), b"")
+    return GitResult(returncode, b"", summary.encode())
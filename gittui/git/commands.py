@@ -0,0 +1,81 @@
+"""Git subprocess execution that keeps output as bytes."""
+
+import os
+import subprocess
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+from gittui.git.output import LazyLines, decode, iter_records
+
+# passed as timeout for commands that may legitimately run for minutes;
+# None means the instance default
+NO_TIMEOUT = 0
+
+
+@dataclass
+class GitResult:
+    returncode: int
+    stdout: bytes = b""
+    stderr: bytes = b""
+    
+    @property
+    def success(self) -> bool:
+        return self.returncode == 0
+    
+    @property
+    def text(self) -> str:
+        return decode(self.stdout)
+    
+    @property
+    def error(self) -> str:
+        return decode(self.stderr)
+    
+    def lines(self) -> LazyLines:
+        return LazyLines(self.stdout)
+    
+    def records(self) -> Iterator[memoryview]:
+        return iter_records(self.stdout)
+
+
+class GitCommands:
+    def __init__(self, cwd: str = ".", git_path: str = "git", timeout: Optional[float] = 30):
+        self.cwd = cwd
+        self.git_path = git_path
+        self.timeout = timeout
+    
+    def run(self, *args: str, input: Optional[bytes] = None,
+            timeout: Optional[float] = None, env: Optional[Dict[str, str]] = None) -> GitResult:
+        return self.execute([self.git_path, *args], input=input, timeout=timeout, env=env)
+    
+    def spawn(self, *args: str, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+              stderr=subprocess.DEVNULL) -> subprocess.Popen:
+        return subprocess.Popen(
+            [self.git_path, *args],
+            cwd=self.cwd,
+            stdin=stdin,
+            stdout=stdout,
+            stderr=stderr,
+        )
+    
+    def execute(self, argv: List[str], input: Optional[bytes] = None,
+                timeout: Optional[float] = None, env: Optional[Dict[str, str]] = None) -> GitResult:
+        if timeout is None:
+            timeout = self.timeout
+        try:
+            completed = subprocess.run(
+                argv,
+                cwd=self.cwd,
+                input=input,
+                env={**os.environ, **env} if env else None,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                timeout=timeout or None,
+            )
+            return GitResult(completed.returncode, completed.stdout, completed.stderr)
+        except subprocess.TimeoutExpired:
+            return GitResult(-1, b"", b"Command timed out")
+        except FileNotFoundError:
+            return GitResult(-1, b"", b"Git is not installed or not in PATH")
+        except (OSError, ValueError) as e:
+            # ValueError: argv that cannot be passed to exec, such as a path with a NUL
+            return GitResult(-1, b"", str(e).encode())
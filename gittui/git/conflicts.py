@@ -0,0 +1,276 @@
+"""Unmerged paths, lazily parsed conflict hunks and batch resolution."""
+
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from gittui.git.commands import NO_TIMEOUT, GitResult
+from gittui.git.output import decode, iter_records
+from gittui.git.repository import Repository
+
+OURS, THEIRS, BOTH = "ours", "theirs", "both"
+
+MARKER_SIZE = 7
+
+OPERATIONS = (
+    ("rebase-merge", "rebase"),
+    ("rebase-apply", "rebase"),
+    ("CHERRY_PICK_HEAD", "cherry-pick"),
+    ("REVERT_HEAD", "revert"),
+    ("MERGE_HEAD", "merge"),
+)
+
+STAGE_KINDS = {
+    (1, 2, 3): "both modified",
+    (2, 3): "both added",
+    (1, 2): "deleted by them",
+    (1, 3): "deleted by us",
+    (2,): "added by us",
+    (3,): "added by them",
+    (1,): "both deleted",
+}
+
+# continue must not stop in an editor for the commit message
+NO_EDITOR = {"GIT_EDITOR": "true"}
+
+
+@dataclass
+class UnmergedEntry:
+    raw_path: bytes
+    stages: Dict[int, Tuple[str, str]] = field(default_factory=dict)
+    
+    @property
+    def path(self) -> str:
+        return decode(self.raw_path)
+    
+    @property
+    def kind(self) -> str:
+        return STAGE_KINDS.get(tuple(sorted(self.stages)), "unmerged")
+    
+    def has(self, side: str) -> bool:
+        return (2 if side == OURS else 3) in self.stages
+
+
+@dataclass
+class ConflictHunk:
+    ours: List[bytes]
+    theirs: List[bytes]
+    base: List[bytes] = field(default_factory=list)
+    markers: Tuple[bytes, bytes, bytes, bytes] = (b"", b"", b"", b"")
+    line: int = 0
+    choice: Optional[str] = None
+    
+    def render(self) -> List[bytes]:
+        if self.choice == OURS:
+            return self.ours
+        if self.choice == THEIRS:
+            return self.theirs
+        if self.choice == BOTH:
+            return self.ours + self.theirs
+        start, base, middle, end = self.markers
+        lines = [start] + self.ours
+        if base:
+            lines += [base] + self.base
+        return lines + [middle] + self.theirs + [end]
+
+
+Segment = Union[bytes, ConflictHunk]
+
+
+def parse_conflicts(data: bytes) -> List[Segment]:
+    segments: List[Segment] = []
+    hunk: Optional[ConflictHunk] = None
+    section = None
+    markers: List[bytes] = []
+    pending: List[bytes] = []
+    
+    for number, line in enumerate(data.splitlines(keepends=True), 1):
+        tag = line[:MARKER_SIZE]
+        if hunk is not None:
+            pending.append(line)
+        if tag == b"<" * MARKER_SIZE and hunk is None:
+            hunk = ConflictHunk([], [], line=number)
+            markers = [line, b"", b"", b""]
+            pending = [line]
+            section = "ours"
+        elif hunk is not None and tag == b"|" * MARKER_SIZE and section == "ours":
+            markers[1] = line
+            section = "base"
+        elif hunk is not None and tag == b"=" * MARKER_SIZE and section in ("ours", "base"):
+            markers[2] = line
+            section = "theirs"
+        elif hunk is not None and tag == b">" * MARKER_SIZE and section == "theirs":
+            markers[3] = line
+            hunk.markers = tuple(markers)
+            segments.append(hunk)
+            hunk = None
+        elif hunk is not None:
+            getattr(hunk, section).append(line)
+        else:
+            segments.append(line)
+    
+    if hunk is not None:
+        # an unterminated marker is ordinary text
+        segments.extend(pending)
+    return segments
+
+
+class ConflictFile:
+    def __init__(self, entry: UnmergedEntry, root: str):
+        self.entry = entry
+        self.file_path = os.path.join(root, os.fsdecode(entry.raw_path))
+        self.segments: List[Segment] = []
+        self.error: Optional[str] = None
+        self._loaded = False
+    
+    @property
+    def hunks(self) -> List[ConflictHunk]:
+        self.load()
+        return [segment for segment in self.segments if isinstance(segment, ConflictHunk)]
+    
+    def load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.file_path, "rb") as f:
+                self.segments = parse_conflicts(f.read())
+        except OSError as e:
+            self.error = str(e)
+    
+    @property
+    def resolved(self) -> bool:
+        return all(hunk.choice is not None for hunk in self.hunks)
+    
+    def render(self) -> bytes:
+        parts: List[bytes] = []
+        for segment in self.segments:
+            if isinstance(segment, ConflictHunk):
+                parts.extend(segment.render())
+            else:
+                parts.append(segment)
+        return b"".join(parts)
+    
+    def save(self):
+        with open(self.file_path, "wb") as f:
+            f.write(self.render())
+
+
+def parse_ls_files_u(data: bytes) -> Dict[bytes, UnmergedEntry]:
+    entries: Dict[bytes, UnmergedEntry] = {}
+    for record in iter_records(data):
+        meta, _, path = bytes(record).partition(b"\t")
+        mode, oid, stage = meta.split(b" ")
+        entry = entries.setdefault(path, UnmergedEntry(path))
+        entry.stages[int(stage)] = (mode.decode(), oid.decode())
+    return entries
+
+
+def _nul_paths(paths: Iterable[bytes]) -> bytes:
+    return b"".join(path + b"\0" for path in paths)
+
+
+class ConflictSet:
+    def __init__(self, repo: Repository):
+        self.repo = repo
+        self.entries: Dict[bytes, UnmergedEntry] = {}
+        self._files: Dict[bytes, ConflictFile] = {}
+    
+    def load(self) -> List[UnmergedEntry]:
+        result = self.repo.root_git().run("ls-files", "-u", "-z")
+        self.entries = parse_ls_files_u(result.stdout) if result.success else {}
+        self._files.clear()
+        return self.paths()
+    
+    def paths(self) -> List[UnmergedEntry]:
+        return [self.entries[path] for path in sorted(self.entries)]
+    
+    def operation(self) -> Optional[str]:
+        git_dir = self.repo.git_dir()
+        if git_dir is None:
+            return None
+        for name, operation in OPERATIONS:
+            if os.path.exists(os.path.join(git_dir, name)):
+                return operation
+        return None
+    
+    def file(self, raw_path: bytes) -> ConflictFile:
+        conflict = self._files.get(raw_path)
+        if conflict is None:
+            conflict = self._files[raw_path] = ConflictFile(self.entries[raw_path], self.repo.root() or ".")
+        return conflict
+    
+    def _resolved(self, raw_paths: Iterable[bytes]):
+        # drop resolved paths in place instead of re-reading the index
+        for raw_path in raw_paths:
+            self.entries.pop(raw_path, None)
+            self._files.pop(raw_path, None)
+    
+    def take(self, raw_paths: Iterable[bytes], side: str) -> GitResult:
+        entries = [self.entries[path] for path in raw_paths if path in self.entries]
+        keep = [entry.raw_path for entry in entries if entry.has(side)]
+        remove = [entry.raw_path for entry in entries if not entry.has(side)]
+        git = self.repo.root_git()
+        
+        result = GitResult(0)
+        if keep:
+            result = git.run(
+                "--literal-pathspecs", "checkout", f"--{side}",
+                "--pathspec-from-file=-", "--pathspec-file-nul", input=_nul_paths(keep),
+            )
+            if result.success:
+                result = git.run(
+                    "--literal-pathspecs", "add", "--pathspec-from-file=-", "--pathspec-file-nul",
+                    input=_nul_paths(keep),
+                )
+        if result.success and remove:
+            result = git.run(
+                "--literal-pathspecs", "rm", "--quiet", "--force", "--pathspec-from-file=-", "--pathspec-file-nul",
+                input=_nul_paths(remove),
+            )
+        
+        if result.success:
+            self._resolved(keep + remove)
+        return result
+    
+    def choose(self, raw_path: bytes, hunk: ConflictHunk, side: Optional[str]) -> GitResult:
+        conflict = self.file(raw_path)
+        hunk.choice = side
+        try:
+            conflict.save()
+        except OSError as e:
+            return GitResult(-1, b"", str(e).encode())
+        
+        if not conflict.resolved:
+            return GitResult(0)
+        return self.mark_resolved([raw_path])
+    
+    def mark_resolved(self, raw_paths: List[bytes]) -> GitResult:
+        result = self.repo.root_git().run(
+            "--literal-pathspecs", "add", "--pathspec-from-file=-", "--pathspec-file-nul",
+            input=_nul_paths(raw_paths),
+        )
+        if result.success:
+            self._resolved(raw_paths)
+        return result
+    
+    def _sequence(self, action: str) -> GitResult:
+        operation = self.operation()
+        if operation is None:
+            return GitResult(-1, b"", b"No merge, rebase, cherry-pick or revert in progress")
+        if action == "--skip" and operation == "merge":
+            return GitResult(-1, b"", b"A merge cannot be skipped")
+        result = self.repo.root_git().run(operation, action, timeout=NO_TIMEOUT, env=NO_EDITOR)
+        if action != "--continue" or not result.success:
+            # the next step (or abort) may leave a different set of conflicts
+            self.load()
+        return result
+    
+    def continue_(self) -> GitResult:
+        return self._sequence("--continue")
+    
+    def abort(self) -> GitResult:
+        return self._sequence("--abort")
+    
+    def skip(self) -> GitResult:
+        return self._sequence("--skip")
@@ -0,0 +1,186 @@
+"""Structured unified diffs and partial patch application."""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from gittui.git.commands import GitResult
+from gittui.git.output import decode
+from gittui.git.repository import Repository
+
+HUNK_HEADER = re.compile(rb"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+DIFF_ARGS = ("--no-color", "--no-ext-diff", "--no-renames")
+
+
+@dataclass
+class Hunk:
+    header: bytes
+    old_start: int
+    old_count: int
+    new_start: int
+    new_count: int
+    lines: List[bytes] = field(default_factory=list)
+    
+    def changes(self) -> List[int]:
+        return [i for i, line in enumerate(self.lines) if line[:1] in (b"+", b"-")]
+
+
+@dataclass
+class FileDiff:
+    raw_path: bytes
+    header: List[bytes] = field(default_factory=list)
+    hunks: List[Hunk] = field(default_factory=list)
+    staged: bool = False
+    
+    @property
+    def path(self) -> str:
+        return decode(self.raw_path)
+    
+    @property
+    def binary(self) -> bool:
+        return not self.hunks and any(line.startswith(b"Binary files") for line in self.header)
+
+
+def _path_from_header(line: bytes) -> bytes:
+    # "diff --git a/<path> b/<path>"; both sides are equal without renames
+    rest = line[len(b"diff --git "):]
+    return rest[2:(len(rest) - 1) // 2]
+
+
+def parse_diff(data: bytes, staged: bool = False) -> List[FileDiff]:
+    files: List[FileDiff] = []
+    current: Optional[FileDiff] = None
+    hunk: Optional[Hunk] = None
+    
+    for line in data.split(b"\n"):
+        if line.startswith(b"diff --git "):
+            current = FileDiff(_path_from_header(line), [line], staged=staged)
+            files.append(current)
+            hunk = None
+        elif current is None:
+            continue
+        elif line.startswith(b"@@"):
+            match = HUNK_HEADER.match(line)
+            if match is None:
+                continue
+            old_start, old_count, new_start, new_count = match.groups()
+            hunk = Hunk(
+                line,
+                int(old_start),
+                int(old_count) if old_count is not None else 1,
+                int(new_start),
+                int(new_count) if new_count is not None else 1,
+            )
+            current.hunks.append(hunk)
+        elif hunk is not None:
+            if line[:1] in (b" ", b"+", b"-", b"\\"):
+                hunk.lines.append(line)
+        else:
+            current.header.append(line)
+            # git appends a tab to ---/+++ paths that contain spaces
+            if line.startswith(b"--- a/"):
+                current.raw_path = line[len(b"--- a/"):].rstrip(b"\t")
+            elif line.startswith(b"+++ b/"):
+                current.raw_path = line[len(b"+++ b/"):].rstrip(b"\t")
+    
+    return files
+
+
+def build_patch(diff: FileDiff, hunk: Hunk, selected: Optional[Set[int]] = None,
+                reverse: bool = False) -> bytes:
+    body: List[bytes] = []
+    old_count = new_count = 0
+    kept_previous = True
+    
+    for index, line in enumerate(hunk.lines):
+        tag = line[:1]
+        if tag == b"\\":
+            if kept_previous:
+                body.append(line)
+            continue
+        
+        chosen = selected is None or index in selected
+        if tag == b"+" and not chosen:
+            if not reverse:
+                kept_previous = False
+                continue
+            line, tag = b" " + line[1:], b" "
+        elif tag == b"-" and not chosen:
+            if reverse:
+                kept_previous = False
+                continue
+            line, tag = b" " + line[1:], b" "
+        
+        kept_previous = True
+        body.append(line)
+        if tag in (b" ", b"-"):
+            old_count += 1
+        if tag in (b" ", b"+"):
+            new_count += 1
+    
+    start = hunk.new_start if reverse else hunk.old_start
+    header = b"@@ -%d,%d +%d,%d @@" % (start, old_count, start, new_count)
+    header_lines = [line for line in diff.header if not line.startswith(b"Binary")]
+    return b"\n".join(header_lines + [header] + body) + b"\n"
+
+
+class DiffCache:
+    def __init__(self, repo: Repository, context_lines: int = 3):
+        self.repo = repo
+        self.context_lines = context_lines
+        self._files: Dict[Tuple[bool, bytes], FileDiff] = {}
+        self._loaded: Set[bool] = set()
+    
+    def _diff_args(self, staged: bool) -> List[str]:
+        args = ["-c", "core.quotePath=false", "--literal-pathspecs", "diff", *DIFF_ARGS, f"-U{self.context_lines}"]
+        if staged:
+            args.append("--cached")
+        return args
+    
+    def seed(self, data: bytes, staged: bool = False) -> List[FileDiff]:
+        files = parse_diff(data, staged)
+        for diff in files:
+            self._files[(staged, diff.raw_path)] = diff
+        self._loaded.add(staged)
+        return files
+    
+    def files(self, staged: bool = False) -> List[FileDiff]:
+        if staged not in self._loaded:
+            result = self.repo.root_git().run(*self._diff_args(staged))
+            self.seed(result.stdout if result.success else b"", staged)
+        return sorted(
+            (diff for (is_staged, _), diff in self._files.items() if is_staged == staged),
+            key=lambda diff: diff.raw_path,
+        )
+    
+    def get(self, raw_path: bytes, staged: bool = False) -> Optional[FileDiff]:
+        key = (staged, raw_path)
+        if key not in self._files and staged not in self._loaded:
+            self._refresh(raw_path, staged)
+        return self._files.get(key)
+    
+    def _refresh(self, raw_path: bytes, staged: bool):
+        self._files.pop((staged, raw_path), None)
+        result = self.repo.root_git().run(*self._diff_args(staged), "--", decode(raw_path))
+        if result.success:
+            for diff in parse_diff(result.stdout, staged):
+                self._files[(staged, diff.raw_path)] = diff
+    
+    def invalidate(self, raw_path: bytes):
+        for staged in (False, True):
+            if staged in self._loaded or (staged, raw_path) in self._files:
+                self._refresh(raw_path, staged)
+    
+    def apply(self, diff: FileDiff, hunk: Hunk, selected: Optional[Iterable[int]] = None) -> GitResult:
+        chosen = set(selected) if selected is not None else None
+        patch = build_patch(diff, hunk, chosen, reverse=diff.staged)
+        
+        args = ["apply", "--cached", "--recount", "--whitespace=nowarn"]
+        if diff.staged:
+            args.append("--reverse")
+        result = self.repo.root_git().run(*args, "-", input=patch)
+        
+        if result.success:
+            self.invalidate(diff.raw_path)
+        return result
@@ -0,0 +1,223 @@
+"""Lazily paged path history backed by commit-graph Bloom filters."""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from gittui.git.commands import NO_TIMEOUT, GitResult
+from gittui.git.output import decode
+from gittui.git.repository import LOG_FORMAT, Commit, Repository, parse_log_record
+
+GRAPH_SIGNATURE = b"CGPH"
+BLOOM_CHUNKS = (b"BIDX", b"BDAT")
+READ_SIZE = 65536
+
+
+def graph_chunks(path: str) -> List[bytes]:
+    with open(path, "rb") as f:
+        header = f.read(8)
+        if len(header) < 8 or header[:4] != GRAPH_SIGNATURE:
+            return []
+        table = f.read(12 * header[6])
+    return [table[i:i + 4] for i in range(0, len(table), 12)]
+
+
+class CommitGraph:
+    def __init__(self, repo: Repository):
+        self.repo = repo
+        self._thread: Optional[threading.Thread] = None
+        self.last_result: Optional[GitResult] = None
+    
+    def info_dir(self) -> Optional[str]:
+        # linked worktrees keep their objects in the common directory
+        result = self.repo.git.run("rev-parse", "--git-path", "objects/info")
+        if not result.success:
+            return None
+        return os.path.join(self.repo.git.cwd, result.text.strip())
+    
+    def files(self) -> List[str]:
+        info_dir = self.info_dir()
+        if info_dir is None:
+            return []
+        
+        chain = os.path.join(info_dir, "commit-graphs", "commit-graph-chain")
+        if os.path.isfile(chain):
+            with open(chain) as f:
+                return [
+                    os.path.join(info_dir, "commit-graphs", f"graph-{line.strip()}.graph")
+                    for line in f if line.strip()
+                ]
+        
+        single = os.path.join(info_dir, "commit-graph")
+        return [single] if os.path.isfile(single) else []
+    
+    def has_changed_paths(self) -> bool:
+        files = self.files()
+        if not files:
+            return False
+        try:
+            return all(set(BLOOM_CHUNKS) <= set(graph_chunks(path)) for path in files)
+        except OSError:
+            return False
+    
+    def write(self) -> GitResult:
+        # a plain --split only adds a layer for new commits, so layers without
+        # Bloom filters are merged into one that has them
+        split = "--split" if self.has_changed_paths() or not self.files() else "--split=replace"
+        self.last_result = self.repo.git.run(
+            "commit-graph", "write", "--reachable", "--changed-paths", split, timeout=NO_TIMEOUT
+        )
+        return self.last_result
+    
+    def ensure(self, background: bool = True) -> bool:
+        if self.has_changed_paths() or self.writing:
+            return False
+        if not background:
+            self.write()
+            return True
+        
+        self._thread = threading.Thread(target=self.write, name="gittui-commit-graph", daemon=True)
+        self._thread.start()
+        return True
+    
+    @property
+    def writing(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+
+class PathHistory:
+    def __init__(self, repo: Repository, raw_path: bytes, tip: str, page_size: int = 200):
+        self.repo = repo
+        self.raw_path = raw_path
+        self.tip = tip
+        self.page_size = max(1, page_size)
+        self.commits: List[Commit] = []
+        self.complete = False
+        self.error: Optional[str] = None
+        self._process = None
+        self._pending = b""
+    
+    @property
+    def path(self) -> str:
+        return decode(self.raw_path)
+    
+    def __len__(self) -> int:
+        return len(self.commits)
+    
+    def _start(self):
+        self._process = self.repo.root_git().spawn(
+            "--literal-pathspecs", "log", "-z", LOG_FORMAT, self.tip, "--", decode(self.raw_path)
+        )
+    
+    def fetch(self, count: Optional[int] = None) -> int:
+        if self.complete:
+            return 0
+        if self._process is None:
+            self._start()
+        
+        wanted = len(self.commits) + (count or self.page_size)
+        before = len(self.commits)
+        stdout = self._process.stdout
+        
+        while len(self.commits) < wanted:
+            chunk = stdout.read1(READ_SIZE)
+            if not chunk:
+                self._finish()
+                break
+            
+            records = (self._pending + chunk).split(b"\0")
+            self._pending = records.pop()
+            for record in records:
+                commit = parse_log_record(record)
+                if commit is not None:
+                    self.commits.append(commit)
+        
+        return len(self.commits) - before
+    
+    def advance(self, tip: str) -> bool:
+        ancestor = self.repo.git.run("merge-base", "--is-ancestor", self.tip, tip)
+        if not ancestor.success:
+            return False
+        
+        result = self.repo.root_git().run(
+            "--literal-pathspecs", "log", "-z", LOG_FORMAT, f"{self.tip}..{tip}", "--", decode(self.raw_path)
+        )
+        if not result.success:
+            return False
+        
+        newer = [commit for commit in map(parse_log_record, result.records()) if commit is not None]
+        self.commits[:0] = newer
+        self.tip = tip
+        return True
+    
+    def ensure(self, index: int):
+        while index >= len(self.commits) and not self.complete:
+            self.fetch()
+    
+    def _finish(self):
+        if self._pending:
+            commit = parse_log_record(self._pending)
+            if commit is not None:
+                self.commits.append(commit)
+            self._pending = b""
+        
+        self._process.stdout.close()
+        if self._process.wait() != 0:
+            self.error = f"git log exited with code {self._process.returncode}"
+        self.complete = True
+    
+    def close(self):
+        if self._process is not None and not self.complete:
+            self._process.kill()
+            self._process.stdout.close()
+            self._process.wait()
+            self._process = None
+            self._pending = b""
+            self.commits.clear()
+
+
+class HistoryCache:
+    def __init__(self, repo: Repository, max_entries: int = 64, page_size: int = 200,
+                 manage_commit_graph: bool = True):
+        self.repo = repo
+        self.max_entries = max(1, max_entries)
+        self.page_size = page_size
+        self.commit_graph = CommitGraph(repo)
+        self.manage_commit_graph = manage_commit_graph
+        self._entries: "OrderedDict[Tuple[str, bytes], PathHistory]" = OrderedDict()
+    
+    def get(self, raw_path: bytes, rev: str = "HEAD") -> PathHistory:
+        if self.manage_commit_graph:
+            self.commit_graph.ensure()
+        
+        result = self.repo.git.run("rev-parse", "--verify", "--quiet", f"{rev}^{{commit}}")
+        tip = result.text.strip() if result.success else rev
+        
+        key = (rev, raw_path)
+        history = self._entries.get(key)
+        if history is not None and history.error is None:
+            # a moved tip only needs the new commits on top of the cached ones
+            if history.tip == tip or history.advance(tip):
+                self._entries.move_to_end(key)
+                return history
+            history.close()
+        
+        history = PathHistory(self.repo, raw_path, tip, self.page_size)
+        self._entries[key] = history
+        while len(self._entries) > self.max_entries:
+            _, evicted = self._entries.popitem(last=False)
+            evicted.close()
+        return history
+    
+    def release(self):
+        # a partly read history keeps its git log blocked on a full pipe
+        for key, history in list(self._entries.items()):
+            if not history.complete:
+                history.close()
+                del self._entries[key]
+    
+    def clear(self):
+        for history in self._entries.values():
+            history.close()
+        self._entries.clear()
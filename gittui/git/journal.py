@@ -0,0 +1,257 @@
+"""Operation journal of ref snapshots with undo/redo through one ref transaction."""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field, fields
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from gittui.git.commands import GitResult
+from gittui.git.output import decode
+from gittui.git.repository import Repository
+
+JOURNAL_FILE = os.path.join("gittui", "journal.json")
+MAX_ENTRIES = 100
+
+IN_PROGRESS = ("rebase-merge", "rebase-apply", "MERGE_HEAD", "CHERRY_PICK_HEAD", "REVERT_HEAD")
+
+
+class JournalError(Exception):
+    pass
+
+
+@dataclass
+class RefState:
+    head_ref: Optional[str]
+    refs: Dict[str, Optional[str]] = field(default_factory=dict)
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RefState":
+        return cls(**{f.name: data[f.name] for f in fields(cls) if f.name in data})
+    
+    @property
+    def head(self) -> Optional[str]:
+        if self.head_ref is None:
+            return self.refs.get("HEAD")
+        return self.refs.get(self.head_ref)
+
+
+@dataclass
+class Operation:
+    label: str
+    before: RefState
+    after: RefState
+    timestamp: float = field(default_factory=time.time)
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Operation":
+        return cls(data["label"], RefState.from_dict(data["before"]), RefState.from_dict(data["after"]), data["timestamp"])
+
+
+class RefReader:
+    def __init__(self, repo: Repository):
+        self.repo = repo
+        self._dirs: Optional[Tuple[str, str]] = None
+        self._packed: Dict[str, str] = {}
+        self._packed_stamp: Optional[Tuple[int, int]] = None
+    
+    def dirs(self) -> Tuple[str, str]:
+        if self._dirs is None:
+            result = self.repo.git.run("rev-parse", "--absolute-git-dir", "--git-common-dir")
+            if not result.success:
+                raise JournalError(result.error.strip() or "Not a git repository")
+            git_dir, common_dir = result.text.splitlines()[:2]
+            # --git-common-dir may be relative to the working directory
+            self._dirs = git_dir, os.path.abspath(os.path.join(self.repo.git.cwd, common_dir))
+        return self._dirs
+    
+    def _read_file(self, path: str) -> Optional[str]:
+        try:
+            with open(path, "rb") as f:
+                return decode(f.read()).strip()
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            return None
+    
+    def _packed_refs(self) -> Dict[str, str]:
+        path = os.path.join(self.dirs()[1], "packed-refs")
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            self._packed, self._packed_stamp = {}, None
+            return self._packed
+        
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp != self._packed_stamp:
+            packed = {}
+            with open(path, "rb") as f:
+                for line in f:
+                    if line[:1] in (b"#", b"^"):
+                        continue
+                    oid, _, name = line.rstrip(b"\n").partition(b" ")
+                    packed[decode(name)] = oid.decode()
+            self._packed, self._packed_stamp = packed, stamp
+        return self._packed
+    
+    def read(self, name: str) -> Optional[str]:
+        git_dir, common_dir = self.dirs()
+        value = self._read_file(os.path.join(git_dir if name == "HEAD" else common_dir, name))
+        if value is None:
+            return self._packed_refs().get(name)
+        if value.startswith("ref: "):
+            return self.read(value[len("ref: "):])
+        return value
+    
+    def head_ref(self) -> Optional[str]:
+        value = self._read_file(os.path.join(self.dirs()[0], "HEAD")) or ""
+        return value[len("ref: "):] if value.startswith("ref: ") else None
+    
+    def snapshot(self, refs: Tuple[str, ...] = ()) -> RefState:
+        head_ref = self.head_ref()
+        # HEAD is only tracked by value while it is detached
+        names = set(refs) - {"HEAD"}
+        names.add(head_ref or "HEAD")
+        return RefState(head_ref, {name: self.read(name) for name in sorted(names)})
+    
+    def in_progress(self) -> Optional[str]:
+        git_dir = self.dirs()[0]
+        for name in IN_PROGRESS:
+            if os.path.exists(os.path.join(git_dir, name)):
+                return name
+        return None
+
+
+def transaction(target: RefState, current: RefState) -> bytes:
+    lines = ["start"]
+    detach = target.head_ref is None and target.head is not None
+    for name in sorted((set(target.refs) | set(current.refs)) - {"HEAD"}):
+        new = target.refs.get(name)
+        old = current.refs.get(name)
+        if new == old:
+            # git refuses to verify HEAD's referent while rewriting HEAD itself
+            if old is not None and not (detach and name == current.head_ref):
+                lines.append(f"verify {name} {old}")
+        elif new is None:
+            lines.append(f"delete {name} {old}")
+        elif old is None:
+            lines.append(f"create {name} {new}")
+        else:
+            lines.append(f"update {name} {new} {old}")
+    
+    # a detached target rewrites HEAD itself instead of the branch it points to
+    if detach:
+        lines.append("option no-deref")
+        old = current.refs.get("HEAD", "") if current.head_ref is None else ""
+        lines.append(f"update HEAD {target.head} {old}".rstrip())
+    lines.extend(["prepare", "commit"])
+    return ("\n".join(lines) + "\n").encode()
+
+
+class Journal:
+    def __init__(self, repo: Repository, max_entries: int = MAX_ENTRIES):
+        self.repo = repo
+        self.refs = RefReader(repo)
+        self.max_entries = max_entries
+        self.entries: List[Operation] = []
+        self.position = 0
+        self._loaded = False
+    
+    def _path(self) -> str:
+        return os.path.join(self.refs.dirs()[0], JOURNAL_FILE)
+    
+    def load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self._path()) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.entries = [Operation.from_dict(entry) for entry in data.get("entries", [])]
+        self.position = min(data.get("position", len(self.entries)), len(self.entries))
+    
+    def save(self):
+        path = self._path()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"position": self.position, "entries": [asdict(entry) for entry in self.entries]}, f)
+        os.replace(tmp, path)
+    
+    def current_branch(self) -> Tuple[str, ...]:
+        head_ref = self.refs.head_ref()
+        return (head_ref,) if head_ref else ()
+    
+    @contextmanager
+    def record(self, label: str, refs: Tuple[str, ...] = ()) -> Iterator[None]:
+        self.load()
+        refs = tuple(refs) + self.current_branch()
+        before = self.refs.snapshot(refs)
+        try:
+            yield
+        finally:
+            after = self.refs.snapshot(refs + self.current_branch())
+            # refs first seen afterwards (a newly checked out branch) were not touched
+            for name, oid in after.refs.items():
+                if name != "HEAD":
+                    before.refs.setdefault(name, oid)
+            if after != before:
+                del self.entries[self.position:]
+                self.entries.append(Operation(label, before, after))
+                del self.entries[:-self.max_entries]
+                self.position = len(self.entries)
+                self.save()
+    
+    def can_undo(self) -> bool:
+        self.load()
+        return self.position > 0
+    
+    def can_redo(self) -> bool:
+        self.load()
+        return self.position < len(self.entries)
+    
+    def undo(self) -> Operation:
+        if not self.can_undo():
+            raise JournalError("Nothing to undo")
+        operation = self.entries[self.position - 1]
+        self._restore(operation.before, operation.after, f"undo {operation.label}")
+        self.position -= 1
+        self.save()
+        return operation
+    
+    def redo(self) -> Operation:
+        if not self.can_redo():
+            raise JournalError("Nothing to redo")
+        operation = self.entries[self.position]
+        self._restore(operation.after, operation.before, f"redo {operation.label}")
+        self.position += 1
+        self.save()
+        return operation
+    
+    def _restore(self, target: RefState, expected: RefState, reason: str):
+        state = self.refs.in_progress()
+        if state is not None:
+            raise JournalError(f"An operation is in progress ({state}); finish or abort it first")
+        
+        current = self.refs.snapshot(tuple(expected.refs))
+        if current != expected:
+            raise JournalError("Refs have moved since this operation; refusing to overwrite them")
+        
+        git = self.repo.root_git()
+        # two-tree read-tree moves the index and worktree like checkout, keeping local edits
+        move_tree = target.head != expected.head and target.head and expected.head
+        if move_tree:
+            self._check(git.run("read-tree", "-m", "-u", expected.head, target.head))
+        
+        result = git.run("update-ref", "-m", f"gittui: {reason}", "--stdin", input=transaction(target, expected))
+        if not result.success and move_tree:
+            git.run("read-tree", "-m", "-u", target.head, expected.head)
+        self._check(result)
+        
+        if target.head_ref is not None and target.head_ref != expected.head_ref:
+            self._check(git.run("symbolic-ref", "HEAD", target.head_ref))
+    
+    def _check(self, result: GitResult):
+        if not result.success:
+            raise JournalError(result.error.strip() or "git failed")
@@ -0,0 +1,192 @@
+"""Object store health report and idle-time `git maintenance` runs with timings."""
+
+import glob
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from gittui.git.commands import NO_TIMEOUT, GitResult
+from gittui.git.history import CommitGraph
+from gittui.git.repository import Repository
+
+# the order git maintenance itself runs them in
+TASKS = ("prefetch", "loose-objects", "incremental-repack", "commit-graph")
+
+LOOSE_OBJECT_LIMIT = 100
+PACK_LIMIT = 10
+
+TIMING_RUNS = 3
+
+IDLE_SECONDS = 2.0
+IDLE_POLL = 0.25
+
+
+@dataclass
+class RepoHealth:
+    counts: Dict[str, int] = field(default_factory=dict)
+    commit_graph: bool = False
+    changed_paths: bool = False
+    multi_pack_index: bool = False
+    bitmap: bool = False
+    remotes: int = 0
+    
+    @property
+    def loose_objects(self) -> int:
+        return self.counts.get("count", 0)
+    
+    @property
+    def packs(self) -> int:
+        return self.counts.get("packs", 0)
+    
+    def recommended(self) -> List[str]:
+        tasks = []
+        if not self.commit_graph or not self.changed_paths:
+            tasks.append("commit-graph")
+        if self.packs > PACK_LIMIT or (self.packs > 1 and not self.multi_pack_index):
+            tasks.append("incremental-repack")
+        if self.loose_objects > LOOSE_OBJECT_LIMIT:
+            tasks.append("loose-objects")
+        return tasks
+
+
+def parse_count_objects(text: str) -> Dict[str, int]:
+    counts = {}
+    for line in text.splitlines():
+        name, _, value = line.partition(": ")
+        try:
+            counts[name.strip()] = int(value)
+        except ValueError:
+            continue
+    return counts
+
+
+class Maintenance:
+    def __init__(self, repo: Repository):
+        self.repo = repo
+        self.commit_graph = CommitGraph(repo)
+    
+    def objects_dir(self) -> Optional[str]:
+        result = self.repo.git.run("rev-parse", "--git-path", "objects")
+        if not result.success:
+            return None
+        return os.path.join(self.repo.git.cwd, result.text.strip())
+    
+    def health(self) -> RepoHealth:
+        result = self.repo.git.run("count-objects", "-v")
+        health = RepoHealth(parse_count_objects(result.text) if result.success else {})
+        
+        objects = self.objects_dir()
+        if objects is not None:
+            pack_dir = os.path.join(objects, "pack")
+            health.multi_pack_index = os.path.isfile(os.path.join(pack_dir, "multi-pack-index"))
+            health.bitmap = bool(glob.glob(os.path.join(glob.escape(pack_dir), "*.bitmap")))
+        health.commit_graph = bool(self.commit_graph.files())
+        health.changed_paths = health.commit_graph and self.commit_graph.has_changed_paths()
+        
+        remotes = self.repo.git.run("remote")
+        health.remotes = len(remotes.text.split()) if remotes.success else 0
+        return health
+    
+    def hot_commands(self) -> List[Tuple[str, Callable[[], object]]]:
+        # what the panels run on every refresh, plus a full commit walk
+        repo = self.repo
+        return [
+            ("status", repo.status),
+            ("log", lambda: repo.log(100)),
+            ("branch info", repo.branch_info),
+            ("rev-list --count", lambda: repo.git.run("rev-list", "--count", "HEAD")),
+        ]
+    
+    def time_commands(self) -> Dict[str, float]:
+        timings = {}
+        for label, command in self.hot_commands():
+            best = None
+            for _ in range(TIMING_RUNS):
+                start = time.perf_counter()
+                command()
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            timings[label] = best
+        return timings
+    
+    def run_task(self, task: str) -> GitResult:
+        result = self.repo.git.run("maintenance", "run", f"--task={task}", "--quiet", timeout=NO_TIMEOUT)
+        # the maintenance task keeps Bloom filters only if the graph already had them
+        if result.success and task == "commit-graph" and not self.commit_graph.has_changed_paths():
+            result = self.commit_graph.write()
+        return result
+
+
+class MaintenanceJob:
+    def __init__(self, maintenance: Maintenance, tasks: List[str], idle_seconds: float = IDLE_SECONDS):
+        self.maintenance = maintenance
+        self.tasks = list(tasks)
+        self.idle_seconds = idle_seconds
+        self.before: Dict[str, float] = {}
+        self.after: Dict[str, float] = {}
+        self.results: Dict[str, GitResult] = {}
+        self.current: Optional[str] = None
+        self.cancelled = threading.Event()
+        self._active = time.monotonic()
+        self._held = False
+        self._thread: Optional[threading.Thread] = None
+    
+    def touch(self):
+        self._active = time.monotonic()
+    
+    def hold(self, held: bool = True):
+        # a held job waits regardless of key activity, e.g. while a menu action runs
+        self._held = held
+        self.touch()
+    
+    def _busy(self) -> bool:
+        if self._held or time.monotonic() - self._active < self.idle_seconds:
+            return True
+        # another git process is writing the index
+        git_dir = self.maintenance.repo.git_dir()
+        return git_dir is not None and os.path.exists(os.path.join(git_dir, "index.lock"))
+    
+    def _wait_idle(self) -> bool:
+        while self._busy():
+            if self.cancelled.wait(IDLE_POLL):
+                return False
+        return not self.cancelled.is_set()
+    
+    def run(self):
+        # timings taken while the user is busy would measure their git commands too
+        if not self._wait_idle():
+            return
+        self.before = self.maintenance.time_commands()
+        try:
+            for task in self.tasks:
+                if not self._wait_idle():
+                    return
+                self.current = task
+                self.results[task] = self.maintenance.run_task(task)
+        finally:
+            self.current = None
+        if not self.cancelled.is_set():
+            self.after = self.maintenance.time_commands()
+    
+    def start(self, on_done: Optional[Callable[["MaintenanceJob"], None]] = None) -> threading.Thread:
+        def run():
+            self.run()
+            if on_done is not None:
+                on_done(self)
+        
+        self._thread = threading.Thread(target=run, name="gittui-maintenance", daemon=True)
+        self._thread.start()
+        return self._thread
+    
+    def cancel(self):
+        self.cancelled.set()
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    @property
+    def done(self) -> bool:
+        return self._thread is not None and not self._thread.is_alive()
@@ -0,0 +1,83 @@
+"""Byte-level helpers for git output that defer decoding until display."""
+
+from array import array
+from typing import Iterator, List, Optional, Sequence, Union, overload
+
+ENCODING = "utf-8"
+ERRORS = "surrogateescape"
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+def decode(data: Buffer) -> str:
+    return str(data, ENCODING, ERRORS)
+
+
+def encode(text: str) -> bytes:
+    return text.encode(ENCODING, ERRORS)
+
+
+def iter_records(data: bytes, sep: bytes = b"\0") -> Iterator[memoryview]:
+    view = memoryview(data)
+    start = 0
+    end = len(data)
+    
+    while start < end:
+        stop = data.find(sep, start)
+        if stop == -1:
+            stop = end
+        yield view[start:stop]
+        start = stop + 1
+
+
+def split_z(data: bytes) -> List[memoryview]:
+    return list(iter_records(data))
+
+
+class LazyLines(Sequence[str]):
+    def __init__(self, data: bytes):
+        self.data = data
+        self._view = memoryview(data)
+        self._offsets: Optional[array] = None
+    
+    def _index(self) -> array:
+        if self._offsets is None:
+            offsets = array("Q", [0])
+            find = self.data.find
+            pos = find(b"\n")
+            while pos != -1:
+                offsets.append(pos + 1)
+                pos = find(b"\n", pos + 1)
+            if offsets[-1] != len(self.data):
+                offsets.append(len(self.data) + 1)
+            self._offsets = offsets
+        return self._offsets
+    
+    def __len__(self) -> int:
+        return len(self._index()) - 1
+    
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+    
+    @overload
+    def __getitem__(self, index: slice) -> List[str]: ...
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        
+        offsets = self._index()
+        count = len(offsets) - 1
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("line index out of range")
+        
+        return decode(self.raw(index))
+    
+    def raw(self, index: int) -> memoryview:
+        offsets = self._index()
+        return self._view[offsets[index]:offsets[index + 1] - 1]
+    
+    def is_blank(self) -> bool:
+        return not self.data.strip()
@@ -0,0 +1,161 @@
+"""Interactive rebase plans executed as one `git rebase -i` with a prepared todo."""
+
+import os
+import shlex
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from gittui.git.commands import NO_TIMEOUT, GitResult
+from gittui.git.repository import LOG_FORMAT, Commit, Repository, parse_log_record
+
+PICK, SQUASH, FIXUP, DROP = "pick", "squash", "fixup", "drop"
+ACTIONS = (PICK, SQUASH, FIXUP, DROP)
+
+AUTOSQUASH_PREFIXES = (("fixup! ", FIXUP), ("squash! ", SQUASH))
+
+TODO_FILE = os.path.join("gittui", "rebase-todo")
+
+# squash messages are kept as git combines them instead of opening an editor
+NO_EDITOR = {"GIT_EDITOR": "true"}
+
+
+class RebasePlanError(Exception):
+    pass
+
+
+@dataclass
+class TodoItem:
+    commit: Commit
+    action: str = PICK
+    refs: List[str] = field(default_factory=list)
+
+
+def split_autosquash(subject: str):
+    action = None
+    # "fixup! fixup! subject" targets the same commit as "fixup! subject"
+    while True:
+        for prefix, prefix_action in AUTOSQUASH_PREFIXES:
+            if subject.startswith(prefix):
+                subject = subject[len(prefix):]
+                action = action or prefix_action
+                break
+        else:
+            return action, subject
+
+
+class RebasePlan:
+    def __init__(self, repo: Repository, upstream: str):
+        self.repo = repo
+        self.upstream = upstream
+        self.items: List[TodoItem] = []
+        self.update_refs = False
+        self.head_ref: Optional[str] = None
+        self._loaded: List[str] = []
+    
+    def load(self) -> List[TodoItem]:
+        git = self.repo.git
+        result = git.run("log", "-z", "--reverse", "--no-merges", LOG_FORMAT, f"{self.upstream}..HEAD", "--")
+        if not result.success:
+            raise RebasePlanError(result.error.strip() or f"Cannot list commits since {self.upstream}")
+        commits = [commit for commit in map(parse_log_record, result.records()) if commit is not None]
+        
+        head = git.run("symbolic-ref", "-q", "HEAD")
+        self.head_ref = head.text.strip() if head.success else None
+        refs = self._branch_tips(self.head_ref)
+        self.items = [TodoItem(commit, PICK, refs.get(commit.sha, [])) for commit in commits]
+        self._loaded = [commit.sha for commit in commits]
+        return self.items
+    
+    def _branch_tips(self, exclude: Optional[str]) -> Dict[str, List[str]]:
+        result = self.repo.git.run("for-each-ref", "--format=%(objectname) %(refname)", "refs/heads/")
+        tips: Dict[str, List[str]] = {}
+        for line in result.text.splitlines() if result.success else ():
+            oid, _, name = line.partition(" ")
+            if name != exclude:
+                tips.setdefault(oid, []).append(name)
+        return tips
+    
+    def set_action(self, index: int, action: str):
+        self.items[index].action = action
+    
+    def move(self, index: int, delta: int) -> int:
+        target = index + delta
+        if not 0 <= target < len(self.items):
+            return index
+        self.items[index], self.items[target] = self.items[target], self.items[index]
+        return target
+    
+    def autosquash(self) -> int:
+        # the last item squashed into each target, so fixups keep their order
+        tails: Dict[str, TodoItem] = {}
+        moved = 0
+        for item in list(self.items):
+            action, rest = split_autosquash(item.commit.subject)
+            if action is None:
+                continue
+            target = self._autosquash_target(rest, item)
+            if target is None:
+                continue
+            self.items.remove(item)
+            after = tails.get(target.commit.sha, target)
+            self.items.insert(self.items.index(after) + 1, item)
+            item.action = action
+            tails[target.commit.sha] = item
+            moved += 1
+        return moved
+    
+    def _autosquash_target(self, rest: str, item: TodoItem) -> Optional[TodoItem]:
+        for candidate in self.items:
+            if candidate is item:
+                break
+            if candidate.commit.subject == rest or (len(rest) >= 4 and candidate.commit.sha.startswith(rest)):
+                return candidate
+        return None
+    
+    def validate(self):
+        kept = [item for item in self.items if item.action != DROP]
+        if not kept:
+            raise RebasePlanError("Every commit is dropped; reset the branch instead")
+        if kept[0].action in (SQUASH, FIXUP):
+            raise RebasePlanError(f"Cannot {kept[0].action} without a previous commit")
+    
+    def todo(self) -> bytes:
+        lines = []
+        pending: List[str] = []
+        for item in self.items:
+            # a branch moves to its commit after the fixups squashed into it
+            if item.action not in (SQUASH, FIXUP):
+                lines.extend(f"update-ref {ref}" for ref in pending)
+                pending = []
+            lines.append(f"{item.action} {item.commit.sha} {item.commit.subject}")
+            if self.update_refs:
+                pending.extend(item.refs)
+        lines.extend(f"update-ref {ref}" for ref in pending)
+        return ("\n".join(lines) + "\n").encode()
+    
+    def changed(self) -> bool:
+        order = [item.commit.sha for item in self.items]
+        return order != self._loaded or any(item.action != PICK for item in self.items)
+    
+    def updated_refs(self) -> List[str]:
+        if not self.update_refs:
+            return []
+        return [ref for item in self.items for ref in item.refs]
+    
+    def run(self) -> GitResult:
+        self.validate()
+        git_dir = self.repo.git_dir()
+        if git_dir is None:
+            raise RebasePlanError("Not a git repository")
+        path = os.path.join(git_dir, TODO_FILE)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(self.todo())
+        
+        args = ["rebase", "-i"]
+        if self.update_refs:
+            args.append("--update-refs")
+        args.append(self.upstream)
+        # git appends the todo path, so the sequence editor just copies the plan over it
+        env = dict(NO_EDITOR, GIT_SEQUENCE_EDITOR=f"cp {shlex.quote(path)}")
+        return self.repo.root_git().run(*args, timeout=NO_TIMEOUT, env=env)
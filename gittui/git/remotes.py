@@ -0,0 +1,279 @@
+"""Remote details from local config and tracking refs, with cached `ls-remote` snapshots."""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from gittui.git.journal import JournalError, RefReader
+from gittui.git.output import decode, iter_records
+from gittui.git.repository import Repository
+
+SNAPSHOT_FILE = os.path.join("gittui", "remotes.json")
+# snapshots older than this are refreshed in the background when asked to
+SNAPSHOT_MAX_AGE = 15 * 60
+
+REF_FORMAT = "--format=%(refname)%00%(objectname)%00%(symref)%00%(upstream)%00%(upstream:track,nobracket)"
+
+# never wait on a credential prompt the TUI cannot show
+NO_PROMPT = {"GIT_TERMINAL_PROMPT": "0"}
+BATCH_SSH = "ssh -o BatchMode=yes"
+
+UP_TO_DATE = "up to date"
+CHANGED = "changed on remote"
+NEW = "new on remote"
+GONE = "gone from remote"
+
+
+@dataclass
+class RemoteSnapshot:
+    timestamp: float = 0.0
+    heads: Dict[str, str] = field(default_factory=dict)
+    tags: int = 0
+    head: Optional[str] = None
+    error: Optional[str] = None
+    checked: float = 0.0
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RemoteSnapshot":
+        # the file may have been written by a newer version with more fields
+        return cls(**{f.name: data[f.name] for f in fields(cls) if f.name in data})
+    
+    @property
+    def age(self) -> float:
+        return time.time() - self.timestamp
+
+
+@dataclass
+class TrackingBranch:
+    name: str
+    upstream: str
+    track: str
+
+
+@dataclass
+class RemoteInfo:
+    name: str
+    urls: List[str] = field(default_factory=list)
+    push_urls: List[str] = field(default_factory=list)
+    fetch: List[str] = field(default_factory=list)
+    tracking: Dict[str, str] = field(default_factory=dict)
+    head: Optional[str] = None
+    branches: List[TrackingBranch] = field(default_factory=list)
+    snapshot: Optional[RemoteSnapshot] = None
+    
+    @property
+    def url(self) -> str:
+        return self.urls[0] if self.urls else ""
+    
+    def branch_states(self) -> List[Tuple[str, Optional[str], Optional[str], str]]:
+        remote = self.snapshot.heads if self.snapshot is not None and self.snapshot.timestamp else None
+        states = []
+        for branch in sorted(set(self.tracking) | set(remote or ())):
+            local = self.tracking.get(branch)
+            if remote is None:
+                states.append((branch, local, None, ""))
+                continue
+            theirs = remote.get(branch)
+            if local is None:
+                state = NEW
+            elif theirs is None:
+                state = GONE
+            else:
+                state = UP_TO_DATE if local == theirs else CHANGED
+            states.append((branch, local, theirs, state))
+        return states
+
+
+def parse_remote_config(data: bytes) -> Tuple[Dict[str, RemoteInfo], Dict[str, Tuple[str, str]]]:
+    remotes: Dict[str, RemoteInfo] = {}
+    branches: Dict[str, Dict[str, str]] = {}
+    for record in iter_records(data):
+        key, _, value = bytes(record).partition(b"\n")
+        section, _, rest = decode(key).partition(".")
+        name, _, field_name = rest.rpartition(".")
+        if not name:
+            # two-level keys such as remote.pushDefault name no remote or branch
+            continue
+        value = decode(value)
+        if section == "remote":
+            info = remotes.setdefault(name, RemoteInfo(name))
+            if field_name == "url":
+                info.urls.append(value)
+            elif field_name == "pushurl":
+                info.push_urls.append(value)
+            elif field_name == "fetch":
+                info.fetch.append(value)
+        elif section == "branch":
+            branches.setdefault(name, {})[field_name] = value
+    upstreams = {name: (values["remote"], values.get("merge", "")) for name, values in branches.items()
+                 if "remote" in values}
+    return remotes, upstreams
+
+
+def parse_ls_remote(data: bytes) -> RemoteSnapshot:
+    snapshot = RemoteSnapshot(timestamp=time.time())
+    for line in decode(data).splitlines():
+        target, _, ref = line.partition("\t")
+        if target.startswith("ref: "):
+            if ref == "HEAD":
+                snapshot.head = target[len("ref: "):].rpartition("refs/heads/")[2]
+        elif ref.startswith("refs/heads/"):
+            snapshot.heads[ref[len("refs/heads/"):]] = target
+        elif ref.startswith("refs/tags/") and not ref.endswith("^{}"):
+            snapshot.tags += 1
+    snapshot.checked = snapshot.timestamp
+    return snapshot
+
+
+class RemoteSet:
+    def __init__(self, repo: Repository, jobs: int = 4):
+        self.repo = repo
+        self.jobs = max(1, jobs)
+        self.remotes: Dict[str, RemoteInfo] = {}
+        self.refs = RefReader(repo)
+        self._lock = threading.Lock()
+        self._refreshing: Dict[str, bool] = {}
+        self._thread: Optional[threading.Thread] = None
+    
+    def names(self) -> List[str]:
+        return list(self.remotes)
+    
+    def load(self) -> Dict[str, RemoteInfo]:
+        # config and refs are read once each, and nothing here touches the network
+        config = self.repo.git.run("config", "-z", "--get-regexp", r"^(remote|branch)\.")
+        remotes, upstreams = parse_remote_config(config.stdout) if config.success else ({}, {})
+        
+        result = self.repo.git.run("for-each-ref", REF_FORMAT, "refs/remotes", "refs/heads")
+        for line in result.text.splitlines() if result.success else []:
+            refname, oid, symref, upstream, track = line.split("\0")
+            if refname.startswith("refs/heads/"):
+                branch = refname[len("refs/heads/"):]
+                if branch in upstreams and upstreams[branch][0] in remotes:
+                    info = remotes[upstreams[branch][0]]
+                    info.branches.append(TrackingBranch(branch, upstream.replace("refs/remotes/", "", 1), track))
+                continue
+            name, branch = self._split_tracking(refname[len("refs/remotes/"):], remotes)
+            if name is None:
+                continue
+            if branch == "HEAD":
+                remotes[name].head = symref.rpartition(f"refs/remotes/{name}/")[2] or None
+            else:
+                remotes[name].tracking[branch] = oid
+        
+        snapshots = self._read_snapshots()
+        with self._lock:
+            for name, info in remotes.items():
+                snapshot = snapshots.get(name)
+                current = self.remotes.get(name)
+                # a check that landed since the file was written is newer than the file
+                if current is not None and current.snapshot is not None and (
+                        snapshot is None or current.snapshot.checked > snapshot.checked):
+                    snapshot = current.snapshot
+                info.snapshot = snapshot
+            self.remotes = remotes
+        return remotes
+    
+    @staticmethod
+    def _split_tracking(path: str, remotes: Dict[str, RemoteInfo]) -> Tuple[Optional[str], str]:
+        # remote names may contain slashes, so the longest configured prefix wins
+        for name in sorted(remotes, key=len, reverse=True):
+            if path.startswith(name + "/"):
+                return name, path[len(name) + 1:]
+        return None, ""
+    
+    def _path(self) -> Optional[str]:
+        try:
+            return os.path.join(self.refs.dirs()[1], SNAPSHOT_FILE)
+        except JournalError:
+            return None
+    
+    def _read_snapshots(self) -> Dict[str, RemoteSnapshot]:
+        path = self._path()
+        if path is None:
+            return {}
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return {name: RemoteSnapshot.from_dict(values) for name, values in data.items()}
+    
+    def _write_snapshots(self):
+        path = self._path()
+        if path is None:
+            return
+        data = {name: asdict(info.snapshot) for name, info in self.remotes.items() if info.snapshot is not None}
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    
+    def stale(self, max_age: float = SNAPSHOT_MAX_AGE) -> List[str]:
+        return [name for name, info in self.remotes.items()
+                if info.snapshot is None or time.time() - info.snapshot.checked > max_age]
+    
+    def refreshing(self, name: str) -> bool:
+        return self._refreshing.get(name, False)
+    
+    def _environment(self) -> Dict[str, str]:
+        if "GIT_SSH_COMMAND" in os.environ or "GIT_SSH" in os.environ:
+            return dict(NO_PROMPT)
+        # a configured ssh command may carry an identity or a jump host, so it is left as is
+        configured = self.repo.git.run("config", "core.sshCommand")
+        if configured.success and configured.text.strip():
+            return dict(NO_PROMPT)
+        return {**NO_PROMPT, "GIT_SSH_COMMAND": BATCH_SSH}
+    
+    def _snapshot(self, name: str, env: Dict[str, str]):
+        result = self.repo.git.run("ls-remote", "--symref", name, env=env)
+        with self._lock:
+            # load() may have replaced the remotes while ls-remote was out
+            info = self.remotes.get(name)
+            if info is None:
+                return
+            if result.success:
+                info.snapshot = parse_ls_remote(result.stdout)
+            else:
+                # the last good listing stays, marked with when and why the refresh failed
+                snapshot = info.snapshot or RemoteSnapshot()
+                snapshot.error = (result.error.strip() or "ls-remote failed").split("\n")[0]
+                snapshot.checked = time.time()
+                info.snapshot = snapshot
+    
+    def refresh(self, names: Optional[List[str]] = None, on_update: Optional[Callable[[str], None]] = None):
+        names = [name for name in (names if names is not None else self.names()) if name in self.remotes]
+        for name in names:
+            self._refreshing[name] = True
+        env = self._environment()
+        
+        def run(name: str):
+            try:
+                self._snapshot(name, env)
+            finally:
+                self._refreshing[name] = False
+            if on_update is not None:
+                on_update(name)
+        
+        if names:
+            # every remote is its own round trip, so they are queried side by side
+            with ThreadPoolExecutor(max_workers=min(self.jobs, len(names)), thread_name_prefix="gittui-remote") as pool:
+                list(pool.map(run, names))
+            with self._lock:
+                self._write_snapshots()
+    
+    def refresh_async(self, names: Optional[List[str]] = None,
+                      on_update: Optional[Callable[[str], None]] = None) -> Optional[threading.Thread]:
+        if self.running:
+            return None
+        self._thread = threading.Thread(target=self.refresh, args=(names, on_update), name="gittui-remotes", daemon=True)
+        self._thread.start()
+        return self._thread
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
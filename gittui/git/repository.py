@@ -0,0 +1,157 @@
+"""Repository state read from machine-readable git output."""
+
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Optional
+
+from gittui.git.commands import GitCommands
+from gittui.git.output import Buffer, decode, iter_records
+
+LOG_FORMAT = "--format=%H%x1f%h%x1f%an%x1f%s"
+
+
+@dataclass
+class FileStatus:
+    index: str
+    worktree: str
+    raw_path: bytes
+    raw_orig_path: Optional[bytes] = None
+    # what changed inside a modified submodule, filled in by SubmoduleSet.annotate
+    submodule: Optional[str] = None
+    
+    @property
+    def path(self) -> str:
+        return decode(self.raw_path)
+    
+    @property
+    def orig_path(self) -> Optional[str]:
+        if self.raw_orig_path is None:
+            return None
+        return decode(self.raw_orig_path)
+    
+    @property
+    def staged(self) -> bool:
+        return self.index not in (" ", "?", "!")
+    
+    @property
+    def untracked(self) -> bool:
+        return self.index == "?"
+
+
+@dataclass
+class Commit:
+    sha: str
+    short_sha: str
+    author: str
+    raw_subject: bytes
+    
+    @property
+    def subject(self) -> str:
+        return decode(self.raw_subject)
+
+
+@dataclass
+class BranchInfo:
+    name: str
+    upstream: Optional[str] = None
+    ahead: int = 0
+    behind: int = 0
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BranchInfo":
+        # a newer daemon may send fields this version does not know
+        return cls(**{f.name: data[f.name] for f in fields(cls) if f.name in data})
+
+
+def parse_status_z(data: bytes) -> List[FileStatus]:
+    entries = []
+    records = iter_records(data)
+    
+    for record in records:
+        if len(record) < 4:
+            continue
+        index = chr(record[0])
+        worktree = chr(record[1])
+        orig = None
+        if index in "RC":
+            orig = bytes(next(records, b""))
+        entries.append(FileStatus(index, worktree, bytes(record[3:]), orig))
+    
+    return entries
+
+
+def parse_log_record(record: Buffer) -> Optional[Commit]:
+    fields = bytes(record).split(b"\x1f", 3)
+    if len(fields) != 4:
+        return None
+    sha, short_sha, author, subject = fields
+    return Commit(sha.decode(), short_sha.decode(), decode(author), subject)
+
+
+def parse_log_z(data: bytes) -> List[Commit]:
+    commits = []
+    for record in iter_records(data):
+        commit = parse_log_record(record)
+        if commit is not None:
+            commits.append(commit)
+    return commits
+
+
+class Repository:
+    def __init__(self, path: str = ".", git: Optional[GitCommands] = None):
+        self.path = path
+        self.git = git or GitCommands(path)
+        self._root: Optional[str] = None
+    
+    def is_valid(self) -> bool:
+        return self.git.run("rev-parse", "--git-dir").success
+    
+    def git_dir(self) -> Optional[str]:
+        result = self.git.run("rev-parse", "--absolute-git-dir")
+        return result.text.strip() if result.success else None
+    
+    def root(self) -> Optional[str]:
+        if self._root is None:
+            result = self.git.run("rev-parse", "--show-toplevel")
+            if result.success:
+                self._root = result.text.strip()
+        return self._root
+    
+    def invalidate(self, *sections: str):
+        # reads always run git; cached subclasses drop their copies here
+        pass
+    
+    def root_git(self) -> GitCommands:
+        return GitCommands(self.root() or self.path, self.git.git_path, self.git.timeout)
+    
+    def status(self) -> List[FileStatus]:
+        result = self.git.run("status", "--porcelain=v1", "-z", "--untracked-files=all")
+        if not result.success:
+            return []
+        return parse_status_z(result.stdout)
+    
+    def head_oid(self) -> Optional[str]:
+        result = self.git.run("rev-parse", "--verify", "--quiet", "HEAD")
+        return result.text.strip() if result.success else None
+    
+    def branch_info(self) -> BranchInfo:
+        result = self.git.run("rev-parse", "--abbrev-ref", "HEAD")
+        info = BranchInfo(result.text.strip() if result.success else "(unknown)")
+        
+        upstream = self.git.run("rev-parse", "--abbrev-ref", "--symbolic-full-name", "@{upstream}")
+        if not upstream.success:
+            return info
+        info.upstream = upstream.text.strip()
+        
+        counts = self.git.run("rev-list", "--count", "--left-right", "@{upstream}...HEAD")
+        if counts.success:
+            behind, ahead = counts.text.split()
+            info.behind, info.ahead = int(behind), int(ahead)
+        return info
+    
+    def log(self, max_count: int = 100, *revisions: str) -> List[Commit]:
+        result = self.git.run(
+            "log", "-z", f"--max-count={max_count}", LOG_FORMAT, *revisions, "--"
+        )
+        if not result.success:
+            return []
+        return parse_log_z(result.stdout)
@@ -0,0 +1,512 @@
+"""Append-only inverted commit index stored under the git directory."""
+
+import json
+import mmap
+import os
+import re
+import struct
+import subprocess
+import threading
+from array import array
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from gittui.git.output import decode, encode
+from gittui.git.repository import Commit, Repository, parse_log_record
+
+INDEX_DIR = os.path.join("gittui", "search")
+VERSION = 2
+
+SEGMENT_MAGIC = b"GTS2"
+SEGMENT_HEADER = struct.Struct("<4sI")
+# term offset, term length, postings offset, postings count
+SEGMENT_ENTRY = struct.Struct("<QIQI")
+SEGMENT_NAME = re.compile(r"seg-(\d+)-(\d+)\.idx")
+SEGMENT_DOCS = 100000
+# this many segments of one size class are merged into one of the next
+MERGE_FACTOR = 8
+READ_SIZE = 1 << 20
+
+RECORD_FORMAT = "--format=%x1e%H%x1f%h%x1f%an%x1f%ae%x1f%B"
+TOKEN = re.compile(r"\w{2,}")
+
+FIELD_PREFIXES = ("author:", "path:")
+
+
+class IndexBusy(Exception):
+    pass
+
+
+def tokenize(text: str) -> Set[str]:
+    return set(TOKEN.findall(text.lower()))
+
+
+def document_terms(author: str, email: str, message: str, paths: Iterable[bytes]) -> Set[str]:
+    terms = tokenize(message)
+    terms.update(f"author:{token}" for token in tokenize(f"{author} {email}"))
+    terms.update(f"path:{decode(path).lower()}" for path in paths)
+    return terms
+
+
+def segment_name(first_doc: int, end_doc: int) -> str:
+    return f"seg-{first_doc:010d}-{end_doc:010d}.idx"
+
+
+def segment_span(name: str) -> Tuple[int, int]:
+    match = SEGMENT_NAME.fullmatch(name)
+    if match is None:
+        raise ValueError(f"{name}: not a search segment name")
+    return int(match.group(1)), int(match.group(2))
+
+
+def write_segment(path: str, postings: Dict[bytes, array]):
+    # UTF-8 byte order is code point order, so the directory is sorted like the terms
+    terms = sorted(postings)
+    
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(SEGMENT_HEADER.pack(SEGMENT_MAGIC, len(terms)))
+        term_offset = SEGMENT_HEADER.size + SEGMENT_ENTRY.size * len(terms)
+        offset = term_offset + sum(len(term) for term in terms)
+        for term in terms:
+            count = len(postings[term])
+            f.write(SEGMENT_ENTRY.pack(term_offset, len(term), offset, count))
+            term_offset += len(term)
+            offset += 4 * count
+        for term in terms:
+            f.write(term)
+        for term in terms:
+            f.write(postings[term].tobytes())
+    os.replace(tmp, path)
+
+
+class Segment:
+    # the term directory has fixed-width entries and is searched in place, so
+    # opening a segment reads nothing but the header
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._data) < SEGMENT_HEADER.size or self._data[:4] != SEGMENT_MAGIC:
+            self._data.close()
+            raise ValueError(f"{path}: not a search segment")
+        _, self.size = SEGMENT_HEADER.unpack_from(self._data, 0)
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def _entry(self, index: int) -> Tuple[int, int, int, int]:
+        return SEGMENT_ENTRY.unpack_from(self._data, SEGMENT_HEADER.size + SEGMENT_ENTRY.size * index)
+    
+    def term(self, index: int) -> bytes:
+        offset, length, _, _ = self._entry(index)
+        return self._data[offset:offset + length]
+    
+    def postings(self, index: int) -> array:
+        _, _, start, count = self._entry(index)
+        result = array("I")
+        result.frombytes(self._data[start:start + 4 * count])
+        return result
+    
+    def items(self) -> Iterator[Tuple[bytes, array]]:
+        for index in range(self.size):
+            yield self.term(index), self.postings(index)
+    
+    def _find(self, raw: bytes) -> int:
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            if self.term(middle) < raw:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+    
+    def lookup(self, term: str, prefix: bool = False) -> Set[int]:
+        raw = encode(term)
+        index = self._find(raw)
+        docs: Set[int] = set()
+        while index < self.size:
+            current = self.term(index)
+            if current != raw and not (prefix and current.startswith(raw)):
+                break
+            docs.update(self.postings(index))
+            index += 1
+        return docs
+    
+    def close(self):
+        self._data.close()
+
+
+class SearchIndex:
+    def __init__(self, repo: Repository):
+        self.repo = repo
+        self.segments: List[Segment] = []
+        self.tips: List[str] = []
+        self.count = 0
+        self._offsets = array("Q")
+        self._docs: Optional[mmap.mmap] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def directory(self) -> Optional[str]:
+        git_dir = self.repo.git_dir()
+        return os.path.join(git_dir, INDEX_DIR) if git_dir else None
+    
+    def _file(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+    
+    def exists(self) -> bool:
+        directory = self.directory
+        return directory is not None and os.path.isfile(os.path.join(directory, "meta.json"))
+    
+    def load(self) -> bool:
+        self.close()
+        if not self.exists():
+            return False
+        
+        for _ in range(3):
+            with open(self._file("meta.json")) as f:
+                meta = json.load(f)
+            if meta.get("version") != VERSION:
+                return False
+            try:
+                for name in meta["segments"]:
+                    self.segments.append(Segment(self._file(name)))
+                break
+            except FileNotFoundError:
+                # a writer merged these away after we read meta.json; read it again
+                self.close()
+        else:
+            return False
+        
+        self.tips = meta["tips"]
+        self.count = meta["count"]
+        
+        # anything past the recorded count belongs to an interrupted update
+        with open(self._file("docs.idx"), "rb") as f:
+            self._offsets.frombytes(f.read(8 * self.count))
+        if self.count:
+            with open(self._file("docs.dat"), "rb") as f:
+                self._docs = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return True
+    
+    def close(self):
+        for segment in self.segments:
+            segment.close()
+        self.segments = []
+        self._offsets = array("Q")
+        if self._docs is not None:
+            self._docs.close()
+            self._docs = None
+    
+    def doc(self, doc_id: int) -> Optional[Commit]:
+        start = self._offsets[doc_id]
+        end = self._docs.find(b"\0", start)
+        return parse_log_record(self._docs[start:end])
+    
+    def search(self, query: str, limit: Optional[int] = None) -> List[int]:
+        words = query.lower().split()
+        if not words:
+            return []
+        
+        result: Optional[Set[int]] = None
+        for position, word in enumerate(words):
+            prefix = position == len(words) - 1
+            if word.startswith(FIELD_PREFIXES):
+                terms, prefix = [word], True
+            else:
+                terms = TOKEN.findall(word) or [word]
+            
+            for term in terms:
+                docs: Set[int] = set()
+                for segment in self.segments:
+                    docs |= segment.lookup(term, prefix)
+                result = docs if result is None else result & docs
+                if not result:
+                    return []
+        
+        ordered = sorted(result, reverse=True)
+        return ordered[:limit] if limit is not None else ordered
+    
+    def _current_tips(self) -> List[str]:
+        result = self.repo.git.run(
+            "for-each-ref", "--format=%(objectname) %(*objectname)", "refs/heads", "refs/remotes", "refs/tags"
+        )
+        # annotated tags are recorded by the commit they peel to
+        tips = {line.split()[-1] for line in result.text.splitlines() if line.strip()} if result.success else set()
+        head = self.repo.head_oid()
+        if head:
+            tips.add(head)
+        return sorted(tips)
+    
+    def _known_tips(self) -> List[str]:
+        if not self.tips:
+            return []
+        result = self.repo.git.run(
+            "cat-file", "--batch-check=%(objectname) %(objecttype)",
+            input="\n".join(self.tips).encode() + b"\n",
+        )
+        return [
+            line.split()[0] for line in result.text.splitlines()
+            if line.endswith(" commit")
+        ]
+    
+    def update(self, progress: Optional[Callable[[int], None]] = None,
+               cancel: Optional[threading.Event] = None) -> int:
+        if not self._lock.acquire(blocking=False):
+            raise IndexBusy("Search index update already running")
+        try:
+            return self._update(progress, cancel)
+        finally:
+            self._lock.release()
+    
+    def _update(self, progress, cancel) -> int:
+        directory = self.directory
+        if directory is None:
+            return 0
+        os.makedirs(directory, exist_ok=True)
+        
+        lock_path = self._file("lock")
+        if not self._acquire(lock_path):
+            if not self._break_stale(lock_path) or not self._acquire(lock_path):
+                raise IndexBusy(f"{lock_path} exists; another process is updating the index")
+        
+        try:
+            self.load()
+            return self._append(progress, cancel)
+        finally:
+            os.unlink(lock_path)
+    
+    @staticmethod
+    def _acquire(lock_path: str) -> bool:
+        # the lock appears with the owner's PID already in it
+        tmp = f"{lock_path}.{os.getpid()}.{threading.get_ident()}"
+        with open(tmp, "w") as f:
+            f.write(f"{os.getpid()}\n")
+        try:
+            os.link(tmp, lock_path)
+            return True
+        except FileExistsError:
+            return False
+        finally:
+            os.unlink(tmp)
+    
+    @staticmethod
+    def _lock_owner(lock_path: str) -> Optional[Tuple[int, int]]:
+        # (pid, inode) of the lock, or None once it is gone
+        try:
+            with open(lock_path) as f:
+                text = f.read().strip()
+                inode = os.fstat(f.fileno()).st_ino
+        except FileNotFoundError:
+            return None
+        return (int(text) if text.isdigit() else 0), inode
+    
+    @staticmethod
+    def _alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+    
+    @staticmethod
+    def _break_stale(lock_path: str) -> bool:
+        # a writer killed with the app leaves its lock behind
+        owner = SearchIndex._lock_owner(lock_path)
+        if owner is None:
+            return True
+        pid, _ = owner
+        if pid <= 0 or SearchIndex._alive(pid):
+            return False
+        
+        # two processes can both see the dead PID; only one of them can rename the
+        # lock away, and the other may then move the lock the first one just took
+        stale = f"{lock_path}.stale.{os.getpid()}.{threading.get_ident()}"
+        try:
+            os.rename(lock_path, stale)
+        except FileNotFoundError:
+            return True
+        try:
+            if SearchIndex._lock_owner(stale) == owner:
+                return True
+            # a live lock: put it back unless yet another writer has the name now
+            try:
+                os.link(stale, lock_path)
+            except FileExistsError:
+                pass
+            return False
+        finally:
+            os.unlink(stale)
+    
+    def _append(self, progress, cancel) -> int:
+        tips = self._current_tips()
+        if not tips:
+            return 0
+        revisions = tips + [f"^{tip}" for tip in self._known_tips()]
+        segments = [os.path.basename(segment.path) for segment in self.segments]
+        start = self.count
+        
+        process = self.repo.root_git().spawn(
+            "log", "-z", "--name-only", "--reverse", RECORD_FORMAT, "--stdin",
+            stdin=subprocess.PIPE,
+        )
+        process.stdin.write("\n".join(revisions).encode() + b"\n")
+        process.stdin.close()
+        
+        postings: Dict[str, array] = {}
+        count = self.count
+        segment_start = count
+        pending = b""
+        cancelled = False
+        
+        with open(self._file("docs.dat"), "ab") as docs, open(self._file("docs.idx"), "r+b" if count else "wb") as index:
+            index.truncate(8 * count)
+            index.seek(8 * count)
+            docs_end = self._docs.find(b"\0", self._offsets[-1]) + 1 if count else 0
+            self.close()
+            docs.truncate(docs_end)
+            docs.seek(docs_end)
+            
+            def add(record: bytes):
+                nonlocal count, segment_start
+                header, _, tail = record.partition(b"\0")
+                fields = header.split(b"\x1f", 4)
+                if len(fields) != 5:
+                    return
+                sha, short_sha, author, email, message = fields
+                
+                index.write(struct.pack("<Q", docs.tell()))
+                docs.write(b"\x1f".join((sha, short_sha, author, message.split(b"\n", 1)[0])) + b"\0")
+                
+                paths = [path for path in tail.lstrip(b"\n").split(b"\0") if path]
+                for term in document_terms(decode(author), decode(email), decode(message), paths):
+                    postings.setdefault(term, array("I")).append(count)
+                count += 1
+                
+                if count - segment_start >= SEGMENT_DOCS:
+                    segments.append(self._flush(postings, segment_start, count))
+                    postings.clear()
+                    segment_start = count
+                    if progress is not None:
+                        progress(count - start)
+            
+            with process.stdout:
+                while True:
+                    if cancel is not None and cancel.is_set():
+                        cancelled = True
+                        process.kill()
+                        break
+                    chunk = process.stdout.read1(READ_SIZE)
+                    if not chunk:
+                        break
+                    records = (pending + chunk).split(b"\x1e")
+                    pending = records.pop()
+                    for record in records:
+                        if record:
+                            add(record)
+                if pending and not cancelled:
+                    add(pending)
+            
+            if process.wait() != 0 or cancelled:
+                self.load()
+                return 0
+            if postings:
+                segments.append(self._flush(postings, segment_start, count))
+        
+        segments = self._merge(segments)
+        self.tips = tips
+        self._write_meta(segments, count)
+        self._remove_unused(segments)
+        self.load()
+        if progress is not None:
+            progress(count - start)
+        return count - start
+    
+    def _flush(self, postings: Dict[str, array], first_doc: int, end_doc: int) -> str:
+        name = segment_name(first_doc, end_doc)
+        write_segment(self._file(name), {encode(term): docs for term, docs in postings.items()})
+        return name
+    
+    @staticmethod
+    def _tier(name: str) -> int:
+        first, end = segment_span(name)
+        docs, tier = end - first, 0
+        while docs >= MERGE_FACTOR:
+            docs //= MERGE_FACTOR
+            tier += 1
+        return tier
+    
+    def _merge(self, segments: List[str]) -> List[str]:
+        # size-tiered: every pull adds a small segment at the end, and once MERGE_FACTOR
+        # of one size class have collected there they become one segment of the next,
+        # so the count grows with the log of the history rather than with the pulls
+        while True:
+            run: List[str] = []
+            for name in reversed(segments):
+                first, end = segment_span(name)
+                if end - first >= SEGMENT_DOCS or (run and self._tier(name) != self._tier(run[0])):
+                    break
+                run.append(name)
+            if len(run) < MERGE_FACTOR:
+                return segments
+            
+            run.reverse()
+            postings: Dict[bytes, array] = {}
+            for name in run:
+                segment = Segment(self._file(name))
+                try:
+                    # doc ids grow from one segment to the next, so appending keeps them sorted
+                    for term, docs in segment.items():
+                        postings.setdefault(term, array("I")).extend(docs)
+                finally:
+                    segment.close()
+            merged = segment_name(segment_span(run[0])[0], segment_span(run[-1])[1])
+            write_segment(self._file(merged), postings)
+            segments = segments[:-len(run)] + [merged]
+    
+    def _remove_unused(self, segments: List[str]):
+        # merged segments and those of interrupted updates; readers still holding
+        # them keep their mappings, and load() retries if one goes missing
+        keep = set(segments)
+        for name in os.listdir(self.directory):
+            if name.startswith("seg-") and name.endswith(".idx") and name not in keep:
+                try:
+                    os.unlink(self._file(name))
+                except FileNotFoundError:
+                    pass
+    
+    def _write_meta(self, segments: List[str], count: int):
+        # meta.json is written last and atomically; it is the commit point
+        tmp = self._file("meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"version": VERSION, "tips": self.tips, "count": count, "segments": segments}, f)
+        os.replace(tmp, self._file("meta.json"))
+    
+    def update_async(self, on_done: Optional[Callable[[int], None]] = None,
+                     cancel: Optional[threading.Event] = None) -> Optional[threading.Thread]:
+        if self.updating:
+            return None
+        
+        def run():
+            # a separate writer keeps this instance safe to read meanwhile
+            writer = SearchIndex(self.repo)
+            try:
+                added = writer.update(cancel=cancel)
+            except (IndexBusy, OSError, ValueError):
+                return
+            finally:
+                writer.close()
+            if on_done is not None:
+                on_done(added)
+        
+        self._thread = threading.Thread(target=run, name="gittui-search-index", daemon=True)
+        self._thread.start()
+        return self._thread
+    
+    @property
+    def updating(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
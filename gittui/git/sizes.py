@@ -0,0 +1,248 @@
+"""Repository size analysis from batch object enumeration, in bounded memory."""
+
+import heapq
+import subprocess
+import threading
+from array import array
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from gittui.git.output import decode
+from gittui.git.repository import Repository
+
+OBJECT_TYPES = ("commit", "tree", "blob", "tag")
+TYPE_INDEX = {name.encode(): index for index, name in enumerate(OBJECT_TYPES)}
+
+OBJECTS_FORMAT = "--batch-check=%(objecttype) %(objectsize) %(objectsize:disk) %(objectname)"
+PATHS_FORMAT = "--batch-check=%(objecttype) %(objectsize) %(objectsize:disk) %(objectname) %(rest)"
+
+TOP_N = 50
+GROWTH_POINTS = 12
+# size histograms bucket by bit length, which covers every 64-bit size
+HISTOGRAM_BUCKETS = 65
+CANCEL_CHECK = 4096
+
+
+@dataclass
+class BlobEntry:
+    oid: str
+    size: int
+    disk: int
+    raw_path: Optional[bytes] = None
+    
+    @property
+    def path(self) -> str:
+        return decode(self.raw_path) if self.raw_path is not None else "(unreachable)"
+
+
+@dataclass
+class DirectoryEntry:
+    raw_path: bytes
+    disk: int
+    size: int
+    blobs: int
+    
+    @property
+    def path(self) -> str:
+        return decode(self.raw_path) + "/" if self.raw_path else "(root)"
+
+
+@dataclass
+class SizeReport:
+    counts: array = field(default_factory=lambda: array("Q", bytes(8 * len(OBJECT_TYPES))))
+    sizes: array = field(default_factory=lambda: array("Q", bytes(8 * len(OBJECT_TYPES))))
+    disk: array = field(default_factory=lambda: array("Q", bytes(8 * len(OBJECT_TYPES))))
+    histogram: array = field(default_factory=lambda: array("Q", bytes(8 * HISTOGRAM_BUCKETS)))
+    blobs: List[BlobEntry] = field(default_factory=list)
+    directories: List[DirectoryEntry] = field(default_factory=list)
+    reachable_disk: int = 0
+    growth: List[Tuple[int, int]] = field(default_factory=list)
+    
+    @property
+    def total_objects(self) -> int:
+        return sum(self.counts)
+    
+    @property
+    def total_disk(self) -> int:
+        return sum(self.disk)
+
+
+class SizeAnalyzer:
+    def __init__(self, repo: Repository, top: int = TOP_N, growth_points: int = GROWTH_POINTS):
+        self.repo = repo
+        self.top = top
+        self.growth_points = growth_points
+        self.report = SizeReport()
+        self.phase = ""
+        self.processed = 0
+        self.expected = 0
+        self.error: Optional[str] = None
+        self.cancelled = threading.Event()
+        self._processes: List[subprocess.Popen] = []
+        self._thread: Optional[threading.Thread] = None
+    
+    def _spawn(self, *args: str, stdin=subprocess.DEVNULL) -> subprocess.Popen:
+        process = self.repo.git.spawn(*args, stdin=stdin, stdout=subprocess.PIPE)
+        self._processes.append(process)
+        return process
+    
+    def _reap(self):
+        for process in self._processes:
+            if process.poll() is None:
+                process.kill()
+            process.wait()
+        self._processes.clear()
+    
+    def _expected_objects(self) -> int:
+        result = self.repo.git.run("count-objects", "-v")
+        counts = {}
+        for line in result.text.splitlines() if result.success else []:
+            name, _, value = line.partition(": ")
+            counts[name] = int(value) if value.isdigit() else 0
+        return counts.get("count", 0) + counts.get("in-pack", 0)
+    
+    def _scan_objects(self):
+        # every object in the store, reachable or not, folded into fixed-size arrays
+        report = self.report
+        counts, sizes, disk, histogram = report.counts, report.sizes, report.disk, report.histogram
+        largest: List[Tuple[int, int, bytes]] = []
+        process = self._spawn("cat-file", "--batch-all-objects", OBJECTS_FORMAT)
+        with process.stdout:
+            for line in process.stdout:
+                kind, size, on_disk, oid = line.split()
+                index = TYPE_INDEX.get(kind)
+                if index is not None:
+                    size = int(size)
+                    on_disk = int(on_disk)
+                    counts[index] += 1
+                    sizes[index] += size
+                    disk[index] += on_disk
+                    if kind == b"blob":
+                        histogram[size.bit_length()] += 1
+                        if len(largest) < self.top:
+                            heapq.heappush(largest, (on_disk, size, oid))
+                        elif (on_disk, size) > largest[0][:2]:
+                            heapq.heapreplace(largest, (on_disk, size, oid))
+                self.processed += 1
+                if self.processed % CANCEL_CHECK == 0 and self.cancelled.is_set():
+                    return
+        process.wait()
+        report.blobs = [BlobEntry(oid.decode(), size, on_disk) for on_disk, size, oid in sorted(largest, reverse=True)]
+    
+    def _scan_paths(self):
+        # git joins each reachable object with the path it was first seen at
+        report = self.report
+        wanted = {blob.oid.encode(): blob for blob in report.blobs}
+        directories: Dict[bytes, List[int]] = {}
+        walk = self._spawn("rev-list", "--objects", "--all")
+        process = self._spawn("cat-file", PATHS_FORMAT, "--buffer", stdin=walk.stdout)
+        walk.stdout.close()
+        
+        self.processed = 0
+        self.expected = report.total_objects
+        with process.stdout:
+            for line in process.stdout:
+                self.processed += 1
+                if self.processed % CANCEL_CHECK == 0 and self.cancelled.is_set():
+                    return
+                fields = line.rstrip(b"\n").split(b" ", 4)
+                if len(fields) < 4 or fields[0] not in TYPE_INDEX:
+                    continue
+                on_disk = int(fields[2])
+                report.reachable_disk += on_disk
+                if fields[0] != b"blob" or len(fields) < 5:
+                    continue
+                
+                raw_path = fields[4]
+                blob = wanted.get(fields[3])
+                if blob is not None:
+                    blob.raw_path = raw_path
+                size = int(fields[1])
+                directory = raw_path.rpartition(b"/")[0]
+                while True:
+                    totals = directories.get(directory)
+                    if totals is None:
+                        directories[directory] = [on_disk, size, 1]
+                    else:
+                        totals[0] += on_disk
+                        totals[1] += size
+                        totals[2] += 1
+                    if not directory:
+                        break
+                    directory = directory.rpartition(b"/")[0]
+        process.wait()
+        walk.wait()
+        
+        largest = heapq.nlargest(self.top, directories.items(), key=lambda item: item[1][0])
+        report.directories = [DirectoryEntry(path, *totals) for path, totals in largest]
+    
+    def _history_span(self) -> Optional[Tuple[int, int]]:
+        newest = self.repo.git.run("log", "--all", "-1", "--format=%ct")
+        roots = self.repo.git.run("log", "--all", "--max-parents=0", "--format=%ct")
+        if not newest.success or not roots.success or not newest.text.strip():
+            return None
+        return min(int(value) for value in roots.text.split()), int(newest.text.strip())
+    
+    def _scan_growth(self):
+        span = self._history_span()
+        if span is None:
+            return
+        oldest, newest = span
+        points = max(1, self.growth_points)
+        self.processed = 0
+        self.expected = points + 1
+        for step in range(points + 1):
+            if self.cancelled.is_set():
+                return
+            timestamp = oldest + (newest - oldest) * step // points
+            process = self._spawn("rev-list", "--disk-usage", "--objects", "--all", f"--before=@{timestamp}")
+            with process.stdout:
+                output = process.stdout.read()
+            if process.wait() != 0 or not output.strip().isdigit():
+                # --disk-usage needs git 2.38
+                return
+            self.report.growth.append((timestamp, int(output)))
+            self.processed = step + 1
+    
+    def run(self):
+        try:
+            self.phase = "Counting objects"
+            self.expected = self._expected_objects()
+            self._scan_objects()
+            if self.cancelled.is_set():
+                return
+            self.phase = "Finding paths"
+            self._scan_paths()
+            if self.cancelled.is_set():
+                return
+            self.phase = "Measuring growth"
+            self._scan_growth()
+        except (OSError, ValueError) as e:
+            self.error = str(e)
+        finally:
+            self._reap()
+            self.phase = "Cancelled" if self.cancelled.is_set() else "Done"
+    
+    def start(self, on_done: Optional[Callable[["SizeAnalyzer"], None]] = None) -> threading.Thread:
+        def run():
+            self.run()
+            if on_done is not None:
+                on_done(self)
+        
+        self._thread = threading.Thread(target=run, name="gittui-sizes", daemon=True)
+        self._thread.start()
+        return self._thread
+    
+    def cancel(self):
+        self.cancelled.set()
+        for process in list(self._processes):
+            if process.poll() is None:
+                process.kill()
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    @property
+    def done(self) -> bool:
+        return self._thread is not None and not self._thread.is_alive()
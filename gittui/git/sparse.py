@@ -0,0 +1,152 @@
+"""Cone-mode sparse checkout with a lazily listed directory tree."""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set
+
+from gittui.git.commands import NO_TIMEOUT, GitResult
+from gittui.git.output import decode, iter_records
+from gittui.git.repository import Repository
+
+
+@dataclass
+class TreeNode:
+    raw_path: bytes
+    depth: int = 0
+    expanded: bool = False
+    
+    @property
+    def path(self) -> str:
+        return decode(self.raw_path)
+    
+    @property
+    def name(self) -> str:
+        return self.path.rsplit("/", 1)[-1]
+
+
+def parse_ls_tree_dirs(data: bytes) -> List[bytes]:
+    dirs = []
+    for record in iter_records(data):
+        meta, _, path = bytes(record).partition(b"\t")
+        if meta.split(b" ")[1:2] == [b"tree"]:
+            dirs.append(path)
+    return dirs
+
+
+class SparseCheckout:
+    def __init__(self, repo: Repository, rev: str = "HEAD"):
+        self.repo = repo
+        self.rev = rev
+        self._children: Dict[bytes, List[bytes]] = {}
+    
+    def enabled(self) -> bool:
+        result = self.repo.git.run("config", "--bool", "core.sparseCheckout")
+        return result.success and result.text.strip() == "true"
+    
+    def cone(self) -> bool:
+        # git reads the patterns as cone patterns only when this is set
+        result = self.repo.git.run("config", "--bool", "core.sparseCheckoutCone")
+        return result.success and result.text.strip() == "true"
+    
+    def non_cone(self) -> bool:
+        return self.enabled() and not self.cone()
+    
+    def patterns(self) -> List[bytes]:
+        if not self.enabled():
+            return []
+        result = self.repo.root_git().run("sparse-checkout", "list")
+        return [line for line in result.stdout.split(b"\n") if line] if result.success else []
+    
+    def directories(self) -> Optional[Set[bytes]]:
+        # None when the patterns are not cone patterns and cannot become a selection
+        if self.non_cone():
+            return None
+        return cone_directories(self.patterns())
+    
+    def children(self, raw_path: bytes = b"") -> List[bytes]:
+        if raw_path not in self._children:
+            spec = [decode(raw_path) + "/"] if raw_path else []
+            result = self.repo.root_git().run("ls-tree", "-z", "-d", "--full-tree", self.rev, "--", *spec)
+            self._children[raw_path] = parse_ls_tree_dirs(result.stdout) if result.success else []
+        return self._children[raw_path]
+    
+    def set(self, raw_paths: Iterable[bytes]) -> GitResult:
+        if self.non_cone():
+            return GitResult(1, b"", b"Sparse checkout uses non-cone patterns; not replacing them with cone mode.")
+        paths = sorted(set(raw_paths))
+        if not paths:
+            # an empty cone keeps only the files at the top level
+            return self.repo.root_git().run("sparse-checkout", "set", "--cone", timeout=NO_TIMEOUT)
+        data = b"".join(path + b"\n" for path in paths)
+        return self.repo.root_git().run("sparse-checkout", "set", "--cone", "--stdin", input=data, timeout=NO_TIMEOUT)
+    
+    def disable(self) -> GitResult:
+        return self.repo.root_git().run("sparse-checkout", "disable", timeout=NO_TIMEOUT)
+
+
+class SparseTree:
+    def __init__(self, sparse: SparseCheckout, selected: Optional[Set[bytes]] = None):
+        self.sparse = sparse
+        self.selected: Set[bytes] = set(selected or ())
+        self.applied: Set[bytes] = set(self.selected)
+        self.nodes: List[TreeNode] = [TreeNode(path) for path in sparse.children()]
+    
+    def toggle_expand(self, index: int):
+        node = self.nodes[index]
+        if node.expanded:
+            self.collapse(index)
+        else:
+            self.expand(index)
+    
+    def expand(self, index: int):
+        node = self.nodes[index]
+        if node.expanded:
+            return
+        node.expanded = True
+        children = [TreeNode(path, node.depth + 1) for path in self.sparse.children(node.raw_path)]
+        self.nodes[index + 1:index + 1] = children
+    
+    def collapse(self, index: int):
+        node = self.nodes[index]
+        node.expanded = False
+        end = index + 1
+        while end < len(self.nodes) and self.nodes[end].depth > node.depth:
+            end += 1
+        del self.nodes[index + 1:end]
+    
+    def toggle_select(self, index: int) -> bool:
+        raw_path = self.nodes[index].raw_path
+        if raw_path not in self.selected and self.state(index) == "x":
+            return False
+        if raw_path in self.selected:
+            self.selected.discard(raw_path)
+        else:
+            # a selected directory already includes everything below it
+            prefix = raw_path + b"/"
+            self.selected = {path for path in self.selected if not path.startswith(prefix)}
+            self.selected.add(raw_path)
+        return True
+    
+    def state(self, index: int) -> str:
+        raw_path = self.nodes[index].raw_path
+        if any(raw_path == path or raw_path.startswith(path + b"/") for path in self.selected):
+            return "x"
+        prefix = raw_path + b"/"
+        if any(path.startswith(prefix) for path in self.selected):
+            return "~"
+        return " "
+    
+    def removed(self) -> Set[bytes]:
+        # applied directories the new selection no longer covers
+        return {path for path in self.applied
+                if not any(path == selected or path.startswith(selected + b"/") for selected in self.selected)}
+    
+    def apply(self) -> GitResult:
+        result = self.sparse.set(self.selected)
+        if result.success:
+            self.applied = set(self.selected)
+        return result
+
+
+def cone_directories(patterns: Iterable[bytes]) -> Set[bytes]:
+    # `sparse-checkout list` prints directories in cone mode only
+    return {pattern.strip(b"/") for pattern in patterns if pattern.strip(b"/")}
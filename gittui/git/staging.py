@@ -0,0 +1,104 @@
+"""Batched staging and unstaging of working tree paths."""
+
+from dataclasses import replace
+from typing import Dict, Iterable, List, Optional
+
+from gittui.git.commands import GitResult
+from gittui.git.repository import FileStatus, Repository
+
+
+def _nul_join(paths: Iterable[bytes]) -> bytes:
+    return b"".join(path + b"\0" for path in paths)
+
+
+def staged_view(entry: FileStatus) -> FileStatus:
+    if entry.untracked:
+        return replace(entry, index="A", worktree=" ")
+    if entry.worktree == " ":
+        return entry
+    return replace(entry, index=entry.worktree, worktree=" ")
+
+
+def unstaged_view(entry: FileStatus) -> FileStatus:
+    if entry.index == "A":
+        return replace(entry, index="?", worktree="?")
+    if not entry.staged:
+        return entry
+    worktree = entry.worktree if entry.worktree != " " else entry.index
+    if worktree in "RC":
+        worktree = "M"
+    return replace(entry, index=" ", worktree=worktree, raw_orig_path=None)
+
+
+def first_error(results: List[GitResult]) -> Optional[str]:
+    for result in results:
+        if not result.success:
+            return result.error.strip() or "Staging failed"
+    return None
+
+
+class StagingEngine:
+    def __init__(self, repo: Repository):
+        self.repo = repo
+        self._stage: Dict[bytes, None] = {}
+        self._unstage: Dict[bytes, None] = {}
+    
+    @property
+    def pending(self) -> bool:
+        return bool(self._stage or self._unstage)
+    
+    def stage(self, entries: Iterable[FileStatus]):
+        for entry in entries:
+            self._unstage.pop(entry.raw_path, None)
+            self._stage[entry.raw_path] = None
+            if entry.raw_orig_path is not None:
+                self._stage[entry.raw_orig_path] = None
+    
+    def unstage(self, entries: Iterable[FileStatus]):
+        for entry in entries:
+            self._stage.pop(entry.raw_path, None)
+            self._unstage[entry.raw_path] = None
+            if entry.raw_orig_path is not None:
+                self._unstage[entry.raw_orig_path] = None
+    
+    def toggle(self, entry: FileStatus) -> FileStatus:
+        if entry.staged and entry.worktree == " ":
+            self.unstage([entry])
+            return unstaged_view(entry)
+        self.stage([entry])
+        return staged_view(entry)
+    
+    def apply(self, entries: List[FileStatus]) -> List[FileStatus]:
+        result = []
+        for entry in entries:
+            if entry.raw_path in self._stage:
+                entry = staged_view(entry)
+            elif entry.raw_path in self._unstage:
+                entry = unstaged_view(entry)
+            result.append(entry)
+        return result
+    
+    def flush(self) -> List[GitResult]:
+        stage, self._stage = list(self._stage), {}
+        unstage, self._unstage = list(self._unstage), {}
+        
+        git = self.repo.root_git()
+        results = []
+        
+        if stage:
+            results.append(git.run(
+                "update-index", "--add", "--remove", "-z", "--stdin",
+                input=_nul_join(stage),
+            ))
+        
+        if unstage:
+            if self.repo.head_oid() is None:
+                args = ("rm", "--cached", "--quiet")
+            else:
+                args = ("restore", "--staged")
+            results.append(git.run(
+                "--literal-pathspecs", *args, "--pathspec-from-file=-", "--pathspec-file-nul",
+                input=_nul_join(unstage),
+            ))
+        
+        return results
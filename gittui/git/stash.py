@@ -0,0 +1,93 @@
+"""Stash list read from the stash reflog, with diffs loaded per stash on demand."""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional
+
+from gittui.git.commands import NO_TIMEOUT, GitResult
+from gittui.git.output import Buffer, LazyLines, decode
+from gittui.git.repository import Repository
+
+STASH_FORMAT = "--format=%H%x1f%gd%x1f%ct%x1f%gs"
+
+STASH_DIFF_ARGS = ("--no-color", "--no-ext-diff", "--stat", "--patch")
+
+
+@dataclass
+class StashEntry:
+    oid: str
+    selector: str
+    timestamp: int
+    raw_subject: bytes
+    
+    @property
+    def subject(self) -> str:
+        return decode(self.raw_subject)
+    
+    @property
+    def date(self) -> str:
+        return time.strftime("%Y-%m-%d %H:%M", time.localtime(self.timestamp))
+
+
+def parse_stash_record(record: Buffer) -> Optional[StashEntry]:
+    fields = bytes(record).split(b"\x1f", 3)
+    if len(fields) != 4:
+        return None
+    oid, selector, timestamp, subject = fields
+    return StashEntry(oid.decode(), decode(selector), int(timestamp or 0), subject)
+
+
+class StashList:
+    def __init__(self, repo: Repository, max_diffs: int = 32):
+        self.repo = repo
+        self.entries: List[StashEntry] = []
+        self.max_diffs = max(1, max_diffs)
+        self._diffs: "OrderedDict[str, LazyLines]" = OrderedDict()
+    
+    def load(self) -> List[StashEntry]:
+        result = self.repo.git.run("log", "-g", "-z", STASH_FORMAT, "refs/stash", "--")
+        entries = map(parse_stash_record, result.records()) if result.success else ()
+        self.entries = [entry for entry in entries if entry is not None]
+        return self.entries
+    
+    def diff(self, entry: StashEntry) -> LazyLines:
+        # stash commits never change, so a diff stays valid while indices shift
+        lines = self._diffs.get(entry.oid)
+        if lines is not None:
+            self._diffs.move_to_end(entry.oid)
+            return lines
+        
+        result = self.repo.root_git().run("stash", "show", *STASH_DIFF_ARGS, entry.oid)
+        lines = LazyLines(result.stdout if result.success else result.stderr)
+        self._diffs[entry.oid] = lines
+        while len(self._diffs) > self.max_diffs:
+            self._diffs.popitem(last=False)
+        return lines
+    
+    def _verify(self, entry: StashEntry) -> Optional[GitResult]:
+        # a selector only names the same stash until another stash is pushed or dropped
+        result = self.repo.git.run("rev-parse", "--verify", "--quiet", entry.selector)
+        if result.text.strip() != entry.oid:
+            return GitResult(1, b"", f"{entry.selector} changed; reload the stash list".encode())
+        return None
+    
+    def push(self, message: str = "", include_untracked: bool = False) -> GitResult:
+        args = ["stash", "push"]
+        if include_untracked:
+            args.append("--include-untracked")
+        if message:
+            args.extend(["--message", message])
+        return self.repo.root_git().run(*args, timeout=NO_TIMEOUT)
+    
+    def apply(self, entry: StashEntry) -> GitResult:
+        return self.repo.root_git().run("stash", "apply", entry.oid, timeout=NO_TIMEOUT)
+    
+    def pop(self, entry: StashEntry) -> GitResult:
+        return self._verify(entry) or self.repo.root_git().run("stash", "pop", entry.selector, timeout=NO_TIMEOUT)
+    
+    def drop(self, entry: StashEntry) -> GitResult:
+        return self._verify(entry) or self.repo.git.run("stash", "drop", entry.selector)
+    
+    def clear_cache(self):
+        self._diffs.clear()
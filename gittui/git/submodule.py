@@ -0,0 +1,255 @@
+"""Submodule state gathered in parallel, and `--jobs` update/fetch with per-submodule progress."""
+
+import os
+import re
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, List, Optional
+
+from gittui.git.commands import GitCommands, GitResult
+from gittui.git.output import decode, iter_records
+from gittui.git.repository import FileStatus, Repository
+
+GITLINK_MODE = b"160000"
+READ_SIZE = 4096
+
+PROGRESS_PATTERNS = (
+    (re.compile(r"^Submodule '[^']+' \(.*\) registered for path '(?P<path>.+)'$"), "registered"),
+    (re.compile(r"^Cloning into '(?P<path>.+)'\.\.\.$"), "cloning"),
+    (re.compile(r"^Submodule path '(?P<path>.+)': checked out '[0-9a-f]+'$"), "checked out"),
+    (re.compile(r"^Submodule path '(?P<path>.+)': (?:rebased|merged) into '[0-9a-f]+'$"), "updated"),
+    (re.compile(r"^Fetching submodule (?P<path>.+)$"), "fetching"),
+    (re.compile(r"^(?:fatal: )?(?:Failed to clone|Unable to checkout|Unable to fetch in submodule path|"
+                r"Fetched in submodule path) '(?P<path>[^']+)'"), "failed"),
+    (re.compile(r"^Errors during submodule fetch:$"), None),
+)
+
+
+@dataclass
+class Submodule:
+    name: str
+    raw_path: bytes
+    recorded: str
+    url: str = ""
+    head: Optional[str] = None
+    changed: int = 0
+    untracked: int = 0
+    initialized: bool = False
+    checked: bool = False
+    error: Optional[str] = None
+    progress: str = ""
+    
+    @property
+    def path(self) -> str:
+        return decode(self.raw_path)
+    
+    @property
+    def mismatched(self) -> bool:
+        return self.initialized and self.head is not None and self.head != self.recorded
+    
+    @property
+    def dirty(self) -> bool:
+        return self.changed > 0 or self.untracked > 0
+    
+    def describe(self) -> str:
+        parts = []
+        if self.mismatched:
+            parts.append(f"at {self.head[:7]}, recorded {self.recorded[:7]}")
+        if self.changed:
+            parts.append(f"{self.changed} changed")
+        if self.untracked:
+            parts.append(f"{self.untracked} untracked")
+        return ", ".join(parts)
+
+
+def parse_gitlinks(data: bytes) -> Dict[bytes, str]:
+    links = {}
+    for record in iter_records(data):
+        meta, _, path = bytes(record).partition(b"\t")
+        mode, oid, stage = meta.split(b" ")
+        if mode == GITLINK_MODE and stage == b"0":
+            links[path] = oid.decode()
+    return links
+
+
+def parse_gitmodules(data: bytes) -> Dict[bytes, Dict[str, str]]:
+    sections: Dict[str, Dict[str, str]] = {}
+    for record in iter_records(data):
+        key, _, value = bytes(record).partition(b"\n")
+        name, _, field = decode(key)[len("submodule."):].rpartition(".")
+        sections.setdefault(name, {})[field] = decode(value)
+    return {os.fsencode(values["path"]): dict(values, name=name)
+            for name, values in sections.items() if "path" in values}
+
+
+def parse_submodule_status(data: bytes, submodule: Submodule):
+    records = iter_records(data)
+    submodule.changed = submodule.untracked = 0
+    for record in records:
+        kind = bytes(record[:2])
+        if kind == b"# " and bytes(record).startswith(b"# branch.oid "):
+            oid = bytes(record[len(b"# branch.oid "):]).decode()
+            submodule.head = None if oid == "(initial)" else oid
+        elif kind in (b"1 ", b"u "):
+            submodule.changed += 1
+        elif kind == b"2 ":
+            submodule.changed += 1
+            # renames carry the original path as a separate record
+            next(records, None)
+        elif kind == b"? ":
+            submodule.untracked += 1
+
+
+class SubmoduleSet:
+    def __init__(self, repo: Repository, jobs: int = 8):
+        self.repo = repo
+        self.jobs = max(1, jobs)
+        self.submodules: List[Submodule] = []
+        self._by_path: Dict[str, Submodule] = {}
+        self._process: Optional[subprocess.Popen] = None
+    
+    def load(self) -> List[Submodule]:
+        git = self.repo.root_git()
+        result = git.run("ls-files", "-z", "--stage")
+        links = parse_gitlinks(result.stdout) if result.success else {}
+        config = git.run("config", "-z", "--file", ".gitmodules", "--get-regexp", r"^submodule\.")
+        modules = parse_gitmodules(config.stdout) if config.success else {}
+        
+        self.submodules = []
+        for raw_path in sorted(links):
+            info = modules.get(raw_path, {})
+            self.submodules.append(Submodule(info.get("name", decode(raw_path)), raw_path, links[raw_path],
+                                             info.get("url", "")))
+        self._by_path = {submodule.path: submodule for submodule in self.submodules}
+        return self.submodules
+    
+    def _status_one(self, submodule: Submodule):
+        root = self.repo.root() or "."
+        directory = os.path.join(root, os.fsdecode(submodule.raw_path))
+        submodule.initialized = os.path.exists(os.path.join(directory, ".git"))
+        if submodule.initialized:
+            git = GitCommands(directory, self.repo.git.git_path, self.repo.git.timeout)
+            result = git.run("status", "--porcelain=v2", "--branch", "-z")
+            if result.success:
+                parse_submodule_status(result.stdout, submodule)
+                submodule.error = None
+            else:
+                submodule.error = result.error.strip().split("\n")[0]
+        submodule.checked = True
+    
+    def status(self, on_update: Optional[Callable[[Submodule], None]] = None,
+               cancel: Optional[threading.Event] = None):
+        def check(submodule: Submodule):
+            if cancel is not None and cancel.is_set():
+                return
+            self._status_one(submodule)
+            if on_update is not None:
+                on_update(submodule)
+        
+        # git status inside each submodule is independent, so a bounded pool runs them side by side
+        with ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix="gittui-submodule") as pool:
+            list(pool.map(check, self.submodules))
+    
+    def status_async(self, on_update: Optional[Callable[[Submodule], None]] = None,
+                     cancel: Optional[threading.Event] = None) -> threading.Thread:
+        thread = threading.Thread(target=self.status, args=(on_update, cancel), name="gittui-submodules", daemon=True)
+        thread.start()
+        return thread
+    
+    def annotate(self, entries: List[FileStatus]) -> List[FileStatus]:
+        root = self.repo.root() or "."
+        # only a modified path with its own .git can be a submodule, so clean trees cost one stat per change
+        paths = [entry.raw_path for entry in entries if entry.worktree == "M"
+                 and os.path.exists(os.path.join(root, os.fsdecode(entry.raw_path), ".git"))]
+        if not paths:
+            return entries
+        result = self.repo.root_git().run(
+            "--literal-pathspecs", "ls-files", "-z", "--stage", "--", *(os.fsdecode(path) for path in paths)
+        )
+        links = parse_gitlinks(result.stdout) if result.success else {}
+        found = {raw_path: Submodule(decode(raw_path), raw_path, oid) for raw_path, oid in links.items()}
+        with ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix="gittui-submodule") as pool:
+            list(pool.map(self._status_one, found.values()))
+        
+        annotated = []
+        for entry in entries:
+            submodule = found.get(entry.raw_path)
+            if submodule is not None and submodule.error is None:
+                entry = replace(entry, submodule=submodule.describe() or None)
+            annotated.append(entry)
+        return annotated
+    
+    def _find(self, path: str) -> Optional[Submodule]:
+        root = self.repo.root() or "."
+        if os.path.isabs(path):
+            path = os.path.relpath(path, root)
+        path = path.rstrip("/")
+        submodule = self._by_path.get(path)
+        if submodule is None:
+            # nested submodules are reported relative to their parent
+            for candidate in self.submodules:
+                if path.endswith("/" + candidate.path) or candidate.path.endswith("/" + path):
+                    return candidate
+        return submodule
+    
+    def apply_line(self, line: str) -> Optional[Submodule]:
+        for pattern, state in PROGRESS_PATTERNS:
+            match = pattern.match(line)
+            if match is None or state is None:
+                continue
+            submodule = self._find(match.group("path"))
+            if submodule is not None:
+                submodule.progress = state
+                if state == "failed":
+                    submodule.error = line
+            return submodule
+        return None
+    
+    def _run(self, args: List[str], state: str,
+             on_line: Optional[Callable[[str], None]] = None) -> GitResult:
+        for submodule in self.submodules:
+            submodule.progress = state
+            submodule.error = None
+        self._process = process = self.repo.root_git().spawn(*args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        messages: List[str] = []
+        pending = b""
+        with process.stdout:
+            while True:
+                chunk = process.stdout.read1(READ_SIZE)
+                if not chunk:
+                    break
+                parts = re.split(rb"[\r\n]", pending + chunk)
+                pending = parts.pop()
+                for raw in parts:
+                    line = decode(raw).strip()
+                    if not line:
+                        continue
+                    if self.apply_line(line) is None:
+                        messages.append(line)
+                    if on_line is not None:
+                        on_line(line)
+        returncode = process.wait()
+        self._process = None
+        
+        for submodule in self.submodules:
+            if submodule.progress != "failed":
+                submodule.progress = ""
+        output = "\n".join(messages).encode()
+        return GitResult(returncode, output if returncode == 0 else b"", b"" if returncode == 0 else output)
+    
+    def stop(self):
+        process = self._process
+        if process is not None and process.poll() is None:
+            # SIGTERM lets git clean up a half-cloned submodule on its way out
+            process.terminate()
+            process.wait()
+    
+    def update(self, on_line: Optional[Callable[[str], None]] = None) -> GitResult:
+        args = ["submodule", "update", "--init", "--recursive", f"--jobs={self.jobs}"]
+        return self._run(args, "queued", on_line)
+    
+    def fetch(self, on_line: Optional[Callable[[str], None]] = None) -> GitResult:
+        args = ["fetch", "--recurse-submodules=yes", f"--jobs={self.jobs}"]
+        return self._run(args, "queued", on_line)
@@ -0,0 +1,89 @@
+"""Linked worktrees read from `git worktree list --porcelain -z`."""
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+from gittui.git.commands import NO_TIMEOUT, GitResult
+from gittui.git.output import decode, iter_records
+from gittui.git.repository import Repository
+
+
+@dataclass
+class Worktree:
+    raw_path: bytes
+    head: Optional[str] = None
+    branch: Optional[str] = None
+    bare: bool = False
+    detached: bool = False
+    locked: Optional[str] = None
+    prunable: Optional[str] = None
+    
+    @property
+    def path(self) -> str:
+        return decode(self.raw_path)
+    
+    @property
+    def label(self) -> str:
+        if self.bare:
+            return "(bare)"
+        if self.branch:
+            return self.branch[len("refs/heads/"):] if self.branch.startswith("refs/heads/") else self.branch
+        return f"(detached at {self.head[:8]})" if self.head else "(detached)"
+
+
+def parse_worktrees_z(data: bytes) -> List[Worktree]:
+    worktrees: List[Worktree] = []
+    current: Optional[Worktree] = None
+    
+    for record in iter_records(data):
+        # an empty record ends each worktree
+        if not record:
+            current = None
+            continue
+        key, _, value = bytes(record).partition(b" ")
+        if key == b"worktree":
+            current = Worktree(value)
+            worktrees.append(current)
+        elif current is None:
+            continue
+        elif key == b"HEAD":
+            current.head = value.decode()
+        elif key == b"branch":
+            current.branch = decode(value)
+        elif key == b"bare":
+            current.bare = True
+        elif key == b"detached":
+            current.detached = True
+        elif key == b"locked":
+            current.locked = decode(value)
+        elif key == b"prunable":
+            current.prunable = decode(value)
+    
+    return worktrees
+
+
+class WorktreeManager:
+    def __init__(self, repo: Repository):
+        self.repo = repo
+    
+    def list(self) -> List[Worktree]:
+        result = self.repo.git.run("worktree", "list", "--porcelain", "-z")
+        return parse_worktrees_z(result.stdout) if result.success else []
+    
+    def add(self, path: str, commitish: Optional[str] = None, new_branch: Optional[str] = None) -> GitResult:
+        args = ["worktree", "add"]
+        if new_branch:
+            args.extend(["-b", new_branch])
+        args.extend(["--", path])
+        if commitish:
+            args.append(commitish)
+        return self.repo.git.run(*args, timeout=NO_TIMEOUT)
+    
+    def remove(self, worktree: Worktree, force: bool = False) -> GitResult:
+        args = ["worktree", "remove"]
+        if force:
+            args.append("--force")
+        return self.repo.git.run(*args, "--", worktree.path, timeout=NO_TIMEOUT)
+    
+    def prune(self) -> GitResult:
+        return self.repo.git.run("worktree", "prune", "--verbose")
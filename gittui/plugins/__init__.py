@@ -1,5 +1,16 @@
 """Plugin system for custom commands and extensions."""
 
-from gittui.plugins.manager import PluginManager
+from importlib import import_module
 
-__all__ = ["PluginManager"]
+__all__ = ["PluginManager", "CommandExecutor"]
+
+_EXPORTS = {
+    "PluginManager": "gittui.plugins.manager",
+    "CommandExecutor": "gittui.plugins.executor",
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
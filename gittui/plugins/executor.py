@@ -0,0 +1,137 @@
+"""Execution of user-defined commands from CommandsConfig."""
+
+import re
+import shlex
+import subprocess
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+from gittui.config.schema import CommandsConfig, CustomCommand
+from gittui.core.events import Event, EventBus, EventType
+from gittui.git.output import decode
+
+PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+
+class CommandError(Exception):
+    pass
+
+
+@dataclass
+class CommandContext:
+    branch: Optional[str] = None
+    file: Optional[str] = None
+    commit: Optional[str] = None
+    extra: Dict[str, str] = field(default_factory=dict)
+    
+    def values(self) -> Dict[str, str]:
+        values = {}
+        for name in ("branch", "file", "commit"):
+            value = getattr(self, name)
+            if value is not None:
+                values[name] = value
+        values.update(self.extra)
+        return values
+
+
+def tokenize(command: str) -> List[str]:
+    try:
+        return shlex.split(command)
+    except ValueError as e:
+        raise CommandError(f"Cannot parse command {command!r}: {e}")
+
+
+def placeholders(argv: List[str]) -> Set[str]:
+    return {name for token in argv for name in PLACEHOLDER.findall(token)}
+
+
+def render(argv: List[str], context: CommandContext) -> List[str]:
+    values = context.values()
+    
+    def substitute(match):
+        name = match.group(1)
+        if name not in values:
+            raise CommandError(f"No value for placeholder {{{name}}}")
+        return values[name]
+    
+    return [PLACEHOLDER.sub(substitute, token) for token in argv]
+
+
+def load_commands(config: CommandsConfig) -> List[CustomCommand]:
+    return [CustomCommand(**entry) for entry in config.custom]
+
+
+class CommandExecutor:
+    def __init__(self, bus: EventBus, cwd: str = ".", max_workers: int = 4):
+        self.bus = bus
+        self.cwd = cwd
+        self.max_workers = max(1, max_workers)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="gittui-cmd")
+        self._lock = threading.Lock()
+        self._futures: List[Future] = []
+        self._processes: Set[subprocess.Popen] = set()
+        self._cancelled = False
+    
+    def run(self, command: CustomCommand, context: Optional[CommandContext] = None) -> int:
+        argv = render(tokenize(command.command), context or CommandContext())
+        label = " ".join(shlex.quote(arg) for arg in argv)
+        self._emit(command, line=f"$ {label}", stream="command")
+        
+        try:
+            proc = subprocess.Popen(
+                argv,
+                cwd=self.cwd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+            )
+        except OSError as e:
+            self._emit(command, line=str(e), stream="error")
+            self._emit(command, returncode=-1)
+            return -1
+        
+        with self._lock:
+            # cancel() may have run between render and Popen
+            if self._cancelled:
+                proc.terminate()
+            self._processes.add(proc)
+        try:
+            with proc.stdout:
+                for raw in proc.stdout:
+                    self._emit(command, line=decode(raw.rstrip(b"\r\n")), stream="stdout")
+            returncode = proc.wait()
+        finally:
+            with self._lock:
+                self._processes.discard(proc)
+        self._emit(command, returncode=returncode)
+        return returncode
+    
+    def submit(self, command: CustomCommand, context: Optional[CommandContext] = None) -> Future:
+        future = self._pool.submit(self.run, command, context)
+        with self._lock:
+            self._futures.append(future)
+        return future
+    
+    def run_many(self, command: CustomCommand, contexts: List[CommandContext]) -> List[Future]:
+        return [self.submit(command, context) for context in contexts]
+    
+    def cancel(self):
+        # queued commands never start, running ones get SIGTERM
+        with self._lock:
+            self._cancelled = True
+            futures = list(self._futures)
+            processes = list(self._processes)
+        for future in futures:
+            future.cancel()
+        for proc in processes:
+            if proc.poll() is None:
+                proc.terminate()
+    
+    def shutdown(self, wait: bool = False):
+        self._pool.shutdown(wait=wait)
+    
+    def _emit(self, command: CustomCommand, **data):
+        data["command"] = command.name
+        self.bus.emit(Event(type=EventType.COMMAND_OUTPUT, data=data, source="executor"))
@@ -0,0 +1,285 @@
+"""Plugin discovery, lazy loading and out-of-process execution."""
+
+import importlib
+import importlib.util
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import traceback
+from dataclasses import dataclass, fields
+from importlib.metadata import entry_points
+from typing import Any, Callable, Dict, List, Optional
+
+import yaml
+
+from gittui.config.loader import default_config_dir
+from gittui.core.events import Event, EventBus, EventType
+
+ENTRY_POINT_GROUP = "gittui.plugins"
+MANIFEST_NAMES = ("plugin.yaml", "plugin.yml", "plugin.json")
+
+
+class PluginError(Exception):
+    pass
+
+
+@dataclass
+class PluginManifest:
+    name: str
+    entry: str
+    version: str = "0.0.0"
+    description: str = ""
+    key: Optional[str] = None
+    isolated: bool = False
+    path: Optional[str] = None
+    
+    @classmethod
+    def from_file(cls, manifest_path: str) -> "PluginManifest":
+        with open(manifest_path, "r") as f:
+            if manifest_path.endswith(".json"):
+                data = json.load(f)
+            else:
+                data = yaml.safe_load(f)
+        
+        if not isinstance(data, dict) or "name" not in data or "entry" not in data:
+            raise PluginError(f"{manifest_path}: manifest needs 'name' and 'entry'")
+        
+        known = {f.name for f in fields(cls)}
+        data = {k: v for k, v in data.items() if k in known}
+        data["path"] = os.path.dirname(os.path.abspath(manifest_path))
+        return cls(**data)
+
+
+def load_target(manifest: PluginManifest) -> Callable:
+    module_name, _, attr = manifest.entry.partition(":")
+    if not module_name or not attr:
+        raise PluginError(f"{manifest.name}: entry must look like 'module:callable'")
+    
+    if manifest.path is None:
+        module = importlib.import_module(module_name)
+    else:
+        file_path = os.path.join(manifest.path, *module_name.split(".")) + ".py"
+        if not os.path.isfile(file_path):
+            file_path = os.path.join(manifest.path, *module_name.split("."), "__init__.py")
+        qualified = f"gittui_plugin_{manifest.name}.{module_name}"
+        spec = importlib.util.spec_from_file_location(qualified, file_path)
+        if spec is None or spec.loader is None:
+            raise PluginError(f"{manifest.name}: cannot load {file_path}")
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[qualified] = module
+        spec.loader.exec_module(module)
+    
+    try:
+        return getattr(module, attr)
+    except AttributeError:
+        raise PluginError(f"{manifest.name}: {module_name} has no attribute {attr!r}")
+
+
+def _worker_main(conn, manifest: PluginManifest):
+    target = None
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if message[0] == "stop":
+            break
+        
+        _, request_id, context = message
+        try:
+            if target is None:
+                target = load_target(manifest)
+            conn.send(("result", request_id, target(context)))
+        except Exception:
+            conn.send(("error", request_id, traceback.format_exc()))
+    conn.close()
+
+
+class Plugin:
+    def __init__(self, manifest: PluginManifest):
+        self.manifest = manifest
+        self._target: Optional[Callable] = None
+    
+    @property
+    def name(self) -> str:
+        return self.manifest.name
+    
+    @property
+    def loaded(self) -> bool:
+        return self._target is not None
+    
+    def load(self) -> Callable:
+        if self._target is None:
+            self._target = load_target(self.manifest)
+        return self._target
+    
+    def __call__(self, context: Dict[str, Any]) -> Any:
+        return self.load()(context)
+
+
+class PluginWorker:
+    def __init__(self, manifest: PluginManifest):
+        self.manifest = manifest
+        self.pending: Dict[int, Dict[str, Any]] = {}
+        ctx = multiprocessing.get_context("spawn")
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, manifest),
+            name=f"gittui-plugin-{manifest.name}",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+    
+    def send(self, request_id: int, context: Dict[str, Any]):
+        self.pending[request_id] = context
+        self.conn.send(("call", request_id, context))
+    
+    def fileno(self) -> int:
+        return self.conn.fileno()
+    
+    def alive(self) -> bool:
+        return self.process.is_alive()
+    
+    def stop(self, timeout: float = 1.0):
+        try:
+            self.conn.send(("stop",))
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.conn.close()
+
+
+class PluginManager:
+    def __init__(self, bus: EventBus, plugin_dirs: Optional[List[str]] = None,
+                 use_entry_points: bool = True):
+        self.bus = bus
+        self.plugin_dirs = plugin_dirs if plugin_dirs is not None else [
+            os.path.join(default_config_dir(), "plugins")
+        ]
+        self.use_entry_points = use_entry_points
+        self.plugins: Dict[str, Plugin] = {}
+        self.errors: List[str] = []
+        self._workers: Dict[str, PluginWorker] = {}
+        self._request_ids = itertools.count(1)
+    
+    def discover(self) -> List[PluginManifest]:
+        self.plugins.clear()
+        self.errors.clear()
+        
+        if self.use_entry_points:
+            for ep in self._entry_points():
+                self._register(PluginManifest(name=ep.name, entry=ep.value))
+        
+        for plugin_dir in self.plugin_dirs:
+            if not os.path.isdir(plugin_dir):
+                continue
+            for entry in sorted(os.scandir(plugin_dir), key=lambda e: e.name):
+                if not entry.is_dir():
+                    continue
+                for manifest_name in MANIFEST_NAMES:
+                    manifest_path = os.path.join(entry.path, manifest_name)
+                    if os.path.isfile(manifest_path):
+                        try:
+                            self._register(PluginManifest.from_file(manifest_path))
+                        except (PluginError, OSError, ValueError, yaml.YAMLError) as e:
+                            self.errors.append(str(e))
+                        break
+        
+        return [plugin.manifest for plugin in self.plugins.values()]
+    
+    def _entry_points(self):
+        eps = entry_points()
+        if hasattr(eps, "select"):
+            return eps.select(group=ENTRY_POINT_GROUP)
+        return eps.get(ENTRY_POINT_GROUP, [])
+    
+    def _register(self, manifest: PluginManifest):
+        if manifest.name in self.plugins:
+            self.errors.append(f"Duplicate plugin name: {manifest.name}")
+            return
+        self.plugins[manifest.name] = Plugin(manifest)
+    
+    def get(self, name: str) -> Plugin:
+        try:
+            return self.plugins[name]
+        except KeyError:
+            raise PluginError(f"Unknown plugin: {name}")
+    
+    def invoke(self, name: str, context: Optional[Dict[str, Any]] = None) -> Optional[int]:
+        plugin = self.get(name)
+        context = context or {}
+        
+        if not plugin.manifest.isolated:
+            try:
+                result = plugin(context)
+            except Exception:
+                self._emit_error(name, traceback.format_exc())
+                return None
+            self._emit_result(name, result)
+            return None
+        
+        worker = self._workers.get(name)
+        if worker is None or not worker.alive():
+            worker = PluginWorker(plugin.manifest)
+            self._workers[name] = worker
+        
+        request_id = next(self._request_ids)
+        worker.send(request_id, context)
+        return request_id
+    
+    def busy(self) -> bool:
+        return any(worker.pending for worker in self._workers.values())
+    
+    def filenos(self) -> List[int]:
+        return [worker.fileno() for worker in self._workers.values()]
+    
+    def poll(self) -> int:
+        delivered = 0
+        for name, worker in list(self._workers.items()):
+            while worker.conn.poll(0):
+                try:
+                    kind, request_id, payload = worker.conn.recv()
+                except (EOFError, OSError):
+                    self._fail_pending(name, worker)
+                    break
+                worker.pending.pop(request_id, None)
+                if kind == "result":
+                    self._emit_result(name, payload, request_id)
+                else:
+                    self._emit_error(name, payload, request_id)
+                delivered += 1
+            
+            if worker.pending and not worker.alive():
+                self._fail_pending(name, worker)
+        return delivered
+    
+    def _fail_pending(self, name: str, worker: PluginWorker):
+        for request_id in list(worker.pending):
+            self._emit_error(name, f"Plugin worker exited with code {worker.process.exitcode}", request_id)
+        worker.pending.clear()
+        del self._workers[name]
+    
+    def _emit_result(self, name: str, result: Any, request_id: Optional[int] = None):
+        self.bus.emit(Event(
+            type=EventType.PLUGIN_RESULT,
+            data={"plugin": name, "result": result, "request_id": request_id},
+            source="plugins",
+        ))
+    
+    def _emit_error(self, name: str, message: str, request_id: Optional[int] = None):
+        self.bus.emit(Event(
+            type=EventType.ERROR,
+            data={"plugin": name, "message": message, "request_id": request_id},
+            source="plugins",
+        ))
+    
+    def shutdown(self):
+        for worker in self._workers.values():
+            worker.stop()
+        self._workers.clear()
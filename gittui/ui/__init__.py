@@ -1,6 +1,16 @@
 """UI components and panels."""
 
-from gittui.ui.theme import Theme
-from gittui.ui.layout import LayoutManager
+from importlib import import_module
 
 __all__ = ["Theme", "LayoutManager"]
+
+_EXPORTS = {
+    "Theme": "gittui.ui.theme",
+    "LayoutManager": "gittui.ui.layout",
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,88 @@
+"""Full-screen blame viewer that fills in annotations as they stream."""
+
+import curses
+from typing import Dict, Optional
+
+from gittui.git.blame import Blame, BlameCache
+from gittui.ui.widgets import VirtualList, printable
+
+FOOTER = "j/k: Move | enter: Show commit | q: Back"
+
+POLL_MS = 50
+
+
+class BlameView:
+    def __init__(self, stdscr, cache: BlameCache, theme, raw_path: bytes,
+                 rev: str = "HEAD", keys: Optional[Dict[int, str]] = None):
+        self.stdscr = stdscr
+        self.cache = cache
+        self.theme = theme
+        self.raw_path = raw_path
+        self.rev = rev
+        self.blame: Optional[Blame] = None
+        self.list = VirtualList(keys=keys)
+        self.message = ""
+    
+    def _render(self, index: int, selected: bool):
+        commit = self.blame.annotations[index]
+        width = len(str(len(self.blame.lines)))
+        if commit is None:
+            gutter = " " * 33
+            style = "info"
+        else:
+            marker = "^" if commit.boundary else " "
+            gutter = f"{marker}{commit.short_sha} {commit.author[:12]:<12} {commit.date:<10}"
+            style = "commit_hash"
+        text = f"{gutter} {index + 1:>{width}} {self.blame.lines[index]}"
+        return text, self.theme.get("selected" if selected else style)
+    
+    def draw(self):
+        self.stdscr.erase()
+        max_y, max_x = self.stdscr.getmaxyx()
+        
+        blame = self.blame
+        total = len(blame.lines)
+        progress = "" if blame.done else f" ({min(blame.annotated, total)}/{total})"
+        self.stdscr.addnstr(0, 0, printable(f" Blame: {blame.path} @ {blame.rev[:8]}{progress} ").ljust(max_x), max_x, self.theme.get("header"))
+        
+        self.list.resize(max_y - 4)
+        self.list.set_count(total)
+        self.list.draw(self.stdscr, 2, 0, max_x - 1, self._render)
+        
+        message = self.message or blame.error or ""
+        try:
+            self.stdscr.addnstr(max_y - 2, 0, message, max_x - 1, self.theme.get("error" if blame.error else "info"))
+            self.stdscr.addnstr(max_y - 1, 0, FOOTER, max_x - 1, self.theme.get("footer"))
+        except curses.error:
+            pass
+        self.stdscr.refresh()
+    
+    def _describe(self):
+        if not self.blame.lines:
+            return
+        commit = self.blame.annotations[self.list.selected]
+        if commit is None:
+            self.message = "Not annotated yet"
+        else:
+            self.message = f"{commit.short_sha} {commit.author} {commit.date}: {commit.summary}"
+    
+    def show(self):
+        curses.curs_set(0)
+        self.blame = self.cache.get(self.raw_path, self.rev)
+        
+        try:
+            while True:
+                self.draw()
+                self.stdscr.timeout(-1 if self.blame.done else POLL_MS)
+                key = self.stdscr.getch()
+                
+                if key == -1:
+                    continue
+                elif key in (ord('q'), 27):
+                    break
+                elif self.list.handle_key(key):
+                    self.message = ""
+                elif key in (10, curses.KEY_ENTER):
+                    self._describe()
+        finally:
+            self.stdscr.timeout(-1)
@@ -0,0 +1,180 @@
+"""Merge conflict panel with per-hunk and batch resolution."""
+
+import curses
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+
+from gittui.git.conflicts import BOTH, OURS, THEIRS, ConflictHunk, ConflictSet
+from gittui.git.output import decode
+from gittui.ui.widgets import VirtualList, printable
+
+FOOTER = ("enter: Expand | space: Mark | o/t: Ours/Theirs | b: Both | u: Unpick | "
+          "c: Continue | a: Abort | s: Skip | q: Back")
+
+CHOICE_LABELS = {None: "unresolved", OURS: "ours", THEIRS: "theirs", BOTH: "both"}
+
+
+@dataclass
+class Row:
+    raw_path: bytes
+    hunk: Optional[ConflictHunk] = None
+    text: str = ""
+    side: str = ""
+
+
+class ConflictView:
+    def __init__(self, stdscr, conflicts: ConflictSet, theme, keys: Optional[Dict[int, str]] = None):
+        self.stdscr = stdscr
+        self.conflicts = conflicts
+        self.theme = theme
+        self.list = VirtualList(keys=keys)
+        self.rows: List[Row] = []
+        self.expanded: Set[bytes] = set()
+        self.marked: Set[bytes] = set()
+        self.message = ""
+        self.operation: Optional[str] = None
+        self.dirty = True
+    
+    def _build(self):
+        rows = []
+        for entry in self.conflicts.paths():
+            rows.append(Row(entry.raw_path))
+            if entry.raw_path not in self.expanded:
+                continue
+            conflict = self.conflicts.file(entry.raw_path)
+            for hunk in conflict.hunks:
+                rows.append(Row(entry.raw_path, hunk))
+                for side, lines in ((OURS, hunk.ours), (THEIRS, hunk.theirs)):
+                    for line in lines:
+                        rows.append(Row(entry.raw_path, hunk, decode(line).rstrip("\r\n"), side))
+        self.rows = rows
+        self.expanded &= set(self.conflicts.entries)
+        self.marked &= set(self.conflicts.entries)
+        self.list.set_count(len(rows))
+        self.dirty = False
+    
+    def _render(self, index: int, selected: bool):
+        row = self.rows[index]
+        if row.hunk is None:
+            entry = self.conflicts.entries[row.raw_path]
+            mark = "*" if row.raw_path in self.marked else " "
+            arrow = "▾" if row.raw_path in self.expanded else "▸"
+            text = f"{mark} {arrow} {entry.path}  ({entry.kind})"
+            attr = "unstaged"
+        elif not row.side:
+            text = f"    @ line {row.hunk.line}: {CHOICE_LABELS[row.hunk.choice]}"
+            attr = "info" if row.hunk.choice is None else "staged"
+        else:
+            prefix = "<" if row.side == OURS else ">"
+            text = f"      {prefix} {row.text}"
+            dropped = row.hunk.choice not in (None, BOTH, row.side)
+            attr = "normal" if dropped else "diff_del" if row.side == OURS else "diff_add"
+        if selected:
+            return text, self.theme.get("selected")
+        return text, self.theme.get(attr)
+    
+    def draw(self):
+        self.stdscr.erase()
+        max_y, max_x = self.stdscr.getmaxyx()
+        
+        operation = self.operation or "no operation"
+        title = f" Conflicts ({operation} in progress, {len(self.conflicts.entries)} unmerged) "
+        self.stdscr.addnstr(0, 0, printable(title).ljust(max_x), max_x, self.theme.get("header"))
+        
+        self.list.resize(max_y - 4)
+        self.list.draw(self.stdscr, 2, 0, max_x - 1, self._render)
+        if not self.rows:
+            self.stdscr.addnstr(2, 2, "No unmerged paths. Press c to continue.", max_x - 3, self.theme.get("success"))
+        
+        try:
+            self.stdscr.addnstr(max_y - 2, 0, printable(self.message), max_x - 1, self.theme.get("info"))
+            self.stdscr.addnstr(max_y - 1, 0, FOOTER, max_x - 1, self.theme.get("footer"))
+        except curses.error:
+            pass
+        self.stdscr.refresh()
+    
+    def _report(self, result, done: str):
+        self.message = done if result.success else result.error.strip().split("\n")[0]
+    
+    def _take(self, row: Row, side: str):
+        self.dirty = True
+        if row.hunk is not None:
+            result = self.conflicts.choose(row.raw_path, row.hunk, side)
+            resolved = row.raw_path not in self.conflicts.entries
+            self._report(result, f"Resolved {decode(row.raw_path)}" if resolved else f"Hunk takes {side}")
+            return
+        if side == BOTH:
+            self.message = "Expand the file to keep both sides of a hunk"
+            return
+        paths = sorted(self.marked) if self.marked else [row.raw_path]
+        result = self.conflicts.take(paths, side)
+        self._report(result, f"Took {side} for {len(paths)} file(s)")
+    
+    def _confirm(self, prompt: str) -> bool:
+        self.message = f"{prompt} (y/n)"
+        self.draw()
+        return self.stdscr.getch() in (ord('y'), ord('Y'))
+    
+    def _sequence(self, action) -> bool:
+        self.message = "Running..."
+        self.draw()
+        result = action()
+        self.expanded.clear()
+        self.marked.clear()
+        self.operation = self.conflicts.operation()
+        self.dirty = True
+        if result.success and not self.operation:
+            return True
+        self._report(result, "Stopped at the next conflict")
+        return False
+    
+    def show(self):
+        curses.curs_set(0)
+        self.conflicts.load()
+        self.operation = self.conflicts.operation()
+        
+        while True:
+            # rows only change when a file is expanded or a resolution is written
+            if self.dirty:
+                self._build()
+            self.draw()
+            key = self.stdscr.getch()
+            row = self.rows[self.list.selected] if self.rows else None
+            
+            if key in (ord('q'), 27):
+                break
+            elif self.list.handle_key(key):
+                self.message = ""
+            elif key == ord('c'):
+                if self._sequence(self.conflicts.continue_):
+                    break
+            elif key == ord('a'):
+                if self._confirm("Abort and discard the resolution so far?") and self._sequence(self.conflicts.abort):
+                    break
+            elif key == ord('s'):
+                if self._sequence(self.conflicts.skip):
+                    break
+            elif row is None:
+                continue
+            elif key in (10, curses.KEY_ENTER):
+                self.expanded ^= {row.raw_path}
+                self.dirty = True
+                if row.raw_path in self.expanded:
+                    conflict = self.conflicts.file(row.raw_path)
+                    if conflict.error or not conflict.hunks:
+                        self.message = conflict.error or "No conflict markers; take a side for the whole file"
+                else:
+                    self.list.select(next(i for i, r in enumerate(self.rows) if r.raw_path == row.raw_path))
+            elif key == ord(' '):
+                self.marked ^= {row.raw_path}
+                self.list.move(1)
+            elif key == ord('o'):
+                self._take(row, OURS)
+            elif key == ord('t'):
+                self._take(row, THEIRS)
+            elif key == ord('b'):
+                self._take(row, BOTH)
+            elif key == ord('u') and row.hunk is not None:
+                self.conflicts.choose(row.raw_path, row.hunk, None)
+                self.dirty = True
+                self.message = "Hunk restored to conflict markers"
@@ -0,0 +1,180 @@
+"""Full-screen diff viewer with hunk and line staging."""
+
+import curses
+from typing import Dict, List, Optional, Tuple
+
+from gittui.git.blame import BlameCache
+from gittui.git.diff import DiffCache, FileDiff, Hunk
+from gittui.git.output import decode
+from gittui.ui.blameview import BlameView
+from gittui.ui.widgets import VirtualList
+
+FOOTER = "space: Stage line | v: Mark range | enter: Stage hunk | tab: Staged/Unstaged | b: Blame | q: Back"
+
+LINE_STYLES = {
+    b"+": "diff_add",
+    b"-": "diff_del",
+}
+
+
+class DiffView:
+    def __init__(self, stdscr, cache: DiffCache, theme, path: Optional[bytes] = None,
+                 staged: bool = False, keys: Optional[Dict[int, str]] = None,
+                 blame_cache: Optional[BlameCache] = None):
+        self.stdscr = stdscr
+        self.cache = cache
+        self.theme = theme
+        self.path = path
+        self.staged = staged
+        self.files: List[FileDiff] = []
+        self.rows: List[Tuple[int, int, int]] = []
+        self.keys = keys
+        self._owns_blame_cache = blame_cache is None
+        self.blame_cache = blame_cache or BlameCache(cache.repo)
+        self.list = VirtualList(keys=keys)
+        self.mark: Optional[int] = None
+        self.message = ""
+    
+    def load(self):
+        if self.path is None:
+            self.files = self.cache.files(self.staged)
+        else:
+            diff = self.cache.get(self.path, self.staged)
+            self.files = [diff] if diff is not None else []
+        self._build_rows()
+    
+    def _build_rows(self):
+        rows = []
+        for fi, diff in enumerate(self.files):
+            rows.append((fi, -1, -1))
+            for hi, hunk in enumerate(diff.hunks):
+                rows.append((fi, hi, -1))
+                rows.extend((fi, hi, li) for li in range(len(hunk.lines)))
+        self.rows = rows
+        self.list.set_count(len(rows))
+        self.mark = None
+    
+    def _render(self, index: int, selected: bool):
+        fi, hi, li = self.rows[index]
+        diff = self.files[fi]
+        
+        if hi == -1:
+            label = " (binary)" if diff.binary else ""
+            text, style = f"{diff.path}{label}", "diff_header"
+        elif li == -1:
+            text, style = decode(diff.hunks[hi].header), "info"
+        else:
+            line = diff.hunks[hi].lines[li]
+            text, style = decode(line), LINE_STYLES.get(line[:1], "normal")
+        
+        marked = self.mark is not None and min(self.mark, self.list.selected) <= index <= max(self.mark, self.list.selected)
+        if selected or marked:
+            return text, self.theme.get("selected")
+        return text, self.theme.get(style)
+    
+    def _target(self, whole_hunk: bool) -> Optional[Tuple[int, Hunk, Optional[List[int]]]]:
+        fi, hi, li = self.rows[self.list.selected]
+        if hi == -1:
+            return None
+        
+        diff = self.files[fi]
+        hunk = diff.hunks[hi]
+        if whole_hunk:
+            return fi, hunk, None
+        
+        start = self.list.selected if self.mark is None else min(self.mark, self.list.selected)
+        end = self.list.selected if self.mark is None else max(self.mark, self.list.selected)
+        changes = set(hunk.changes())
+        selected = [
+            row_li for row_fi, row_hi, row_li in self.rows[start:end + 1]
+            if row_fi == fi and row_hi == hi and row_li in changes
+        ]
+        if not selected:
+            return None
+        return fi, hunk, selected
+    
+    def _apply(self, whole_hunk: bool):
+        if not self.rows:
+            return
+        
+        target = self._target(whole_hunk)
+        if target is None:
+            self.message = "Nothing to stage here"
+            return
+        
+        index, hunk, selected = target
+        diff = self.files[index]
+        result = self.cache.apply(diff, hunk, selected)
+        if not result.success:
+            self.message = result.error.strip().split("\n")[0]
+            return
+        
+        verb = "Unstaged" if self.staged else "Staged"
+        self.message = f"{verb} {'hunk' if selected is None else f'{len(selected)} line(s)'} in {diff.path}"
+        
+        updated = self.cache.get(diff.raw_path, self.staged)
+        if updated is None:
+            del self.files[index]
+        else:
+            self.files[index] = updated
+        
+        selected_row = self.list.selected
+        self._build_rows()
+        self.list.select(selected_row)
+    
+    def draw(self):
+        self.stdscr.erase()
+        max_y, max_x = self.stdscr.getmaxyx()
+        
+        title = "Staged Changes" if self.staged else "Unstaged Changes"
+        self.stdscr.addnstr(0, 0, f" {title} ".ljust(max_x), max_x, self.theme.get("header"))
+        
+        self.list.resize(max_y - 4)
+        self.list.draw(self.stdscr, 2, 0, max_x - 1, self._render)
+        
+        if not self.rows:
+            self.stdscr.addnstr(2, 2, "No changes.", max_x - 3, self.theme.get("info"))
+        
+        try:
+            self.stdscr.addnstr(max_y - 2, 0, self.message, max_x - 1, self.theme.get("info"))
+            self.stdscr.addnstr(max_y - 1, 0, FOOTER, max_x - 1, self.theme.get("footer"))
+        except curses.error:
+            pass
+        self.stdscr.refresh()
+    
+    def close(self):
+        # a private cache goes away with the view; a shared one only drops running blames
+        if self._owns_blame_cache:
+            self.blame_cache.clear()
+        else:
+            self.blame_cache.release()
+    
+    def show(self):
+        curses.curs_set(0)
+        self.load()
+        
+        try:
+            while True:
+                self.draw()
+                key = self.stdscr.getch()
+                
+                if key in (ord('q'), 27):
+                    break
+                elif self.list.handle_key(key):
+                    continue
+                elif key == ord(' '):
+                    self._apply(whole_hunk=False)
+                    self.mark = None
+                elif key in (10, curses.KEY_ENTER):
+                    self._apply(whole_hunk=True)
+                elif key == ord('v'):
+                    self.mark = None if self.mark is not None else self.list.selected
+                elif key == ord('b') and self.rows:
+                    fi = self.rows[self.list.selected][0]
+                    BlameView(self.stdscr, self.blame_cache, self.theme, self.files[fi].raw_path, keys=self.keys).show()
+                elif key == 9:
+                    self.staged = not self.staged
+                    self.message = ""
+                    self.load()
+        finally:
+            self.close()
@@ -0,0 +1,94 @@
+"""Full-screen history of a file or directory, paged on demand."""
+
+import curses
+from typing import Dict, Optional
+
+from gittui.git.blame import BlameCache
+from gittui.git.history import HistoryCache, PathHistory
+from gittui.ui.blameview import BlameView
+from gittui.ui.widgets import VirtualList, printable
+
+FOOTER = "j/k: Move | G: Load all | enter: Blame at commit | q: Back"
+
+
+class HistoryView:
+    def __init__(self, stdscr, cache: HistoryCache, theme, raw_path: bytes,
+                 rev: str = "HEAD", keys: Optional[Dict[int, str]] = None,
+                 blame_cache: Optional[BlameCache] = None):
+        self.stdscr = stdscr
+        self.cache = cache
+        self.theme = theme
+        self.raw_path = raw_path
+        self.rev = rev
+        self.keys = keys
+        self._owns_blame_cache = blame_cache is None
+        self.blame_cache = blame_cache or BlameCache(cache.repo)
+        self.history: Optional[PathHistory] = None
+        self.list = VirtualList(keys=keys)
+        self.message = ""
+    
+    def _render(self, index: int, selected: bool):
+        commit = self.history.commits[index]
+        text = f"{commit.short_sha} {commit.author[:16]:<16} {commit.subject}"
+        return text, self.theme.get("selected" if selected else "commit_msg")
+    
+    def _fill(self):
+        history = self.history
+        # keep one page buffered past the visible window
+        history.ensure(self.list.top + self.list.height + history.page_size // 2)
+        self.list.set_count(len(history))
+    
+    def draw(self):
+        self.stdscr.erase()
+        max_y, max_x = self.stdscr.getmaxyx()
+        self.list.resize(max_y - 4)
+        self._fill()
+        
+        history = self.history
+        count = f"{len(history)}" if history.complete else f"{len(history)}+"
+        graph = " [writing commit-graph]" if self.cache.commit_graph.writing else ""
+        title = printable(f" History: {history.path} ({count} commits){graph} ")
+        self.stdscr.addnstr(0, 0, title.ljust(max_x), max_x, self.theme.get("header"))
+        
+        self.list.draw(self.stdscr, 2, 0, max_x - 1, self._render)
+        if not history.commits:
+            self.stdscr.addnstr(2, 2, "No commits touch this path.", max_x - 3, self.theme.get("info"))
+        
+        message = self.message or history.error or ""
+        try:
+            self.stdscr.addnstr(max_y - 2, 0, message, max_x - 1, self.theme.get("error" if history.error else "info"))
+            self.stdscr.addnstr(max_y - 1, 0, FOOTER, max_x - 1, self.theme.get("footer"))
+        except curses.error:
+            pass
+        self.stdscr.refresh()
+    
+    def close(self):
+        self.cache.release()
+        if self._owns_blame_cache:
+            self.blame_cache.clear()
+        else:
+            self.blame_cache.release()
+    
+    def show(self):
+        curses.curs_set(0)
+        self.history = self.cache.get(self.raw_path, self.rev)
+        
+        try:
+            while True:
+                self.draw()
+                key = self.stdscr.getch()
+                action = self.list.keys.get(key)
+                
+                if key in (ord('q'), 27):
+                    break
+                elif action == "bottom":
+                    self.history.ensure(float("inf"))
+                    self.list.set_count(len(self.history))
+                    self.list.to_bottom()
+                elif self.list.handle_key(key):
+                    self.message = ""
+                elif key in (10, curses.KEY_ENTER) and self.history.commits:
+                    commit = self.history.commits[self.list.selected]
+                    BlameView(self.stdscr, self.blame_cache, self.theme, self.raw_path, commit.sha, self.keys).show()
+        finally:
+            self.close()
@@ -0,0 +1,54 @@
+"""Translation of keybinding strings such as "ctrl+u" into curses key codes."""
+
+import curses
+from typing import Dict
+
+SPECIAL_KEYS: Dict[str, int] = {
+    "enter": 10,
+    "return": 10,
+    "escape": 27,
+    "esc": 27,
+    "space": ord(" "),
+    "tab": 9,
+    "shift+tab": curses.KEY_BTAB,
+    "backspace": curses.KEY_BACKSPACE,
+    "delete": curses.KEY_DC,
+    "up": curses.KEY_UP,
+    "down": curses.KEY_DOWN,
+    "left": curses.KEY_LEFT,
+    "right": curses.KEY_RIGHT,
+    "home": curses.KEY_HOME,
+    "end": curses.KEY_END,
+    "pageup": curses.KEY_PPAGE,
+    "pagedown": curses.KEY_NPAGE,
+}
+
+
+class KeyParseError(ValueError):
+    pass
+
+
+def parse_key(spec: str) -> int:
+    name = spec.strip()
+    lowered = name.lower()
+    
+    if lowered in SPECIAL_KEYS:
+        return SPECIAL_KEYS[lowered]
+    
+    if lowered.startswith("ctrl+") and len(name) == 6:
+        char = lowered[5]
+        if "a" <= char <= "z":
+            return ord(char) - ord("a") + 1
+    
+    if lowered.startswith("shift+") and len(name) == 7:
+        return ord(name[6].upper())
+    
+    if lowered.startswith("f") and lowered[1:].isdigit():
+        number = int(lowered[1:])
+        if 1 <= number <= 63:
+            return curses.KEY_F0 + number
+    
+    if len(name) == 1:
+        return ord(name)
+    
+    raise KeyParseError(f"Unknown key: {spec!r}")
@@ -0,0 +1,201 @@
+"""Split-screen arrangement of panels in independent curses windows."""
+
+import curses
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from gittui.config.schema import LayoutConfig
+from gittui.core.events import Event, EventBus, EventType
+from gittui.ui.panels.base import Panel
+from gittui.ui.widgets import printable
+
+PANEL_WEIGHTS = {
+    "status": 1,
+    "files": 4,
+    "commits": 4,
+    "command": 2,
+}
+
+MIN_PANEL_HEIGHT = 3
+
+
+@dataclass
+class Region:
+    y: int
+    x: int
+    height: int
+    width: int
+
+
+def split(total: int, weights: List[int], minimum: int = 1) -> List[int]:
+    if not weights:
+        return []
+    
+    scale = sum(weights)
+    sizes = [max(minimum, total * w // scale) for w in weights]
+    sizes[-1] = max(minimum, total - sum(sizes[:-1]))
+    return sizes
+
+
+def compute_regions(names: List[str], height: int, width: int,
+                    split_ratio: List[float]) -> Dict[str, Region]:
+    half = (len(names) + 1) // 2
+    columns = [names[:half], names[half:]] if len(names) > 1 else [names]
+    
+    ratio = split_ratio[0] if split_ratio else 0.5
+    widths = [int(width * ratio), width - int(width * ratio)] if len(columns) > 1 else [width]
+    
+    regions = {}
+    x = 0
+    for column, column_width in zip(columns, widths):
+        heights = split(height, [PANEL_WEIGHTS.get(name, 2) for name in column], MIN_PANEL_HEIGHT)
+        y = 0
+        for name, panel_height in zip(column, heights):
+            regions[name] = Region(y, x, panel_height, column_width)
+            y += panel_height
+        x += column_width
+    return regions
+
+
+class LayoutManager:
+    def __init__(self, stdscr, config: LayoutConfig, bus: EventBus, theme=None):
+        self.stdscr = stdscr
+        self.config = config
+        self.bus = bus
+        self.theme = theme
+        self.panels: Dict[str, Panel] = {}
+        self.order: List[str] = []
+        self.focus: Optional[str] = None
+        self.frames: Dict[str, object] = {}
+        self.regions: Dict[str, Region] = {}
+        self.footer = None
+        self.footer_text = ""
+        self._frames_dirty = True
+        self._footer_dirty = True
+        bus.subscribe(EventType.RESIZE, self._on_resize)
+    
+    def add(self, panel: Panel):
+        self.panels[panel.name] = panel
+        if panel.name not in self.order:
+            self.order.append(panel.name)
+    
+    @property
+    def focused(self) -> Optional[Panel]:
+        return self.panels.get(self.focus) if self.focus else None
+    
+    def visible_names(self) -> List[str]:
+        return [name for name in self.config.panels if name in self.panels]
+    
+    def relayout(self):
+        max_y, max_x = self.stdscr.getmaxyx()
+        names = self.visible_names()
+        self.regions = compute_regions(names, max_y - 1, max_x, self.config.split_ratio)
+        
+        self.frames.clear()
+        for name in names:
+            region = self.regions[name]
+            frame = curses.newwin(region.height, region.width, region.y, region.x)
+            self.frames[name] = frame
+            
+            if self.config.show_borders and region.height > 2 and region.width > 2:
+                content = frame.derwin(region.height - 2, region.width - 2, 1, 1)
+            else:
+                content = frame
+            self.panels[name].attach(content)
+        
+        self.footer = curses.newwin(1, max_x, max_y - 1, 0)
+        self._footer_dirty = True
+        
+        if self.focus not in self.regions:
+            default = self.config.default_focus
+            self.focus_panel(default if default in self.regions else (names[0] if names else None))
+        self._frames_dirty = True
+    
+    def _on_resize(self, event: Event):
+        self.relayout()
+    
+    def focus_panel(self, name: Optional[str]):
+        if name is not None and name not in self.regions:
+            return
+        
+        previous = self.focused
+        if previous is not None:
+            previous.focused = False
+            previous.dirty = True
+        
+        self.focus = name
+        if self.focused is not None:
+            self.focused.focused = True
+            self.focused.dirty = True
+        
+        self._frames_dirty = True
+        self.bus.emit_simple(EventType.FOCUS_CHANGED, panel=name)
+    
+    def focus_next(self, delta: int = 1):
+        names = self.visible_names()
+        if not names:
+            return
+        index = names.index(self.focus) if self.focus in names else 0
+        self.focus_panel(names[(index + delta) % len(names)])
+    
+    def set_footer(self, text: str):
+        if text != self.footer_text:
+            self.footer_text = text
+            self._footer_dirty = True
+    
+    def _draw_frames(self):
+        for name, frame in self.frames.items():
+            if not self.config.show_borders:
+                continue
+            panel = self.panels[name]
+            style = "panel_focused" if panel.focused else "panel_border"
+            frame.attron(self._style(style))
+            try:
+                frame.box()
+            except curses.error:
+                pass
+            frame.attroff(self._style(style))
+            
+            if self.config.show_panel_titles:
+                _, width = frame.getmaxyx()
+                title = f" {panel.title} "
+                try:
+                    frame.addnstr(0, 2, title, max(0, width - 4), self._style("panel_title"))
+                except curses.error:
+                    pass
+            frame.noutrefresh()
+    
+    def _draw_footer(self):
+        if self.footer is None:
+            return
+        
+        self.footer.erase()
+        _, width = self.footer.getmaxyx()
+        try:
+            self.footer.addnstr(0, 0, printable(self.footer_text), width - 1, self._style("footer"))
+        except curses.error:
+            pass
+        self.footer.noutrefresh()
+    
+    def _style(self, name: str) -> int:
+        return self.theme.get(name) if self.theme is not None else curses.A_NORMAL
+    
+    def render(self) -> bool:
+        changed = False
+        if self._frames_dirty:
+            self._draw_frames()
+            self._frames_dirty = False
+            changed = True
+        
+        if self._footer_dirty:
+            self._draw_footer()
+            self._footer_dirty = False
+            changed = True
+        
+        for name in self.frames:
+            if self.panels[name].refresh():
+                changed = True
+        
+        if changed:
+            curses.doupdate()
+        return changed
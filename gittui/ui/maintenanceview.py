@@ -0,0 +1,168 @@
+"""Repository health report with background maintenance tasks."""
+
+import curses
+from typing import Dict, List, Optional, Set, Tuple
+
+from gittui.git.maintenance import TASKS, Maintenance, MaintenanceJob, RepoHealth
+from gittui.ui.progress import format_bytes
+from gittui.ui.widgets import VirtualList, printable
+
+FOOTER = "space: Toggle task | r: Run when idle | c: Cancel | R: Refresh report | q: Back"
+
+POLL_MS = 250
+
+
+def yes_no(value: bool) -> str:
+    return "yes" if value else "no"
+
+
+def format_timing(before: Optional[float], after: Optional[float]) -> str:
+    text = f"{before * 1000:8.1f} ms" if before is not None else " " * 11
+    if after is not None:
+        text += f"  ->  {after * 1000:8.1f} ms"
+        if before:
+            text += f"  ({(after - before) / before * 100:+.0f}%)"
+    return text
+
+
+class MaintenanceView:
+    def __init__(self, stdscr, maintenance: Maintenance, theme, keys: Optional[Dict[int, str]] = None,
+                 job: Optional[MaintenanceJob] = None):
+        self.stdscr = stdscr
+        self.maintenance = maintenance
+        self.theme = theme
+        self.job = job
+        self.finished = job is None or job.done
+        self.health: Optional[RepoHealth] = None
+        self.selected: Set[str] = set()
+        self.list = VirtualList(len(TASKS), keys=keys)
+        self.message = ""
+    
+    def _report(self) -> List[Tuple[str, str]]:
+        health = self.health
+        counts = health.counts
+        lines = [
+            ("Object store", "header"),
+            (f"  Loose objects:      {health.loose_objects} ({format_bytes(counts.get('size', 0) * 1024)})", "normal"),
+            (f"  Packs:              {health.packs} ({format_bytes(counts.get('size-pack', 0) * 1024)})", "normal"),
+            (f"  Garbage files:      {counts.get('garbage', 0)}", "normal"),
+            (f"  Commit-graph:       {yes_no(health.commit_graph)}"
+             f" (changed-path Bloom filters: {yes_no(health.changed_paths)})", "normal"),
+            (f"  Multi-pack-index:   {yes_no(health.multi_pack_index)}", "normal"),
+            (f"  Reachability bitmap: {yes_no(health.bitmap)}", "normal"),
+            ("", "normal"),
+        ]
+        
+        job = self.job
+        if job is not None and job.before:
+            lines.append(("Hot command timings (best of 3)", "header"))
+            for label, before in job.before.items():
+                lines.append((f"  {label:<18}{format_timing(before, job.after.get(label))}", "normal"))
+            lines.append(("", "normal"))
+        lines.append(("Maintenance tasks", "header"))
+        return lines
+    
+    def _task_state(self, task: str) -> str:
+        job = self.job
+        if job is not None and task in job.tasks:
+            if task in job.results:
+                return "done" if job.results[task].success else "failed: " + job.results[task].error.strip()[:60]
+            if job.current == task:
+                return "running"
+            if job.running:
+                return "waiting for idle"
+            return "cancelled"
+        if task in self.health.recommended():
+            return "recommended"
+        if task == "prefetch" and not self.health.remotes:
+            return "no remotes"
+        return ""
+    
+    def _render(self, index: int, selected: bool):
+        task = TASKS[index]
+        mark = "x" if task in self.selected else " "
+        text = f"  [{mark}] {task:<20} {self._task_state(task)}"
+        if selected:
+            return text, self.theme.get("selected")
+        return text, self.theme.get("staged" if task in self.selected else "normal")
+    
+    def draw(self):
+        self.stdscr.erase()
+        max_y, max_x = self.stdscr.getmaxyx()
+        
+        state = ""
+        if self.job is not None and self.job.running:
+            state = f" [running {self.job.current}]" if self.job.current else " [waiting for idle]"
+        title = f" Repository Maintenance{state} "
+        self.stdscr.addnstr(0, 0, printable(title).ljust(max_x), max_x, self.theme.get("header"))
+        
+        report = self._report()
+        for offset, (line, style) in enumerate(report[:max(0, max_y - 4)]):
+            attr = self.theme.get("info") | curses.A_BOLD if style == "header" else self.theme.get(style)
+            self.stdscr.addnstr(2 + offset, 0, printable(line), max_x - 1, attr)
+        
+        top = 2 + len(report)
+        self.list.resize(max(1, max_y - 2 - top))
+        self.list.draw(self.stdscr, top, 0, max_x - 1, self._render)
+        
+        try:
+            self.stdscr.addnstr(max_y - 2, 0, printable(self.message), max_x - 1, self.theme.get("info"))
+            self.stdscr.addnstr(max_y - 1, 0, FOOTER, max_x - 1, self.theme.get("footer"))
+        except curses.error:
+            pass
+        self.stdscr.refresh()
+    
+    def refresh(self):
+        self.health = self.maintenance.health()
+        if not (self.job is not None and self.job.running):
+            self.selected = set(self.health.recommended())
+    
+    def _run(self):
+        if self.job is not None and self.job.running:
+            self.message = "Maintenance is already running"
+            return
+        tasks = [task for task in TASKS if task in self.selected]
+        if not tasks:
+            self.message = "Select at least one task"
+            return
+        self.job = MaintenanceJob(self.maintenance, tasks)
+        self.job.start()
+        self.finished = False
+        self.message = "Measuring, then running once the repository is idle..."
+    
+    def show(self):
+        curses.curs_set(0)
+        self.refresh()
+        
+        try:
+            while True:
+                running = self.job is not None and self.job.running
+                if self.job is not None and self.job.done and not self.finished:
+                    self.finished = True
+                    self.message = "Maintenance finished"
+                    self.health = self.maintenance.health()
+                self.stdscr.timeout(POLL_MS if running else -1)
+                self.draw()
+                key = self.stdscr.getch()
+                
+                if key == -1:
+                    continue
+                if self.job is not None:
+                    self.job.touch()
+                
+                if key in (ord('q'), 27):
+                    break
+                elif self.list.handle_key(key):
+                    pass
+                elif key == ord(' '):
+                    self.selected ^= {TASKS[self.list.selected]}
+                elif key == ord('r'):
+                    self._run()
+                elif key == ord('c') and running:
+                    self.job.cancel()
+                    self.message = "Cancelling after the current task..."
+                elif key == ord('R'):
+                    self.refresh()
+                    self.message = ""
+        finally:
+            self.stdscr.timeout(-1)
@@ -1,9 +1,19 @@
 """Panel components for the UI."""
 
-from gittui.ui.panels.base import Panel
-from gittui.ui.panels.status import StatusPanel
-from gittui.ui.panels.files import FilesPanel
-from gittui.ui.panels.commits import CommitsPanel
-from gittui.ui.panels.command import CommandPanel
+from importlib import import_module
 
 __all__ = ["Panel", "StatusPanel", "FilesPanel", "CommitsPanel", "CommandPanel"]
+
+_EXPORTS = {
+    "Panel": "gittui.ui.panels.base",
+    "StatusPanel": "gittui.ui.panels.status",
+    "FilesPanel": "gittui.ui.panels.files",
+    "CommitsPanel": "gittui.ui.panels.commits",
+    "CommandPanel": "gittui.ui.panels.command",
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
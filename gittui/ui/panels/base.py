@@ -0,0 +1,111 @@
+"""Base class for layout panels."""
+
+import curses
+from typing import Any, List, Optional, Tuple
+
+from gittui.core.events import Event, EventBus
+from gittui.ui.widgets import VirtualList, printable
+
+
+class Panel:
+    name = "panel"
+    title = ""
+    context = "global_keys"
+    
+    def __init__(self, bus: EventBus, theme=None):
+        self.bus = bus
+        self.theme = theme
+        self.window = None
+        self.height = 0
+        self.width = 0
+        self.focused = False
+        self.dirty = True
+    
+    def attach(self, window):
+        self.window = window
+        self.height, self.width = window.getmaxyx()
+        self.dirty = True
+    
+    def mark_dirty(self, event: Optional[Event] = None):
+        self.dirty = True
+    
+    def style(self, name: str) -> int:
+        if self.theme is None:
+            return curses.A_NORMAL
+        return self.theme.get(name)
+    
+    def put(self, y: int, x: int, text: str, style: str = "normal"):
+        if y >= self.height or x >= self.width:
+            return
+        try:
+            self.window.addnstr(y, x, printable(text), self.width - x, self.style(style))
+        except curses.error:
+            pass
+    
+    def render(self):
+        raise NotImplementedError
+    
+    def refresh(self) -> bool:
+        if not self.dirty or self.window is None:
+            return False
+        
+        self.window.erase()
+        self.render()
+        self.window.noutrefresh()
+        self.dirty = False
+        return True
+    
+    def handle_key(self, key: int) -> bool:
+        return False
+    
+    def handle_action(self, action: str) -> bool:
+        return False
+    
+    def has_pending(self) -> bool:
+        return False
+    
+    def flush(self) -> bool:
+        return False
+
+
+class ListPanel(Panel):
+    def __init__(self, bus: EventBus, theme=None):
+        super().__init__(bus, theme)
+        self.items: List[Any] = []
+        self.list = VirtualList()
+    
+    @property
+    def selected_item(self) -> Optional[Any]:
+        if not self.items:
+            return None
+        return self.items[self.list.selected]
+    
+    def set_items(self, items: List[Any]) -> bool:
+        if items == self.items:
+            return False
+        self.items = items
+        self.list.set_count(len(items))
+        self.dirty = True
+        return True
+    
+    def attach(self, window):
+        super().attach(window)
+        self.list.resize(self.height)
+    
+    def render_item(self, item: Any, selected: bool) -> Tuple[str, int]:
+        raise NotImplementedError
+    
+    def _render_row(self, index: int, selected: bool) -> Tuple[str, int]:
+        text, attr = self.render_item(self.items[index], selected)
+        if selected and self.focused:
+            attr = self.style("selected")
+        return text, attr
+    
+    def render(self):
+        self.list.draw(self.window, 0, 0, self.width, self._render_row)
+    
+    def handle_action(self, action: str) -> bool:
+        if not self.list.handle_action(action):
+            return False
+        self.dirty = True
+        return True
@@ -0,0 +1,78 @@
+"""Panel showing streamed output of running commands."""
+
+import threading
+from collections import deque
+from typing import Deque, Tuple
+
+from gittui.core.events import Event, EventBus, EventType
+from gittui.ui.panels.base import Panel
+from gittui.ui.widgets import VirtualList
+
+STREAM_STYLES = {
+    "command": "info",
+    "stdout": "normal",
+    "error": "error",
+    "success": "success",
+}
+
+
+class CommandPanel(Panel):
+    name = "command"
+    title = "Command Output"
+    
+    def __init__(self, bus: EventBus, theme=None, max_lines: int = 5000):
+        super().__init__(bus, theme)
+        self.lines: Deque[Tuple[str, str]] = deque(maxlen=max_lines)
+        self.list = VirtualList()
+        self.follow = True
+        self._lock = threading.Lock()
+        bus.subscribe(EventType.COMMAND_OUTPUT, self._on_output)
+        bus.subscribe(EventType.ERROR, self._on_error)
+    
+    def append(self, text: str, stream: str = "stdout"):
+        with self._lock:
+            self.lines.append((text, stream))
+        self.dirty = True
+    
+    def clear(self):
+        with self._lock:
+            self.lines.clear()
+        self.dirty = True
+    
+    def _on_output(self, event: Event):
+        data = event.data
+        if "line" in data:
+            self.append(data["line"], data.get("stream", "stdout"))
+        elif "returncode" in data:
+            code = data["returncode"]
+            if code == 0:
+                self.append(f"[{data.get('command', 'command')}: done]", "success")
+            else:
+                self.append(f"[{data.get('command', 'command')}: exit {code}]", "error")
+    
+    def _on_error(self, event: Event):
+        for line in str(event.data.get("message", "")).splitlines():
+            self.append(line, "error")
+    
+    def _render_line(self, index: int, selected: bool):
+        text, stream = self.lines[index]
+        return text, self.style(STREAM_STYLES.get(stream, "normal"))
+    
+    def render(self):
+        with self._lock:
+            self.list.resize(self.height)
+            self.list.set_count(len(self.lines))
+            if self.follow:
+                self.list.to_bottom()
+            self.list.draw(self.window, 0, 0, self.width, self._render_line)
+    
+    def handle_key(self, key: int) -> bool:
+        return self.list.handle_key(key) and self._scrolled()
+    
+    def handle_action(self, action: str) -> bool:
+        return self.list.handle_action(action) and self._scrolled()
+    
+    def _scrolled(self) -> bool:
+        self.follow = self.list.selected >= self.list.count - 1
+        self.dirty = True
+        return True
@@ -0,0 +1,32 @@
+"""Panel listing recent commits on the current branch."""
+
+from typing import Optional, Tuple
+
+from gittui.core.events import Event, EventBus, EventType
+from gittui.git.repository import Commit, Repository
+from gittui.ui.panels.base import ListPanel
+
+
+class CommitsPanel(ListPanel):
+    name = "commits"
+    title = "Commits"
+    context = "commits"
+    
+    def __init__(self, bus: EventBus, repo: Repository, theme=None, max_entries: int = 100):
+        super().__init__(bus, theme)
+        self.repo = repo
+        self.max_entries = max_entries
+        self.head: Optional[str] = None
+        bus.subscribe(EventType.REFRESH, self.reload)
+        bus.subscribe(EventType.COMMIT_CREATED, self.reload)
+        bus.subscribe(EventType.BRANCH_CHANGED, self.reload)
+    
+    def reload(self, event: Optional[Event] = None):
+        head = self.repo.head_oid()
+        if head == self.head and self.items:
+            return
+        self.head = head
+        self.set_items(self.repo.log(self.max_entries) if head else [])
+    
+    def render_item(self, item: Commit, selected: bool) -> Tuple[str, int]:
+        return f"{item.short_sha} {item.subject}", self.style("commit_msg")
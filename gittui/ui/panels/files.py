@@ -0,0 +1,72 @@
+"""Panel listing changed files in the working tree and index."""
+
+from typing import Optional, Tuple
+
+from gittui.core.events import Event, EventBus, EventType
+from gittui.git.repository import FileStatus, Repository
+from gittui.git.staging import StagingEngine, first_error
+from gittui.git.submodule import SubmoduleSet
+from gittui.ui.panels.base import ListPanel
+
+
+class FilesPanel(ListPanel):
+    name = "files"
+    title = "Files"
+    context = "files"
+    
+    def __init__(self, bus: EventBus, repo: Repository, theme=None):
+        super().__init__(bus, theme)
+        self.repo = repo
+        self.staging = StagingEngine(repo)
+        self.submodules = SubmoduleSet(repo)
+        bus.subscribe(EventType.REFRESH, self.reload)
+        bus.subscribe(EventType.FILE_STAGED, self.reload)
+        bus.subscribe(EventType.FILE_UNSTAGED, self.reload)
+    
+    def reload(self, event: Optional[Event] = None):
+        if self.set_items(self.staging.apply(self.submodules.annotate(self.repo.status()))):
+            self.bus.emit(Event(type=EventType.STATUS_UPDATE, data={"entries": self.items}, source=self.name))
+    
+    def handle_action(self, action: str) -> bool:
+        if action == "stage":
+            entry = self.selected_item
+            if entry is None:
+                return True
+            self.items = list(self.items)
+            self.items[self.list.selected] = self.staging.toggle(entry)
+        elif action == "stage_all":
+            self.staging.stage(e for e in self.items if e.untracked or e.worktree != " ")
+            self.items = self.staging.apply(self.items)
+        elif action == "unstage_all":
+            self.staging.unstage(e for e in self.items if e.staged)
+            self.items = self.staging.apply(self.items)
+        else:
+            return super().handle_action(action)
+        
+        self.dirty = True
+        return True
+    
+    def has_pending(self) -> bool:
+        return self.staging.pending
+    
+    def flush(self) -> bool:
+        if not self.staging.pending:
+            return False
+        
+        error = first_error(self.staging.flush())
+        if error:
+            self.bus.emit(Event(type=EventType.ERROR, data={"message": error}, source=self.name))
+        self.bus.emit(Event(type=EventType.FILE_STAGED, source=self.name))
+        return True
+    
+    def render_item(self, item: FileStatus, selected: bool) -> Tuple[str, int]:
+        if item.untracked:
+            style = "untracked"
+        elif item.staged and item.worktree == " ":
+            style = "staged"
+        else:
+            style = "unstaged"
+        text = f"{item.index}{item.worktree} {item.path}"
+        if item.submodule:
+            text += f" ({item.submodule})"
+        return text, self.style(style)
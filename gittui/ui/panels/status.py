@@ -0,0 +1,50 @@
+"""Panel summarising the current branch and working tree state."""
+
+from typing import Optional
+
+from gittui.core.events import Event, EventBus, EventType
+from gittui.git.repository import BranchInfo, Repository
+from gittui.ui.panels.base import Panel
+
+
+class StatusPanel(Panel):
+    name = "status"
+    title = "Status"
+    
+    def __init__(self, bus: EventBus, repo: Repository, theme=None):
+        super().__init__(bus, theme)
+        self.repo = repo
+        self.branch: Optional[BranchInfo] = None
+        self.counts = (0, 0, 0)
+        bus.subscribe(EventType.REFRESH, self.reload)
+        bus.subscribe(EventType.BRANCH_CHANGED, self.reload)
+        bus.subscribe(EventType.STATUS_UPDATE, self.on_status)
+    
+    def reload(self, event: Optional[Event] = None):
+        branch = self.repo.branch_info()
+        if branch != self.branch:
+            self.branch = branch
+            self.dirty = True
+    
+    def on_status(self, event: Event):
+        entries = event.data.get("entries", [])
+        counts = (
+            sum(1 for e in entries if e.staged),
+            sum(1 for e in entries if e.worktree not in (" ", "?", "!")),
+            sum(1 for e in entries if e.untracked),
+        )
+        if counts != self.counts:
+            self.counts = counts
+            self.dirty = True
+    
+    def render(self):
+        if self.branch is None:
+            return
+        
+        line = self.branch.name
+        if self.branch.upstream:
+            line += f" → {self.branch.upstream} ↑{self.branch.ahead} ↓{self.branch.behind}"
+        self.put(0, 0, line, "branch")
+        
+        staged, unstaged, untracked = self.counts
+        self.put(1, 0, f"{staged} staged, {unstaged} modified, {untracked} untracked")
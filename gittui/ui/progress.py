@@ -0,0 +1,72 @@
+"""Progress bars and a cancellable progress dialog."""
+
+import curses
+import time
+from typing import List
+
+from gittui.ui.widgets import printable
+
+BYTE_UNITS = ("B", "KiB", "MiB", "GiB", "TiB")
+
+REDRAW_INTERVAL = 0.05
+
+
+def format_bytes(size: float) -> str:
+    for unit in BYTE_UNITS[:-1]:
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} {BYTE_UNITS[-1]}"
+
+
+def progress_bar(fraction: float, width: int) -> str:
+    width = max(0, width)
+    filled = int(max(0.0, min(1.0, fraction)) * width)
+    return "█" * filled + "░" * (width - filled)
+
+
+class ProgressDialog:
+    def __init__(self, stdscr, theme, title: str):
+        self.stdscr = stdscr
+        self.theme = theme
+        self.title = title
+        self.cancelled = False
+        self._drawn = 0.0
+    
+    def draw(self, label: str, fraction: float, details: List[str], force: bool = False):
+        now = time.monotonic()
+        if not force and now - self._drawn < REDRAW_INTERVAL:
+            return
+        self._drawn = now
+        
+        max_y, max_x = self.stdscr.getmaxyx()
+        width = min(max_x - 4, 72)
+        height = len(details) + 6
+        y = max(0, (max_y - height) // 2)
+        x = max(0, (max_x - width) // 2)
+        
+        self.stdscr.erase()
+        try:
+            self.stdscr.addnstr(y, x, printable(f" {self.title} ").center(width, "─"), width, self.theme.get("header"))
+            self.stdscr.addnstr(y + 2, x + 2, printable(label), width - 4, self.theme.get("info"))
+            bar = progress_bar(fraction, width - 11)
+            self.stdscr.addnstr(y + 3, x + 2, f"{bar} {fraction * 100:5.1f}%", width - 4, self.theme.get("success"))
+            for offset, line in enumerate(details):
+                self.stdscr.addnstr(y + 5 + offset, x + 2, printable(line), width - 4, self.theme.get("normal"))
+            self.stdscr.addnstr(max_y - 1, 0, "Esc: Cancel", max_x - 1, self.theme.get("footer"))
+        except curses.error:
+            pass
+        self.stdscr.refresh()
+    
+    def poll_cancel(self) -> bool:
+        self.stdscr.nodelay(True)
+        try:
+            while True:
+                key = self.stdscr.getch()
+                if key == -1:
+                    break
+                if key == 27:
+                    self.cancelled = True
+        finally:
+            self.stdscr.nodelay(False)
+        return self.cancelled
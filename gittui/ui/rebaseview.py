@@ -0,0 +1,95 @@
+"""Interactive rebase planner: mark, reorder, then run one rebase."""
+
+import curses
+from typing import Dict, Optional
+
+from gittui.config.schema import KeybindingsConfig
+from gittui.git.commands import GitResult
+from gittui.git.rebase import DROP, FIXUP, PICK, SQUASH, RebasePlan, RebasePlanError
+from gittui.ui.keys import parse_key
+from gittui.ui.widgets import VirtualList, printable
+
+FOOTER = "p/s/f/d: Pick/Squash/Fixup/Drop | J/K: Move | a: Autosquash | u: Update refs | x: Run | q: Back"
+
+ACTION_STYLES = {PICK: "commit_msg", SQUASH: "info", FIXUP: "info", DROP: "unstaged"}
+
+
+class RebaseView:
+    def __init__(self, stdscr, plan: RebasePlan, theme, keys: Optional[Dict[int, str]] = None,
+                 commit_keys: Optional[Dict[str, str]] = None):
+        self.stdscr = stdscr
+        self.plan = plan
+        self.theme = theme
+        self.list = VirtualList(keys=keys)
+        self.message = ""
+        bindings = commit_keys if commit_keys is not None else KeybindingsConfig().commits
+        self.actions = {ord('p'): PICK, ord('d'): DROP}
+        for action in (SQUASH, FIXUP):
+            if action in bindings:
+                self.actions[parse_key(bindings[action])] = action
+    
+    def _render(self, index: int, selected: bool):
+        item = self.plan.items[index]
+        refs = ""
+        if item.refs:
+            refs = " (" + ", ".join(ref[len("refs/heads/"):] for ref in item.refs) + ")"
+        text = f"{item.action:<6} {item.commit.short_sha} {item.commit.subject}{refs}"
+        return text, self.theme.get("selected" if selected else ACTION_STYLES[item.action])
+    
+    def draw(self):
+        self.stdscr.erase()
+        max_y, max_x = self.stdscr.getmaxyx()
+        
+        flags = " --update-refs" if self.plan.update_refs else ""
+        title = f" Rebase -i onto {self.plan.upstream}{flags} ({len(self.plan.items)} commits, oldest first) "
+        self.stdscr.addnstr(0, 0, printable(title).ljust(max_x), max_x, self.theme.get("header"))
+        
+        self.list.resize(max_y - 4)
+        self.list.set_count(len(self.plan.items))
+        self.list.draw(self.stdscr, 2, 0, max_x - 1, self._render)
+        if not self.plan.items:
+            self.stdscr.addnstr(2, 2, f"No commits between {self.plan.upstream} and HEAD.", max_x - 3, self.theme.get("info"))
+        
+        try:
+            self.stdscr.addnstr(max_y - 2, 0, printable(self.message), max_x - 1, self.theme.get("info"))
+            self.stdscr.addnstr(max_y - 1, 0, FOOTER, max_x - 1, self.theme.get("footer"))
+        except curses.error:
+            pass
+        self.stdscr.refresh()
+    
+    def show(self) -> Optional[GitResult]:
+        curses.curs_set(0)
+        
+        while True:
+            self.draw()
+            key = self.stdscr.getch()
+            index = self.list.selected
+            
+            if key in (ord('q'), 27):
+                return None
+            elif self.list.handle_key(key):
+                self.message = ""
+            elif key == ord('u'):
+                self.plan.update_refs = not self.plan.update_refs
+            elif not self.plan.items:
+                continue
+            elif key in self.actions:
+                self.plan.set_action(index, self.actions[key])
+                self.list.move(1)
+            elif key in (ord('J'), ord('K')):
+                self.list.select(self.plan.move(index, 1 if key == ord('J') else -1))
+            elif key == ord('a'):
+                moved = self.plan.autosquash()
+                self.message = f"Moved {moved} fixup/squash commit(s) under their targets"
+            elif key == ord('x'):
+                if not self.plan.changed():
+                    self.message = "Nothing to do: every commit is picked in its original order"
+                    continue
+                try:
+                    self.plan.validate()
+                except RebasePlanError as e:
+                    self.message = str(e)
+                    continue
+                self.message = "Rebasing..."
+                self.draw()
+                return self.plan.run()
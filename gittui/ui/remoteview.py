@@ -0,0 +1,166 @@
+"""Remote panel: details from local config and tracking refs, compared against cached `ls-remote` snapshots."""
+
+import curses
+import time
+from typing import Dict, List, Optional, Tuple
+
+from gittui.git.remotes import CHANGED, GONE, NEW, UP_TO_DATE, RemoteInfo, RemoteSet
+from gittui.ui.widgets import VirtualList, printable
+
+FOOTER = "f: Check remote | F: Check all | tab: Details | q: Back"
+
+POLL_MS = 100
+
+STATE_STYLES = {UP_TO_DATE: "success", CHANGED: "warning", NEW: "info", GONE: "error"}
+
+
+def format_age(seconds: float) -> str:
+    for unit, size in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds >= size:
+            return f"{int(seconds // size)}{unit} ago"
+    return "just now"
+
+
+class RemoteView:
+    def __init__(self, stdscr, remotes: RemoteSet, theme, keys: Optional[Dict[int, str]] = None,
+                 selected: Optional[str] = None):
+        self.stdscr = stdscr
+        self.remotes = remotes
+        self.theme = theme
+        self.list = VirtualList(keys=keys)
+        self.detail_list = VirtualList(keys=keys)
+        self.focus_details = False
+        self.selected = selected
+        self.details: List[Tuple[str, str]] = []
+        self.message = ""
+    
+    def _infos(self) -> List[RemoteInfo]:
+        return list(self.remotes.remotes.values())
+    
+    def _selected(self) -> Optional[RemoteInfo]:
+        infos = self._infos()
+        return infos[self.list.selected] if infos else None
+    
+    def _snapshot_state(self, info: RemoteInfo) -> Tuple[str, str]:
+        if self.remotes.refreshing(info.name):
+            return "checking...", "info"
+        snapshot = info.snapshot
+        if snapshot is None:
+            return "not checked", "normal"
+        if snapshot.error:
+            seen = f", last seen {format_age(snapshot.age)}" if snapshot.timestamp else ""
+            return f"unreachable{seen}", "error"
+        return f"checked {format_age(snapshot.age)}", "success"
+    
+    def _render(self, index: int, selected: bool):
+        info = self._infos()[index]
+        state, style = self._snapshot_state(info)
+        text = f"  {info.name:<16} {info.url:<48} {state}"
+        return text, self.theme.get("selected" if selected and not self.focus_details else style)
+    
+    def _render_detail(self, index: int, selected: bool):
+        text, style = self.details[index]
+        return text, self.theme.get("selected" if selected and self.focus_details else style)
+    
+    def _details(self, info: RemoteInfo) -> List[Tuple[str, str]]:
+        lines = [(f"Fetch URL: {url}", "normal") for url in info.urls]
+        lines += [(f"Push URL:  {url}", "normal") for url in info.push_urls or info.urls]
+        lines += [(f"Refspec:   {refspec}", "normal") for refspec in info.fetch]
+        snapshot = info.snapshot
+        if snapshot is not None and snapshot.timestamp and snapshot.head:
+            lines.append((f"HEAD:      {snapshot.head} (as of {time.strftime('%Y-%m-%d %H:%M', time.localtime(snapshot.timestamp))})",
+                          "branch"))
+        elif info.head:
+            lines.append((f"HEAD:      {info.head} (last fetch)", "branch"))
+        if snapshot is not None and snapshot.error:
+            lines.append((f"Last check failed: {snapshot.error}", "error"))
+        
+        states = info.branch_states()
+        lines.append(("", "normal"))
+        lines.append((f"Remote branches ({len(states)})", "panel_title"))
+        for branch, local, remote, state in states:
+            oid = (local or remote or "")[:7]
+            lines.append((f"  {oid:<8} {branch:<40} {state}", STATE_STYLES.get(state, "normal")))
+        if snapshot is not None and snapshot.timestamp:
+            lines.append((f"  {snapshot.tags} tags on remote", "normal"))
+        
+        if info.branches:
+            lines.append(("", "normal"))
+            lines.append((f"Local branches tracking {info.name} ({len(info.branches)})", "panel_title"))
+            for branch in info.branches:
+                track = f" [{branch.track}]" if branch.track else ""
+                lines.append((f"  {branch.name:<24} -> {branch.upstream}{track}", "branch"))
+        return lines
+    
+    def draw(self):
+        self.stdscr.erase()
+        max_y, max_x = self.stdscr.getmaxyx()
+        
+        infos = self._infos()
+        busy = " [checking]" if self.remotes.running else ""
+        title = f" Remotes ({len(infos)}){busy} "
+        self.stdscr.addnstr(0, 0, printable(title).ljust(max_x), max_x, self.theme.get("header"))
+        
+        list_height = max(1, min(len(infos), (max_y - 5) // 3))
+        self.list.resize(list_height)
+        self.list.set_count(len(infos))
+        self.list.draw(self.stdscr, 2, 0, max_x - 1, self._render)
+        if not infos:
+            self.stdscr.addnstr(2, 2, "No remotes configured.", max_x - 3, self.theme.get("info"))
+        
+        details_y = 3 + list_height
+        try:
+            self.stdscr.addnstr(details_y - 1, 0, "─" * (max_x - 1), max_x - 1, self.theme.get("panel_border"))
+        except curses.error:
+            pass
+        info = self._selected()
+        # rebuilt every frame so snapshots landing in the background show up
+        self.details = self._details(info) if info is not None else []
+        self.detail_list.resize(max(1, max_y - 2 - details_y))
+        self.detail_list.set_count(len(self.details))
+        self.detail_list.draw(self.stdscr, details_y, 0, max_x - 1, self._render_detail)
+        
+        try:
+            self.stdscr.addnstr(max_y - 2, 0, printable(self.message), max_x - 1, self.theme.get("info"))
+            self.stdscr.addnstr(max_y - 1, 0, FOOTER, max_x - 1, self.theme.get("footer"))
+        except curses.error:
+            pass
+        self.stdscr.refresh()
+    
+    def _refresh(self, names: List[str]):
+        if self.remotes.refresh_async(names) is None:
+            self.message = "A check is still running"
+        else:
+            self.message = f"Checking {', '.join(names)}..."
+    
+    def show(self):
+        curses.curs_set(0)
+        names = self.remotes.names()
+        self.list.set_count(len(names))
+        if self.selected in names:
+            self.list.select(names.index(self.selected))
+        
+        try:
+            while True:
+                running = self.remotes.running
+                if not running and self.message.startswith("Checking"):
+                    self.message = ""
+                self.stdscr.timeout(POLL_MS if running else -1)
+                self.draw()
+                key = self.stdscr.getch()
+                
+                if key == -1:
+                    continue
+                if key in (ord('q'), 27):
+                    break
+                elif key == 9:
+                    self.focus_details = not self.focus_details
+                elif (self.detail_list if self.focus_details else self.list).handle_key(key):
+                    if not self.focus_details:
+                        self.detail_list.select(0)
+                elif key == ord('f') and self._selected() is not None:
+                    self._refresh([self._selected().name])
+                elif key == ord('F') and names:
+                    self._refresh(names)
+        finally:
+            self.stdscr.timeout(-1)
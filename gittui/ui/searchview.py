@@ -0,0 +1,103 @@
+"""Interactive commit search over the on-disk index."""
+
+import curses
+import threading
+from typing import List, Optional
+
+from gittui.git.search import SearchIndex
+from gittui.ui.widgets import ARROW_KEYS, VirtualList, printable
+
+FOOTER = "type to filter (author:, path: prefixes) | arrows: Move | enter: Details | Esc: Back"
+
+POLL_MS = 100
+
+
+class SearchView:
+    def __init__(self, stdscr, index: SearchIndex, theme):
+        self.stdscr = stdscr
+        self.index = index
+        self.theme = theme
+        self.query = ""
+        self.results: List[int] = []
+        self.list = VirtualList(keys=dict(ARROW_KEYS))
+        self.message = ""
+        self._cancel: Optional[threading.Event] = None
+    
+    def _render(self, index: int, selected: bool):
+        commit = self.index.doc(self.results[index])
+        if commit is None:
+            return "", self.theme.get("normal")
+        text = f"{commit.short_sha} {commit.author[:16]:<16} {commit.subject}"
+        return text, self.theme.get("selected" if selected else "commit_msg")
+    
+    def _search(self):
+        self.results = self.index.search(self.query)
+        self.list.set_count(len(self.results))
+        self.list.to_top()
+        self.message = ""
+    
+    def draw(self):
+        self.stdscr.erase()
+        max_y, max_x = self.stdscr.getmaxyx()
+        
+        if self.index.updating:
+            status = "indexing..."
+        else:
+            status = f"{len(self.results)} of {self.index.count} commits"
+        title = printable(f" Search Commits ({status}) ")
+        self.stdscr.addnstr(0, 0, title.ljust(max_x), max_x, self.theme.get("header"))
+        self.stdscr.addnstr(1, 0, printable(f"/ {self.query}"), max_x - 1, self.theme.get("info"))
+        
+        self.list.resize(max_y - 5)
+        self.list.draw(self.stdscr, 3, 0, max_x - 1, self._render)
+        
+        try:
+            self.stdscr.addnstr(max_y - 2, 0, printable(self.message), max_x - 1, self.theme.get("info"))
+            self.stdscr.addnstr(max_y - 1, 0, FOOTER, max_x - 1, self.theme.get("footer"))
+        except curses.error:
+            pass
+        self.stdscr.refresh()
+    
+    def _start_update(self):
+        self._cancel = threading.Event()
+        self.index.update_async(cancel=self._cancel)
+    
+    def show(self):
+        curses.curs_set(0)
+        self.index.load()
+        # the first open builds the index; later opens only append new commits
+        self._start_update()
+        was_updating = True
+        
+        try:
+            while True:
+                updating = self.index.updating
+                if was_updating and not updating:
+                    self.index.load()
+                    self._search()
+                was_updating = updating
+                
+                self.draw()
+                self.stdscr.timeout(POLL_MS if updating else -1)
+                key = self.stdscr.getch()
+                
+                if key == -1:
+                    continue
+                elif key == 27:
+                    break
+                elif self.list.handle_key(key):
+                    continue
+                elif key in (10, curses.KEY_ENTER):
+                    if self.results:
+                        commit = self.index.doc(self.results[self.list.selected])
+                        self.message = f"{commit.sha} {commit.author}: {commit.subject}"
+                elif key in (curses.KEY_BACKSPACE, 127, 8):
+                    self.query = self.query[:-1]
+                    self._search()
+                elif 32 <= key < 127:
+                    self.query += chr(key)
+                    self._search()
+        finally:
+            if self._cancel is not None:
+                self._cancel.set()
+            self.stdscr.timeout(-1)
@@ -0,0 +1,150 @@
+"""Repository size report: largest blobs, directories, size histogram and growth over history."""
+
+import curses
+import time
+from typing import Dict, List, Optional, Tuple
+
+from gittui.git.sizes import OBJECT_TYPES, SizeAnalyzer
+from gittui.ui.progress import format_bytes, progress_bar
+from gittui.ui.widgets import VirtualList, printable
+
+FOOTER = "1-4/tab: Section | c: Cancel | r: Rerun | q: Back"
+
+SECTIONS = ("Largest blobs", "Directories", "Blob sizes", "Growth")
+
+POLL_MS = 200
+
+BAR_WIDTH = 30
+
+
+class SizeView:
+    def __init__(self, stdscr, analyzer: SizeAnalyzer, theme, keys: Optional[Dict[int, str]] = None):
+        self.stdscr = stdscr
+        self.analyzer = analyzer
+        self.theme = theme
+        self.section = 0
+        self.list = VirtualList(keys=keys)
+        self.rows: List[Tuple[str, str]] = []
+        self.message = ""
+    
+    def _rows(self) -> List[Tuple[str, str]]:
+        report = self.analyzer.report
+        if self.section == 0:
+            return [(f"{format_bytes(blob.disk):>10} {format_bytes(blob.size):>10}  {blob.oid[:10]}  {blob.path}",
+                     "warning" if blob.raw_path is None else "normal") for blob in report.blobs]
+        if self.section == 1:
+            return [(f"{format_bytes(entry.disk):>10} {format_bytes(entry.size):>10} {entry.blobs:>8}  {entry.path}",
+                     "normal") for entry in report.directories]
+        if self.section == 2:
+            peak = max(report.histogram) or 1
+            rows = []
+            for bits, count in enumerate(report.histogram):
+                if count:
+                    label = "empty" if bits == 0 else f"{format_bytes(1 << (bits - 1))} - {format_bytes(1 << bits)}"
+                    rows.append((f"{label:>24} {count:>10}  {progress_bar(count / peak, BAR_WIDTH)}", "normal"))
+            return rows
+        peak = max((size for _, size in report.growth), default=0) or 1
+        return [(f"{time.strftime('%Y-%m-%d', time.localtime(timestamp))} {format_bytes(size):>10}  "
+                 f"{progress_bar(size / peak, BAR_WIDTH)}", "normal") for timestamp, size in report.growth]
+    
+    def _render(self, index: int, selected: bool):
+        text, style = self.rows[index]
+        return text, self.theme.get("selected" if selected else style)
+    
+    def _summary(self) -> List[str]:
+        report = self.analyzer.report
+        lines = []
+        for index, name in enumerate(OBJECT_TYPES):
+            lines.append(f"  {name + 's':<8} {report.counts[index]:>10}  {format_bytes(report.sizes[index]):>10}"
+                         f"  ({format_bytes(report.disk[index])} on disk)")
+        total = report.total_disk
+        line = f"  {'total':<8} {report.total_objects:>10}  {format_bytes(total):>10} on disk"
+        if report.reachable_disk:
+            line += f", {format_bytes(max(0, total - report.reachable_disk))} unreachable"
+        lines.append(line)
+        return lines
+    
+    def _status(self) -> str:
+        analyzer = self.analyzer
+        if not analyzer.running:
+            return analyzer.error or ""
+        if analyzer.expected:
+            fraction = min(1.0, analyzer.processed / analyzer.expected)
+            return f"{analyzer.phase}: {progress_bar(fraction, 20)} {analyzer.processed}/{analyzer.expected}"
+        return f"{analyzer.phase}: {analyzer.processed}"
+    
+    def draw(self):
+        self.stdscr.erase()
+        max_y, max_x = self.stdscr.getmaxyx()
+        
+        title = f" Repository Size [{self.analyzer.phase or 'Starting'}] "
+        self.stdscr.addnstr(0, 0, printable(title).ljust(max_x), max_x, self.theme.get("header"))
+        
+        summary = self._summary()
+        for offset, line in enumerate(summary):
+            self.stdscr.addnstr(2 + offset, 0, line, max_x - 1, self.theme.get("normal"))
+        
+        tabs_y = 3 + len(summary)
+        x = 0
+        for index, name in enumerate(SECTIONS):
+            label = f" {index + 1} {name} "
+            style = "panel_focused" if index == self.section else "panel_title"
+            try:
+                self.stdscr.addnstr(tabs_y, x, label, max(0, max_x - 1 - x), self.theme.get(style))
+            except curses.error:
+                pass
+            x += len(label) + 1
+        
+        self.rows = self._rows()
+        self.list.resize(max(1, max_y - tabs_y - 4))
+        self.list.set_count(len(self.rows))
+        self.list.draw(self.stdscr, tabs_y + 2, 0, max_x - 1, self._render)
+        if not self.rows:
+            empty = "Working..." if self.analyzer.running else "Nothing to show."
+            self.stdscr.addnstr(tabs_y + 2, 2, empty, max_x - 3, self.theme.get("info"))
+        
+        try:
+            status = self.message or self._status()
+            self.stdscr.addnstr(max_y - 2, 0, printable(status), max_x - 1, self.theme.get("info"))
+            self.stdscr.addnstr(max_y - 1, 0, FOOTER, max_x - 1, self.theme.get("footer"))
+        except curses.error:
+            pass
+        self.stdscr.refresh()
+    
+    def _select(self, section: int):
+        self.section = section % len(SECTIONS)
+        self.list.select(0)
+    
+    def show(self):
+        curses.curs_set(0)
+        if not self.analyzer.running and not self.analyzer.done:
+            self.analyzer.start()
+        
+        try:
+            while True:
+                self.stdscr.timeout(POLL_MS if self.analyzer.running else -1)
+                self.draw()
+                key = self.stdscr.getch()
+                
+                if key == -1:
+                    continue
+                self.message = ""
+                if key in (ord('q'), 27):
+                    break
+                elif self.list.handle_key(key):
+                    pass
+                elif key == 9:
+                    self._select(self.section + 1)
+                elif ord('1') <= key < ord('1') + len(SECTIONS):
+                    self._select(key - ord('1'))
+                elif key == ord('c') and self.analyzer.running:
+                    self.analyzer.cancel()
+                    self.message = "Cancelling..."
+                elif key == ord('r'):
+                    if self.analyzer.running:
+                        self.message = "Analysis is still running"
+                    else:
+                        self.analyzer = SizeAnalyzer(self.analyzer.repo, self.analyzer.top, self.analyzer.growth_points)
+                        self.analyzer.start()
+        finally:
+            self.stdscr.timeout(-1)
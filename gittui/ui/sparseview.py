@@ -0,0 +1,144 @@
+"""Cone-mode sparse checkout directory picker."""
+
+import curses
+from typing import Dict, List, Optional
+
+from gittui.git.output import decode
+from gittui.git.sparse import SparseCheckout, SparseTree
+from gittui.ui.widgets import VirtualList, printable
+
+FOOTER = "space: Toggle dir | enter/l: Expand | h: Collapse | w: Apply | q: Back"
+PATTERNS_FOOTER = "↑↓: Scroll | q: Back"
+
+
+class SparseView:
+    def __init__(self, stdscr, sparse: SparseCheckout, theme, keys: Optional[Dict[int, str]] = None):
+        self.stdscr = stdscr
+        self.sparse = sparse
+        self.theme = theme
+        self.tree: Optional[SparseTree] = None
+        self.list = VirtualList(keys=keys)
+        self.message = ""
+        self.enabled = False
+        self.cone = True
+        # set instead of the tree when the sparse file holds non-cone patterns
+        self.patterns: Optional[List[bytes]] = None
+    
+    def _render_pattern(self, index: int, selected: bool):
+        text = printable(decode(self.patterns[index]))
+        return text, self.theme.get("selected" if selected else "normal")
+    
+    def _render(self, index: int, selected: bool):
+        node = self.tree.nodes[index]
+        state = self.tree.state(index)
+        arrow = "▾" if node.expanded else "▸"
+        text = f"{'  ' * node.depth}[{state}] {arrow} {node.name}/"
+        if selected:
+            return text, self.theme.get("selected")
+        return text, self.theme.get("staged" if state == "x" else "info" if state == "~" else "normal")
+    
+    def draw(self):
+        self.stdscr.erase()
+        max_y, max_x = self.stdscr.getmaxyx()
+        
+        mode = "cone" if self.cone else "non-cone"
+        state = f"enabled, {mode}" if self.enabled else "disabled"
+        if self.patterns is not None:
+            title = f" Sparse Checkout ({state}, {len(self.patterns)} patterns) "
+        else:
+            title = f" Sparse Checkout ({state}, {len(self.tree.selected)} dirs selected) "
+        self.stdscr.addnstr(0, 0, printable(title).ljust(max_x), max_x, self.theme.get("header"))
+        
+        self.list.resize(max_y - 4)
+        if self.patterns is not None:
+            self.list.set_count(len(self.patterns))
+            self.list.draw(self.stdscr, 2, 0, max_x - 1, self._render_pattern)
+        else:
+            self.list.set_count(len(self.tree.nodes))
+            self.list.draw(self.stdscr, 2, 0, max_x - 1, self._render)
+            if not self.tree.nodes:
+                self.stdscr.addnstr(2, 2, "No directories at HEAD.", max_x - 3, self.theme.get("info"))
+        
+        try:
+            self.stdscr.addnstr(max_y - 2, 0, printable(self.message), max_x - 1, self.theme.get("info"))
+            footer = PATTERNS_FOOTER if self.patterns is not None else FOOTER
+            self.stdscr.addnstr(max_y - 1, 0, footer, max_x - 1, self.theme.get("footer"))
+        except curses.error:
+            pass
+        self.stdscr.refresh()
+    
+    def _load_state(self):
+        # read once and after every apply, not on every frame
+        self.enabled = self.sparse.enabled()
+        self.cone = self.sparse.cone()
+    
+    def _confirm(self, prompt: str) -> bool:
+        self.message = f"{prompt} (y/n)"
+        self.draw()
+        return self.stdscr.getch() in (ord('y'), ord('Y'))
+    
+    def _shrink_warning(self) -> Optional[str]:
+        if not self.tree.selected:
+            return "Remove every directory and keep only top-level files?"
+        if not self.enabled:
+            return "Remove every unselected directory from the working tree?"
+        removed = self.tree.removed()
+        if removed:
+            return f"Remove {len(removed)} checked-out directories from the working tree?"
+        return None
+    
+    def _apply(self):
+        warning = self._shrink_warning()
+        if warning is not None and not self._confirm(warning):
+            self.message = "Apply cancelled"
+            return
+        self.message = "Updating working tree..."
+        self.draw()
+        result = self.tree.apply()
+        self._load_state()
+        if result.success:
+            self.message = f"Checked out top-level files and {len(self.tree.selected)} directories"
+        else:
+            self.message = result.error.strip().split("\n")[0]
+    
+    def show(self):
+        curses.curs_set(0)
+        self._load_state()
+        directories = self.sparse.directories()
+        if directories is None:
+            # rewriting these as a cone would silently change what is checked out
+            self.patterns = self.sparse.patterns()
+            self.message = "Non-cone patterns are shown as is; use git sparse-checkout to change them"
+            directories = set()
+        self.tree = SparseTree(self.sparse, directories)
+        
+        while True:
+            self.draw()
+            key = self.stdscr.getch()
+            index = self.list.selected
+            has_nodes = bool(self.tree.nodes)
+            
+            if key in (ord('q'), 27):
+                break
+            elif self.list.handle_key(key):
+                if self.patterns is None:
+                    self.message = ""
+            elif self.patterns is not None or not has_nodes:
+                continue
+            elif key in (10, curses.KEY_ENTER):
+                self.tree.toggle_expand(index)
+            elif key in (ord('l'), curses.KEY_RIGHT):
+                self.tree.expand(index)
+            elif key in (ord('h'), curses.KEY_LEFT):
+                node = self.tree.nodes[index]
+                if not node.expanded and node.depth > 0:
+                    # jump to the parent before collapsing
+                    while self.tree.nodes[index].depth >= node.depth:
+                        index -= 1
+                    self.list.select(index)
+                self.tree.collapse(index)
+            elif key == ord(' '):
+                if not self.tree.toggle_select(index):
+                    self.message = "A parent directory is already selected"
+            elif key == ord('w'):
+                self._apply()
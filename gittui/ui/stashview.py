@@ -0,0 +1,147 @@
+"""Stash panel: stash list with the selected stash's diff loaded on demand."""
+
+import curses
+from typing import Dict, Optional
+
+from gittui.config.schema import KeybindingsConfig
+from gittui.git.stash import StashList
+from gittui.ui.keys import parse_key
+from gittui.ui.widgets import VirtualList, printable
+
+FOOTER = "{apply}: Apply | {pop}: Pop | {drop}: Drop | tab: Scroll diff | q: Back"
+
+# the diff is loaded once the selection rests this long
+DIFF_DELAY_MS = 120
+
+DIFF_STYLES = {"+": "diff_add", "-": "diff_del", "@": "diff_header"}
+
+
+class StashView:
+    def __init__(self, stdscr, stashes: StashList, theme, keys: Optional[Dict[int, str]] = None,
+                 stash_keys: Optional[Dict[str, str]] = None):
+        self.stdscr = stdscr
+        self.stashes = stashes
+        self.theme = theme
+        self.list = VirtualList(keys=keys)
+        self.diff_list = VirtualList(keys=keys)
+        self.focus_diff = False
+        self.diff = None
+        self.diff_oid: Optional[str] = None
+        self.message = ""
+        bindings = dict(KeybindingsConfig().stash, **(stash_keys or {}))
+        self.bindings = {action: bindings[action] for action in ("apply", "pop", "drop")}
+        self.actions = {parse_key(spec): action for action, spec in self.bindings.items()}
+    
+    def _render(self, index: int, selected: bool):
+        entry = self.stashes.entries[index]
+        text = f"{entry.selector:<12} {entry.date}  {entry.subject}"
+        style = "selected" if selected and not self.focus_diff else "commit_msg"
+        return text, self.theme.get(style)
+    
+    def _render_diff(self, index: int, selected: bool):
+        line = self.diff[index]
+        if selected and self.focus_diff:
+            return line, self.theme.get("selected")
+        style = "diff_header" if line.startswith(("diff ", "+++", "---")) else DIFF_STYLES.get(line[:1], "normal")
+        return line, self.theme.get(style)
+    
+    def _selected(self):
+        if not self.stashes.entries:
+            return None
+        return self.stashes.entries[self.list.selected]
+    
+    def _load_diff(self):
+        entry = self._selected()
+        if entry is None or entry.oid == self.diff_oid:
+            return
+        self.diff = self.stashes.diff(entry)
+        self.diff_oid = entry.oid
+        self.diff_list.set_count(len(self.diff))
+        self.diff_list.select(0)
+    
+    def draw(self):
+        self.stdscr.erase()
+        max_y, max_x = self.stdscr.getmaxyx()
+        
+        title = f" Stashes ({len(self.stashes.entries)}) "
+        self.stdscr.addnstr(0, 0, printable(title).ljust(max_x), max_x, self.theme.get("header"))
+        
+        list_height = max(1, min(len(self.stashes.entries), (max_y - 5) // 3))
+        self.list.resize(list_height)
+        self.list.set_count(len(self.stashes.entries))
+        self.list.draw(self.stdscr, 2, 0, max_x - 1, self._render)
+        if not self.stashes.entries:
+            self.stdscr.addnstr(2, 2, "No stashes.", max_x - 3, self.theme.get("info"))
+        
+        diff_y = 3 + list_height
+        try:
+            self.stdscr.addnstr(diff_y - 1, 0, "─" * (max_x - 1), max_x - 1, self.theme.get("panel_border"))
+        except curses.error:
+            pass
+        entry = self._selected()
+        if entry is not None and entry.oid == self.diff_oid:
+            self.diff_list.resize(max(1, max_y - 2 - diff_y))
+            self.diff_list.draw(self.stdscr, diff_y, 0, max_x - 1, self._render_diff)
+        elif entry is not None:
+            self.stdscr.addnstr(diff_y, 2, "Loading diff...", max_x - 3, self.theme.get("info"))
+        
+        try:
+            self.stdscr.addnstr(max_y - 2, 0, printable(self.message), max_x - 1, self.theme.get("info"))
+            self.stdscr.addnstr(max_y - 1, 0, FOOTER.format(**self.bindings), max_x - 1, self.theme.get("footer"))
+        except curses.error:
+            pass
+        self.stdscr.refresh()
+    
+    def _confirm(self, prompt: str) -> bool:
+        self.message = f"{prompt} (y/n)"
+        self.draw()
+        return self.stdscr.getch() in (ord('y'), ord('Y'))
+    
+    def _run(self, action: str):
+        entry = self._selected()
+        if action == "drop" and not self._confirm(f"Drop {entry.selector}?"):
+            self.message = ""
+            return
+        result = getattr(self.stashes, action)(entry)
+        if result.success:
+            self.message = f"{action.capitalize()} {entry.selector}: done"
+        else:
+            self.message = result.error.strip().split("\n")[0]
+        if action != "apply":
+            # indices shift, but cached diffs are keyed by OID and stay valid
+            self.stashes.load()
+            self.list.set_count(len(self.stashes.entries))
+            self.diff_oid = None
+    
+    def show(self):
+        curses.curs_set(0)
+        self.stashes.load()
+        self.list.set_count(len(self.stashes.entries))
+        
+        try:
+            while True:
+                entry = self._selected()
+                waiting = entry is not None and entry.oid != self.diff_oid
+                self.stdscr.timeout(DIFF_DELAY_MS if waiting else -1)
+                self.draw()
+                key = self.stdscr.getch()
+                
+                if key == -1:
+                    self._load_diff()
+                elif key in (ord('q'), 27):
+                    if not self.focus_diff:
+                        break
+                    self.focus_diff = False
+                elif key == 9:
+                    self.focus_diff = not self.focus_diff and self.diff_oid is not None
+                elif self.focus_diff and self.diff_list.handle_key(key):
+                    pass
+                elif self.list.handle_key(key):
+                    self.message = ""
+                elif key in (10, curses.KEY_ENTER):
+                    self._load_diff()
+                    self.focus_diff = self.diff_oid is not None
+                elif key in self.actions and entry is not None:
+                    self._run(self.actions[key])
+        finally:
+            self.stdscr.timeout(-1)
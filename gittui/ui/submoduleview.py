@@ -0,0 +1,138 @@
+"""Submodule panel: per-submodule state filled in as parallel status checks finish."""
+
+import curses
+import threading
+from typing import Dict, Optional
+
+from gittui.git.commands import GitResult
+from gittui.git.submodule import Submodule, SubmoduleSet
+from gittui.ui.widgets import VirtualList, printable
+
+FOOTER = "r: Refresh | u: Update (init, recursive) | f: Fetch | q: Back (stops running commands)"
+
+POLL_MS = 100
+
+
+class SubmoduleView:
+    def __init__(self, stdscr, submodules: SubmoduleSet, theme, keys: Optional[Dict[int, str]] = None):
+        self.stdscr = stdscr
+        self.submodules = submodules
+        self.theme = theme
+        self.list = VirtualList(keys=keys)
+        self.message = ""
+        self.operation = ""
+        self.result: Optional[GitResult] = None
+        self.cancel = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def _state(self, submodule: Submodule):
+        if submodule.progress:
+            style = "error" if submodule.progress == "failed" else "info"
+            return submodule.progress, style
+        if submodule.error:
+            return "error: " + submodule.error, "error"
+        if not submodule.checked:
+            return "checking...", "info"
+        if not submodule.initialized:
+            return "not initialized", "warning"
+        state = submodule.describe()
+        if not state:
+            return "clean", "success"
+        return state, "unstaged" if submodule.dirty else "warning"
+    
+    def _render(self, index: int, selected: bool):
+        submodule = self.submodules.submodules[index]
+        state, style = self._state(submodule)
+        text = f"  {submodule.recorded[:7]}  {submodule.path:<32} {state}"
+        return text, self.theme.get("selected" if selected else style)
+    
+    def draw(self):
+        self.stdscr.erase()
+        max_y, max_x = self.stdscr.getmaxyx()
+        
+        count = len(self.submodules.submodules)
+        busy = f" [{self.operation}]" if self.running else ""
+        title = f" Submodules ({count}, {self.submodules.jobs} jobs){busy} "
+        self.stdscr.addnstr(0, 0, printable(title).ljust(max_x), max_x, self.theme.get("header"))
+        
+        self.list.resize(max(1, max_y - 4))
+        self.list.set_count(count)
+        self.list.draw(self.stdscr, 2, 0, max_x - 1, self._render)
+        if not count:
+            self.stdscr.addnstr(2, 2, "No submodules.", max_x - 3, self.theme.get("info"))
+        
+        try:
+            self.stdscr.addnstr(max_y - 2, 0, printable(self.message), max_x - 1, self.theme.get("info"))
+            self.stdscr.addnstr(max_y - 1, 0, FOOTER, max_x - 1, self.theme.get("footer"))
+        except curses.error:
+            pass
+        self.stdscr.refresh()
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def _start(self, operation: str, target):
+        if self.running:
+            self.message = f"{self.operation.capitalize()} is still running"
+            return
+        self.operation = operation
+        self.result = None
+        self.message = ""
+        self._thread = threading.Thread(target=target, name="gittui-submodules", daemon=True)
+        self._thread.start()
+    
+    def refresh(self):
+        if self.running:
+            self.message = f"{self.operation.capitalize()} is still running"
+            return
+        self.submodules.load()
+        self.cancel = threading.Event()
+        self._start("checking", lambda: self.submodules.status(cancel=self.cancel))
+    
+    def _command(self, operation: str, command):
+        def run():
+            self.result = command(lambda line: setattr(self, "message", line))
+            self.submodules.status(cancel=self.cancel)
+        
+        self._start(operation, run)
+    
+    def _finish(self):
+        result, self.result = self.result, None
+        if result is None:
+            self.message = "" if self.operation == "checking" else self.message
+        elif result.success:
+            self.message = f"{self.operation.capitalize()}: done"
+        else:
+            self.message = (result.error.strip() or "failed").split("\n")[-1]
+    
+    def show(self):
+        curses.curs_set(0)
+        self.refresh()
+        
+        try:
+            while True:
+                running = self.running
+                if not running and self.operation:
+                    self._finish()
+                    self.operation = ""
+                self.stdscr.timeout(POLL_MS if running else -1)
+                self.draw()
+                key = self.stdscr.getch()
+                
+                if key == -1:
+                    continue
+                if key in (ord('q'), 27):
+                    break
+                elif self.list.handle_key(key):
+                    pass
+                elif key == ord('r'):
+                    self.refresh()
+                elif key == ord('u'):
+                    self._command("updating", self.submodules.update)
+                elif key == ord('f'):
+                    self._command("fetching", self.submodules.fetch)
+        finally:
+            self.cancel.set()
+            self.submodules.stop()
+            self.stdscr.timeout(-1)
@@ -0,0 +1,37 @@
+"""Curses color pairs built from ThemeConfig."""
+
+import curses
+from typing import Dict
+
+from gittui.config.schema import ThemeConfig
+
+# pairs below this belong to the legacy menu theme, which stays on screen underneath
+PAIR_BASE = 16
+
+
+class Theme:
+    def __init__(self, config: ThemeConfig):
+        self.config = config
+        self.pairs: Dict[str, int] = {}
+    
+    def setup(self):
+        curses.start_color()
+        try:
+            curses.use_default_colors()
+        except curses.error:
+            pass
+        
+        has_colors = curses.has_colors()
+        for idx, (name, color) in enumerate(self.config.colors.items(), start=PAIR_BASE):
+            attr = curses.A_NORMAL
+            if has_colors and idx < curses.COLOR_PAIRS:
+                curses.init_pair(idx, color.get("fg", 7), color.get("bg", -1))
+                attr = curses.color_pair(idx)
+            if color.get("bold"):
+                attr |= curses.A_BOLD
+            if color.get("underline"):
+                attr |= curses.A_UNDERLINE
+            self.pairs[name] = attr
+    
+    def get(self, style: str) -> int:
+        return self.pairs.get(style, curses.A_NORMAL)
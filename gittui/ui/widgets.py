@@ -0,0 +1,153 @@
+"""Reusable curses widgets."""
+
+import curses
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from gittui.config.schema import KeybindingsConfig
+from gittui.git.output import ENCODING, ERRORS
+from gittui.ui.keys import parse_key
+
+ARROW_KEYS: Dict[int, str] = {
+    curses.KEY_UP: "up",
+    curses.KEY_DOWN: "down",
+    curses.KEY_PPAGE: "page_up",
+    curses.KEY_NPAGE: "page_down",
+    curses.KEY_HOME: "top",
+    curses.KEY_END: "bottom",
+}
+
+LIST_ACTIONS = ("up", "down", "page_up", "page_down", "top", "bottom")
+
+
+def navigation_keys(bindings: Optional[Dict[str, str]] = None) -> Dict[int, str]:
+    if bindings is None:
+        bindings = KeybindingsConfig().navigation
+    
+    keys = dict(ARROW_KEYS)
+    for action, spec in bindings.items():
+        if action in LIST_ACTIONS:
+            keys[parse_key(spec)] = action
+    return keys
+
+
+def printable(text: str) -> str:
+    try:
+        text.encode(ENCODING)
+        return text
+    except UnicodeEncodeError:
+        return text.encode(ENCODING, ERRORS).decode(ENCODING, "replace")
+
+
+class VirtualList:
+    def __init__(self, count: int = 0, height: int = 1,
+                 keys: Optional[Dict[int, str]] = None):
+        self.count = count
+        self.height = max(1, height)
+        self.selected = 0
+        self.top = 0
+        self.keys = keys if keys is not None else navigation_keys()
+    
+    def set_count(self, count: int):
+        self.count = count
+        self._clamp()
+    
+    def resize(self, height: int):
+        self.height = max(1, height)
+        self._clamp()
+    
+    def select(self, index: int):
+        self.selected = index
+        self._clamp()
+    
+    def move(self, delta: int):
+        self.select(self.selected + delta)
+    
+    def page_up(self):
+        self.move(-self.height)
+    
+    def page_down(self):
+        self.move(self.height)
+    
+    def to_top(self):
+        self.select(0)
+    
+    def to_bottom(self):
+        self.select(self.count - 1)
+    
+    def visible_range(self) -> range:
+        return range(self.top, min(self.count, self.top + self.height))
+    
+    def handle_action(self, action: str) -> bool:
+        if action == "up":
+            self.move(-1)
+        elif action == "down":
+            self.move(1)
+        elif action == "page_up":
+            self.page_up()
+        elif action == "page_down":
+            self.page_down()
+        elif action == "top":
+            self.to_top()
+        elif action == "bottom":
+            self.to_bottom()
+        else:
+            return False
+        return True
+    
+    def handle_key(self, key: int) -> bool:
+        action = self.keys.get(key)
+        return action is not None and self.handle_action(action)
+    
+    def draw(self, win, y: int, x: int, width: int,
+             render: Callable[[int, bool], Tuple[str, int]]):
+        if width <= 0:
+            return
+        
+        for row, index in enumerate(self.visible_range()):
+            text, attr = render(index, index == self.selected)
+            try:
+                win.addnstr(y + row, x, printable(text[:width]).ljust(width), width, attr)
+            except curses.error:
+                pass
+    
+    def _clamp(self):
+        if self.count <= 0:
+            self.selected = 0
+            self.top = 0
+            return
+        
+        self.selected = max(0, min(self.selected, self.count - 1))
+        
+        if self.selected < self.top:
+            self.top = self.selected
+        elif self.selected >= self.top + self.height:
+            self.top = self.selected - self.height + 1
+        
+        self.top = max(0, min(self.top, self.count - self.height))
+
+
+class WrapCache:
+    def __init__(self, lines: Sequence[str], max_entries: int = 4096):
+        self.lines = lines
+        self.max_entries = max_entries
+        self._rows: "OrderedDict[Tuple[int, int], List[str]]" = OrderedDict()
+    
+    def rows(self, index: int, width: int) -> List[str]:
+        # keyed on width too, so resizing back and forth reuses earlier wraps
+        key = (index, width)
+        rows = self._rows.get(key)
+        if rows is not None:
+            self._rows.move_to_end(key)
+            return rows
+        
+        text = self.lines[index]
+        width = max(1, width)
+        rows = [text[start:start + width] for start in range(0, len(text), width)] or [""]
+        self._rows[key] = rows
+        if len(self._rows) > self.max_entries:
+            self._rows.popitem(last=False)
+        return rows
+    
+    def clear(self):
+        self._rows.clear()
@@ -6,23 +6,40 @@ from actions.git import GitActions
 
 
 def main(stdscr):
+    git = None
     try:
         git = GitActions(stdscr)
         
         main_menu_items = [
+            ("Panel View", git.panel_view),
             ("Git Status", git.git_status),
             ("Git Add", git.git_add),
+            ("Git Unstage", git.git_unstage),
             ("Git Commit", git.git_commit),
             ("Git Push", git.git_push),
             ("Git Pull", git.git_pull),
             ("Git Fetch", git.git_fetch),
+            ("Git Stash", git.git_stash),
             ("Git Branch Management", git.git_branch_management),
             ("Git Checkout", git.git_checkout),
+            ("Sparse Checkout", git.sparse_checkout),
+            ("Worktrees", git.worktrees),
+            ("Submodules", git.submodules),
             ("Git Merge", git.git_merge),
             ("Git Rebase", git.git_rebase),
+            ("Interactive Rebase", git.git_rebase_interactive),
+            ("Resolve Conflicts", git.resolve_conflicts),
+            ("Undo / Redo", git.operation_journal),
             ("Git Log", git.git_log),
+            ("File History", git.git_file_history),
+            ("Search Commits", git.search_commits),
             ("Git Diff", git.git_diff),
+            ("Git Blame", git.git_blame),
             ("Git Remote", git.git_remote),
+            ("Repository Maintenance", git.repository_maintenance),
+            ("Repository Size", git.repository_size),
+            ("Custom Commands", git.custom_commands),
+            ("Plugins", git.plugins_menu),
             ("Clone Repository", git.clone_repository),
             ("Init Repository", git.init_repository),
             ("Exit", None)
@@ -39,6 +56,9 @@ def main(stdscr):
         stdscr.addstr(1, 0, "Press any key to exit...")
         stdscr.refresh()
         stdscr.getch()
+    finally:
+        if git is not None:
+            git.close()
 
 
 if __name__ == "__main__":
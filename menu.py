@@ -1,6 +1,29 @@
 import curses
 from typing import List, Tuple, Callable, Optional
 from utils.ui import Theme
+from gittui.config.loader import ConfigLoader
+from gittui.config.schema import Config
+from gittui.core.loop import InputLoop
+from gittui.ui.widgets import VirtualList, navigation_keys
+
+_config_loader = ConfigLoader()
+
+# called with 0 for every key, and with +1/-1 around every action
+_activity_listeners: List[Callable[[int], None]] = []
+
+
+def load_config() -> Config:
+    _config_loader.reload_if_changed()
+    return _config_loader.load()
+
+
+def add_activity_listener(listener: Callable[[int], None]):
+    _activity_listeners.append(listener)
+
+
+def _activity(delta: int):
+    for listener in _activity_listeners:
+        listener(delta)
 
 
 class Menu:
@@ -8,9 +31,12 @@ class Menu:
         self.stdscr = stdscr
         self.title = title
         self.items = items
-        self.selected = 0
+        self.config = load_config()
+        self.list = VirtualList(len(items), keys=navigation_keys(self.config.keybindings.navigation))
         self.theme = Theme()
         self.theme.setup()
+        self.loop: Optional[InputLoop] = None
+        self.size = stdscr.getmaxyx()
         
         self.stdscr.keypad(True)
         curses.cbreak()
@@ -18,30 +44,16 @@ class Menu:
         curses.curs_set(0)
     
     def draw(self):
-        self.stdscr.clear()
-        max_y, max_x = self.stdscr.getmaxyx()
+        self.stdscr.erase()
+        max_y, max_x = self.size
         
         header_text = f" {self.title} "
         self.stdscr.addstr(0, 0, header_text.ljust(max_x), self.theme.get('header'))
         
-        start_y = 2
-        for idx, (item_name, _) in enumerate(self.items):
-            y = start_y + idx
-            
-            if idx == self.selected:
-                prefix = "→ "
-                attr = self.theme.get('selected')
-            else:
-                prefix = "  "
-                attr = self.theme.get('normal')
-            
-            try:
-                display_text = f"{prefix}{item_name}"
-                self.stdscr.addstr(y, 2, display_text.ljust(max_x - 4)[:max_x - 4], attr)
-            except curses.error:
-                pass
+        self.list.resize(max_y - 3)
+        self.list.draw(self.stdscr, 2, 2, max_x - 4, self._render_item)
         
-        footer_text = "↑↓: Navigate | Enter: Select | q: Quit"
+        footer_text = "↑↓/jk: Navigate | PgUp/PgDn: Page | Enter: Select | q: Quit"
         try:
             self.stdscr.addstr(max_y - 1, 0, footer_text[:max_x - 1], self.theme.get('footer'))
         except curses.error:
@@ -49,37 +61,53 @@ class Menu:
         
         self.stdscr.refresh()
     
+    @property
+    def selected(self) -> int:
+        return self.list.selected
+    
+    def _render_item(self, index: int, selected: bool):
+        item_name, _ = self.items[index]
+        if selected:
+            return f"→ {item_name}", self.theme.get('selected')
+        return f"  {item_name}", self.theme.get('normal')
+    
     def run(self):
-        while True:
-            self.draw()
-            
-            key = self.stdscr.getch()
+        with InputLoop(self.stdscr, self.config.general.max_fps) as loop:
+            self.loop = loop
+            loop.run(self.draw, self._handle_key, on_resize=self._on_resize)
+    
+    def _on_resize(self):
+        self.size = self.stdscr.getmaxyx()
+    
+    def _handle_key(self, key: int) -> bool:
+        _activity(0)
+        if self.list.handle_key(key):
+            return True
+        
+        if key == 10 or key == curses.KEY_ENTER:
+            item_name, action = self.items[self.selected]
             
-            if key == curses.KEY_UP:
-                if self.selected > 0:
-                    self.selected -= 1
+            if action is None:
+                return False
             
-            elif key == curses.KEY_DOWN:
-                if self.selected < len(self.items) - 1:
-                    self.selected += 1
+            if item_name == "Exit":
+                return False
             
-            elif key == 10 or key == curses.KEY_ENTER:
-                item_name, action = self.items[self.selected]
-                
-                if action is None:
-                    return
-                
-                if item_name == "Exit":
-                    return
-                
+            # actions open blocking views of their own
+            with self.loop.suspended():
+                _activity(1)
                 try:
                     action()
                 except Exception as e:
                     from utils.ui import show_message
                     show_message(self.stdscr, f"Error executing action:\n{str(e)}", "error")
-            
-            elif key == ord('q') or key == ord('Q'):
-                return
-            
-            elif key == 27:
-                return
+                finally:
+                    _activity(-1)
+        
+        elif key == ord('q') or key == ord('Q'):
+            return False
+        
+        elif key == 27:
+            return False
+        
+        return True
@@ -0,0 +1,41 @@
+import subprocess
+from typing import Optional
+
+import pytest
+
+
+def git(cwd, *args, input=None, check=True) -> Optional[str]:
+    # with check=False a failing command returns None instead of raising
+    result = subprocess.run(["git", *args], cwd=str(cwd), input=input, stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        if check:
+            raise AssertionError(f"git {' '.join(args)} failed: {result.stderr.decode()}")
+        return None
+    return result.stdout.decode()
+
+
+def commit_file(cwd, path, content, message=None) -> str:
+    target = cwd / path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(content)
+    git(cwd, "add", "--", path)
+    git(cwd, "commit", "-q", "-m", message or f"Update {path}")
+    return git(cwd, "rev-parse", "HEAD").strip()
+
+
+@pytest.fixture(autouse=True)
+def git_environment(tmp_path_factory, monkeypatch):
+    # no user or system config, and a fixed identity for commits
+    monkeypatch.setenv("HOME", str(tmp_path_factory.mktemp("home")))
+    monkeypatch.setenv("GIT_CONFIG_NOSYSTEM", "1")
+    for role in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{role}_NAME", "Test")
+        monkeypatch.setenv(f"GIT_{role}_EMAIL", "test@example.com")
+
+
+@pytest.fixture
+def repo_dir(tmp_path):
+    path = tmp_path / "repo"
+    git(tmp_path, "init", "-q", "-b", "main", str(path))
+    return path
@@ -0,0 +1,65 @@
+import subprocess
+import sys
+
+import pytest
+
+from gittui.git.blame import Blame, BlameCache, parse_incremental
+from gittui.git.repository import Repository
+
+from conftest import commit_file
+
+SHA1 = "1" * 40
+SHA2 = "2" * 40
+
+INCREMENTAL = f"""{SHA1} 1 1 2
+author Ann
+author-mail <ann@example.com>
+author-time 100
+summary first commit
+boundary
+previous {SHA2} f
+filename f
+{SHA2} 3 3 1
+author Bob Smith
+author-time 200
+summary second
+filename f
+{SHA1} 5 4 1
+filename f
+""".encode()
+
+
+def test_parse_incremental():
+    groups = list(parse_incremental(INCREMENTAL.splitlines(keepends=True)))
+    assert [(c.sha, start, count) for c, start, count in groups] == [(SHA1, 1, 2), (SHA2, 3, 1), (SHA1, 4, 1)]
+    first, second, again = (commit for commit, _, _ in groups)
+    assert (first.author, first.author_time, first.summary, first.boundary) == ("Ann", 100, "first commit", True)
+    assert (second.author, second.author_time, second.summary, second.boundary) == ("Bob Smith", 200, "second", False)
+    # commit details are sent once; later groups reuse them
+    assert again is first
+
+
+def test_parse_incremental_ignores_noise():
+    assert list(parse_incremental([b"\n", b"garbage\n"])) == []
+
+
+def test_parse_incremental_rejects_bad_numbers():
+    with pytest.raises(ValueError):
+        list(parse_incremental([f"{SHA1} 1 x 2\n".encode()]))
+
+
+def test_read_errors_still_finish_the_blame():
+    blame = Blame("HEAD", b"f", b"a\nb\n")
+    blame._process = subprocess.Popen([sys.executable, "-c", f"print('{SHA1} 1 x 2')"], stdout=subprocess.PIPE)
+    blame._read()
+    assert blame.done
+    assert blame.error.startswith("Cannot read git blame output:")
+
+
+def test_blame_cache_annotates_every_line(repo_dir):
+    commit_file(repo_dir, "f", "a\nb\n", "first")
+    second = commit_file(repo_dir, "f", "a\nB\nc\n", "second")
+    blame = BlameCache(Repository(str(repo_dir))).get(b"f")
+    assert blame.wait(10) and blame.error is None
+    assert [commit.summary for commit in blame.annotations] == ["first", "second", "second"]
+    assert blame.annotations[1].sha == second and blame.annotated == 3
@@ -0,0 +1,102 @@
+import os
+
+import pytest
+
+from gittui.git.clone import CloneOptions, CloneProgress, clone, parse_size, update_progress
+
+from conftest import commit_file, git
+
+
+@pytest.mark.parametrize("url, target", [
+    ("https://example.com/org/project.git", "project"),
+    ("https://example.com/org/project", "project"),
+    ("https://example.com/org/project/", "project"),
+    ("https://example.com/org/project/.git", "project"),
+    ("https://example.com/org/project/.git/", "project"),
+    ("git@example.com:org/project.git", "project"),
+    ("git@example.com:project.git", "project"),
+    ("file:///srv/git/project.git", "project"),
+    ("/srv/git/project", "project"),
+    ("/", ""),
+])
+def test_target(url, target):
+    assert CloneOptions(url).target() == target
+    assert CloneOptions(url, directory="here").target() == "here"
+
+
+@pytest.mark.parametrize("options, args", [
+    (CloneOptions("u"), ["clone", "--progress", "--", "u", "u"]),
+    (CloneOptions("/x/u.git", filter="blob:none", depth=1, single_branch=True, branch="dev", sparse=["src"]),
+     ["clone", "--progress", "--filter=blob:none", "--depth=1", "--single-branch", "--branch", "dev", "--sparse",
+      "--", "/x/u.git", "u"]),
+])
+def test_args(options, args):
+    assert options.args() == args
+
+
+@pytest.mark.parametrize("line, expected", [
+    ("remote: Enumerating objects: 12, done.", ("Enumerating objects", None, 12, 12, 0, "")),
+    ("remote: Counting objects:  50% (5/10)", ("Counting objects", 50, 5, 10, 0, "")),
+    ("Receiving objects:  45% (450/1000), 1.50 MiB | 2.00 MiB/s",
+     ("Receiving objects", 45, 450, 1000, 1572864, "2.00 MiB/s")),
+    ("Resolving deltas: 100% (3/3), done.", ("Resolving deltas", 100, 3, 3, 0, "")),
+    ("Cloning into 'project'...", None),
+    ("warning: You appear to have cloned an empty repository.", None),
+])
+def test_update_progress(line, expected):
+    progress = CloneProgress()
+    assert update_progress(progress, line) == (expected is not None)
+    if expected is not None:
+        assert (progress.phase, progress.percent, progress.current, progress.total,
+                progress.received, progress.rate) == expected
+
+
+@pytest.mark.parametrize("text, size", [("12 B", 12), ("1.5 KiB", 1536), ("2 MiB", 2 << 20), ("7", 7)])
+def test_parse_size(text, size):
+    assert parse_size(text) == size
+
+
+@pytest.fixture
+def bare_url(tmp_path):
+    work = tmp_path / "work"
+    git(tmp_path, "init", "-q", "-b", "main", str(work))
+    commit_file(work, "README", "readme\n")
+    commit_file(work, "src/main.c", "int main;\n" * 500)
+    commit_file(work, "docs/guide.md", "guide\n" * 500)
+    commit_file(work, "src/main.c", "int main(void);\n" * 500)
+    bare = tmp_path / "project.git"
+    git(tmp_path, "clone", "-q", "--bare", str(work), str(bare))
+    git(bare, "config", "uploadpack.allowFilter", "true")
+    return f"file://{bare}"
+
+
+def test_partial_shallow_sparse_clone(tmp_path, bare_url):
+    phases = []
+    
+    def on_progress(progress):
+        phases.append(progress.phase)
+        return True
+    
+    options = CloneOptions(bare_url, filter="blob:none", depth=1, single_branch=True, sparse=["src"])
+    result = clone(options, cwd=str(tmp_path), on_progress=on_progress)
+    assert result.success, result.error
+    assert "Receiving objects" in phases
+    
+    target = tmp_path / "project"
+    assert os.path.isfile(target / "src" / "main.c")
+    assert os.path.isfile(target / "README")
+    assert not os.path.exists(target / "docs")
+    assert git(target, "rev-list", "--count", "HEAD").strip() == "1"
+    assert git(target, "config", "remote.origin.partialclonefilter").strip() == "blob:none"
+    assert git(target, "sparse-checkout", "list").split() == ["src"]
+
+
+def test_cancelled_clone_leaves_nothing_behind(tmp_path, bare_url):
+    result = clone(CloneOptions(bare_url), cwd=str(tmp_path), on_progress=lambda progress: False)
+    assert not result.success and result.error.endswith("\nCancelled.")
+    assert not os.path.exists(tmp_path / "project")
+
+
+def test_clone_failure_is_reported(tmp_path):
+    result = clone(CloneOptions(f"file://{tmp_path}/missing.git"), cwd=str(tmp_path))
+    assert not result.success and "missing.git" in result.error
@@ -0,0 +1,18 @@
+import pytest
+
+from gittui.git.commands import GitCommands
+
+
+@pytest.mark.parametrize("git_path, args, error", [
+    ("git", ["log", "--", "a\0b"], b"embedded null byte"),
+    ("/nonexistent/git", ["status"], b"Git is not installed or not in PATH"),
+])
+def test_execute_failures_return_results(tmp_path, git_path, args, error):
+    result = GitCommands(str(tmp_path), git_path).run(*args)
+    assert (result.success, result.returncode, result.stderr) == (False, -1, error)
+
+
+def test_run_keeps_output_as_bytes(tmp_path):
+    result = GitCommands(str(tmp_path)).run("init", "-q")
+    assert result.success and result.stdout == b""
+    assert GitCommands(str(tmp_path)).run("rev-parse", "--git-dir").stdout == b".git\n"
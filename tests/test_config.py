@@ -0,0 +1,82 @@
+import curses
+
+import pytest
+
+from gittui.config.loader import ConfigError, ConfigLoader, compile_keymap, validate
+from gittui.config.schema import KeybindingsConfig
+
+
+@pytest.mark.parametrize("data", [
+    None,
+    {},
+    {"general": {"max_fps": 60, "refresh_interval": 1}},
+    {"general": {"git_path": "/usr/bin/git"}, "layout": {"split_ratio": [0.4, 0.6]}},
+    {"theme": {"colors": {"header": {"fg": 1, "bold": True}}}},
+    {"keybindings": {"navigation": {"up": "up", "page_down": "ctrl+f"}, "files": {"stage": "f5"}}},
+    {"commands": {"custom": [{"name": "Log", "command": "git log", "key": None}]}},
+])
+def test_validate_accepts(data):
+    assert validate(data) == (data or {})
+
+
+@pytest.mark.parametrize("data, message", [
+    ([], "config: expected a mapping at the top level"),
+    ({"colours": {}}, "config: unknown section 'colours'"),
+    ({"general": []}, "general: expected a mapping"),
+    ({"general": {"max_fsp": 30}}, "general: unknown option 'max_fsp'"),
+    ({"general": {"max_fps": "fast"}}, "general.max_fps: expected int, got str"),
+    ({"general": {"max_fps": True}}, "general.max_fps: expected int, got bool"),
+    ({"layout": {"split_ratio": [0.5, "x"]}}, "layout.split_ratio[1]: expected float, got str"),
+    ({"theme": {"colors": {"header": {"fg": 1, "blink": True}}}}, "theme.colors.header: unknown option 'blink'"),
+    ({"keybindings": {"files": {"stage": "hyper+x"}}}, "keybindings.files.stage: Unknown key: 'hyper+x'"),
+    ({"commands": {"custom": [{"name": "Log"}]}}, "commands.custom[0]: missing required option 'command'"),
+])
+def test_validate_rejects(data, message):
+    with pytest.raises(ConfigError) as excinfo:
+        validate(data)
+    assert str(excinfo.value) == message
+
+
+@pytest.mark.parametrize("key, context, action", [
+    (ord("q"), "global_keys", "quit"),
+    (ord("k"), "files", "up"),
+    (4, "files", "page_down"),
+    (ord(" "), "files", "stage"),
+    (ord("d"), "files", "discard"),
+    (ord("d"), "stash", "drop"),
+    (ord("d"), "global_keys", None),
+    (curses.KEY_BTAB, "commits", "focus_prev"),
+    (ord("q"), "no_such_context", "quit"),
+])
+def test_compile_keymap(key, context, action):
+    assert compile_keymap(KeybindingsConfig()).lookup(key, context) == action
+
+
+def test_context_bindings_override_base_keys():
+    keybindings = KeybindingsConfig()
+    keybindings.files["stage_all"] = "q"
+    keymap = compile_keymap(keybindings)
+    assert keymap.lookup(ord("q"), "files") == "stage_all"
+    assert keymap.lookup(ord("q"), "commits") == "quit"
+
+
+def test_loader_reloads_on_change_and_keeps_last_good_config(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text('{"general": {"max_fps": 10}}')
+    loader = ConfigLoader(str(path))
+    assert loader.load().general.max_fps == 10
+    assert not loader.reload_if_changed()
+    
+    path.write_text('{"general": {"max_fps": "many"}}')
+    assert not loader.reload_if_changed()
+    assert loader.error == "general.max_fps: expected int, got str"
+    assert loader.load().general.max_fps == 10
+    
+    path.write_text('{"general": {"max_fps": 120}}')
+    assert loader.reload_if_changed()
+    assert loader.load().general.max_fps == 120 and loader.error is None
+
+
+def test_unreadable_config_is_a_config_error(tmp_path):
+    with pytest.raises(ConfigError):
+        ConfigLoader(str(tmp_path)).load()
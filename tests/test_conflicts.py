@@ -0,0 +1,107 @@
+import pytest
+
+from gittui.git.conflicts import BOTH, OURS, THEIRS, ConflictHunk, ConflictSet, parse_conflicts, parse_ls_files_u
+from gittui.git.repository import Repository
+
+from conftest import commit_file, git
+
+TWO_WAY = b"a\n<<<<<<< HEAD\nours\n=======\ntheirs\n>>>>>>> topic\nb\n"
+DIFF3 = b"<<<<<<< HEAD\nours\n||||||| base\nbase\n=======\ntheirs 1\ntheirs 2\n>>>>>>> topic\n"
+
+
+@pytest.mark.parametrize("data, shape", [
+    (b"", []),
+    (b"plain\ntext\n", [b"plain\n", b"text\n"]),
+    (TWO_WAY, [b"a\n", ([b"ours\n"], [], [b"theirs\n"], 2), b"b\n"]),
+    (DIFF3, [([b"ours\n"], [b"base\n"], [b"theirs 1\n", b"theirs 2\n"], 1)]),
+    # markers of the wrong length or out of order are text
+    (b"<<<<<< x\n=======\n>>>>>>>\n", [b"<<<<<< x\n", b"=======\n", b">>>>>>>\n"]),
+    (b"<<<<<<< HEAD\nours\n", [b"<<<<<<< HEAD\n", b"ours\n"]),
+    (b"<<<<<<< HEAD\n>>>>>>> x\n=======\n", [b"<<<<<<< HEAD\n", b">>>>>>> x\n", b"=======\n"]),
+])
+def test_parse_conflicts(data, shape):
+    segments = parse_conflicts(data)
+    assert [
+        (s.ours, s.base, s.theirs, s.line) if isinstance(s, ConflictHunk) else s for s in segments
+    ] == shape
+    # an unresolved file renders back to what was read
+    assert b"".join(b"".join(s.render()) if isinstance(s, ConflictHunk) else s for s in segments) == data
+
+
+@pytest.mark.parametrize("choice, rendered", [
+    (OURS, b"a\nours\nb\n"),
+    (THEIRS, b"a\ntheirs\nb\n"),
+    (BOTH, b"a\nours\ntheirs\nb\n"),
+])
+def test_render_choice(choice, rendered):
+    segments = parse_conflicts(TWO_WAY)
+    segments[1].choice = choice
+    assert b"".join(b"".join(s.render()) if isinstance(s, ConflictHunk) else s for s in segments) == rendered
+
+
+def test_parse_ls_files_u():
+    data = (b"100644 " + b"1" * 40 + b" 1\tf\x00100644 " + b"2" * 40 + b" 2\tf\x00100644 " + b"3" * 40 + b" 3\tf\x00"
+            b"100644 " + b"4" * 40 + b" 1\tgone\x00100644 " + b"5" * 40 + b" 2\tgone\x00")
+    entries = parse_ls_files_u(data)
+    assert {path: entry.kind for path, entry in entries.items()} == {b"f": "both modified", b"gone": "deleted by them"}
+    assert entries[b"gone"].has(OURS) and not entries[b"gone"].has(THEIRS)
+
+
+@pytest.fixture
+def conflicts(repo_dir):
+    commit_file(repo_dir, "a.txt", "1\n2\n3\n4\n5\n6\n7\n8\n")
+    commit_file(repo_dir, "b c.txt", "base\n")
+    commit_file(repo_dir, "gone.txt", "base\n")
+    git(repo_dir, "checkout", "-q", "-b", "topic")
+    commit_file(repo_dir, "a.txt", "1\nT2\n3\n4\n5\n6\n7\nT8\n")
+    commit_file(repo_dir, "b c.txt", "theirs\n")
+    commit_file(repo_dir, "gone.txt", "theirs\n")
+    git(repo_dir, "checkout", "-q", "main")
+    commit_file(repo_dir, "a.txt", "1\nO2\n3\n4\n5\n6\n7\nO8\n")
+    commit_file(repo_dir, "b c.txt", "ours\n")
+    git(repo_dir, "rm", "-q", "gone.txt")
+    git(repo_dir, "commit", "-q", "-m", "Remove gone.txt")
+    assert git(repo_dir, "merge", "topic", "--no-edit", check=False) is None
+    conflicts = ConflictSet(Repository(str(repo_dir)))
+    conflicts.load()
+    return conflicts
+
+
+def unmerged(repo_dir):
+    return git(repo_dir, "diff", "--name-only", "--diff-filter=U").split("\n")[:-1]
+
+
+def test_load_and_operation(repo_dir, conflicts):
+    assert conflicts.operation() == "merge"
+    assert [(entry.path, entry.kind) for entry in conflicts.paths()] == [
+        ("a.txt", "both modified"), ("b c.txt", "both modified"), ("gone.txt", "deleted by us")]
+    assert len(conflicts.file(b"a.txt").hunks) == 2
+
+
+def test_take_whole_files(repo_dir, conflicts):
+    assert conflicts.take([b"b c.txt", b"gone.txt"], OURS).success
+    assert (repo_dir / "b c.txt").read_text() == "ours\n"
+    assert not (repo_dir / "gone.txt").exists()
+    assert [entry.path for entry in conflicts.paths()] == ["a.txt"]
+    assert unmerged(repo_dir) == ["a.txt"]
+
+
+def test_choose_hunks_then_continue(repo_dir, conflicts):
+    first, second = conflicts.file(b"a.txt").hunks
+    assert conflicts.choose(b"a.txt", first, THEIRS).success
+    assert b"a.txt" in conflicts.entries
+    assert conflicts.choose(b"a.txt", second, BOTH).success
+    assert (repo_dir / "a.txt").read_text() == "1\nT2\n3\n4\n5\n6\n7\nO8\nT8\n"
+    assert b"a.txt" not in conflicts.entries
+    
+    assert conflicts.take([b"b c.txt", b"gone.txt"], THEIRS).success
+    assert conflicts.continue_().success
+    assert conflicts.operation() is None
+    assert git(repo_dir, "log", "-1", "--format=%P").count(" ") == 1
+
+
+def test_skip_refuses_a_merge_and_abort_restores(repo_dir, conflicts):
+    assert "cannot be skipped" in conflicts.skip().error
+    assert conflicts.abort().success
+    assert conflicts.operation() is None and conflicts.paths() == []
+    assert (repo_dir / "b c.txt").read_text() == "ours\n"
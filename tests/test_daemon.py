@@ -0,0 +1,90 @@
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import time
+
+import pytest
+
+from gittui.core.daemon import DaemonError, DaemonRepository, RepoDaemon, ensure_private
+from gittui.git.repository import BranchInfo, Repository
+
+from conftest import commit_file
+
+
+@pytest.fixture
+def served(repo_dir):
+    commit_file(repo_dir, "f", "one\n")
+    # sun_path is short, so the socket lives in a short private directory
+    directory = tempfile.mkdtemp(prefix="gt")
+    path = os.path.join(directory, "d.sock")
+    server = RepoDaemon(Repository(str(repo_dir)), path, idle_exit=60)
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not os.path.exists(path) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    yield server, path
+    server._server.shutdown()
+    thread.join(5)
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def test_client_reads_shared_sections(repo_dir, served):
+    _, path = served
+    (repo_dir / "f").write_text("two\n")
+    repo = DaemonRepository(str(repo_dir), path)
+    try:
+        repo.invalidate("status")
+        assert [(e.worktree, e.raw_path) for e in repo.status()] == [("M", b"f")]
+        assert repo.branch_info().name == "main"
+        assert repo.connected
+    finally:
+        repo.close()
+
+
+def test_hung_daemon_falls_back_to_git(repo_dir, served, monkeypatch):
+    server, path = served
+    handle = server.handle
+    
+    def slow(request):
+        if request.get("op") == "refresh":
+            time.sleep(2)
+        return handle(request)
+    
+    monkeypatch.setattr(server, "handle", slow)
+    repo = DaemonRepository(str(repo_dir), path, request_timeout=0.2)
+    try:
+        (repo_dir / "g").write_text("new\n")
+        repo.invalidate("status")
+        started = time.monotonic()
+        assert (b"g" in [e.raw_path for e in repo.status()])
+        assert time.monotonic() - started < 1.5
+        assert not repo.connected
+    finally:
+        repo.close()
+
+
+@pytest.mark.parametrize("values", [
+    {"name": "main", "upstream": "origin/main", "ahead": 1, "behind": 0},
+    {"name": "main", "upstream": None, "ahead": 0, "behind": 0, "detached": False},
+])
+def test_branch_info_ignores_unknown_fields(values):
+    assert BranchInfo.from_dict(values).name == "main"
+
+
+def test_ensure_private(tmp_path):
+    directory = str(tmp_path / "run")
+    ensure_private(directory)
+    assert stat.S_IMODE(os.lstat(directory).st_mode) == 0o700
+    
+    os.chmod(directory, 0o755)
+    with pytest.raises(DaemonError):
+        ensure_private(directory)
+    
+    link = str(tmp_path / "link")
+    os.mkdir(str(tmp_path / "elsewhere"), 0o700)
+    os.symlink(str(tmp_path / "elsewhere"), link)
+    with pytest.raises(DaemonError):
+        ensure_private(link)
@@ -0,0 +1,76 @@
+import pytest
+
+from gittui.git.diff import FileDiff, Hunk, build_patch, parse_diff
+
+TWO_FILES = b"""diff --git a/a.txt b/a.txt
+index 1111111..2222222 100644
+--- a/a.txt
++++ b/a.txt
+@@ -1,3 +1,3 @@ def f():
+ one
+-two
++TWO
+ three
+@@ -10 +10,2 @@
+ ten
++eleven
+\\ No newline at end of file
+diff --git a/b c.txt b/b c.txt
+new file mode 100644
+index 0000000..3333333
+--- /dev/null
++++ b/b c.txt\t
+@@ -0,0 +1 @@
++x
+diff --git a/img.png b/img.png
+index 4444444..5555555 100644
+Binary files a/img.png and b/img.png differ
+"""
+
+
+def test_parse_diff():
+    files = parse_diff(TWO_FILES, staged=True)
+    summary = [
+        (f.raw_path, f.binary, f.staged,
+         [(h.old_start, h.old_count, h.new_start, h.new_count, len(h.lines)) for h in f.hunks])
+        for f in files
+    ]
+    assert summary == [
+        (b"a.txt", False, True, [(1, 3, 1, 3, 4), (10, 1, 10, 2, 3)]),
+        (b"b c.txt", False, True, [(0, 0, 1, 1, 1)]),
+        (b"img.png", True, True, []),
+    ]
+    assert files[0].hunks[0].changes() == [1, 2]
+
+
+@pytest.mark.parametrize("data", [b"", b"not a diff\n", b"@@ -1 +1 @@\n-x\n+y\n"])
+def test_parse_diff_without_files(data):
+    assert parse_diff(data) == []
+
+
+HEADER = [b"diff --git a/f b/f", b"--- a/f", b"+++ b/f"]
+
+
+@pytest.mark.parametrize("lines, selected, reverse, expected", [
+    # the whole hunk
+    ([b" a", b"-b", b"+c", b" d"], None, False,
+     [b"@@ -1,3 +1,3 @@", b" a", b"-b", b"+c", b" d"]),
+    # only the addition: the deletion stays as context
+    ([b" a", b"-b", b"+c", b" d"], {2}, False,
+     [b"@@ -1,3 +1,4 @@", b" a", b" b", b"+c", b" d"]),
+    # only the deletion: the addition is dropped
+    ([b" a", b"-b", b"+c", b" d"], {1}, False,
+     [b"@@ -1,3 +1,2 @@", b" a", b"-b", b" d"]),
+    # unstaging the deletion: the addition is already in the index, so it is context
+    ([b" a", b"-b", b"+c", b" d"], {1}, True,
+     [b"@@ -5,4 +5,3 @@", b" a", b"-b", b" c", b" d"]),
+    # a marker after a dropped line goes with it
+    ([b" a", b"+b", b"\\ No newline at end of file"], set(), False,
+     [b"@@ -1,1 +1,1 @@", b" a"]),
+    ([b" a", b"+b", b"\\ No newline at end of file"], {1}, False,
+     [b"@@ -1,1 +1,2 @@", b" a", b"+b", b"\\ No newline at end of file"]),
+])
+def test_build_patch(lines, selected, reverse, expected):
+    diff = FileDiff(b"f", list(HEADER))
+    hunk = Hunk(b"@@", 1, 3, 5, 3, list(lines))
+    assert build_patch(diff, hunk, selected, reverse) == b"\n".join(HEADER + expected) + b"\n"
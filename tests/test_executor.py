@@ -0,0 +1,43 @@
+import sys
+import time
+
+import pytest
+
+from gittui.config.schema import CustomCommand
+from gittui.core.events import EventBus
+from gittui.plugins.executor import CommandContext, CommandError, CommandExecutor, placeholders, render, tokenize
+
+
+@pytest.mark.parametrize("command, values, argv", [
+    ("git log", {}, ["git", "log"]),
+    ("git checkout {branch}", {"branch": "main"}, ["git", "checkout", "main"]),
+    ("git commit -m {message}", {"message": "two words"}, ["git", "commit", "-m", "two words"]),
+    ("git log '{a}..{b}'", {"a": "v1", "b": "v2"}, ["git", "log", "v1..v2"]),
+])
+def test_render(command, values, argv):
+    tokens = tokenize(command)
+    assert placeholders(tokens) == set(values)
+    assert render(tokens, CommandContext(extra=values)) == argv
+
+
+@pytest.mark.parametrize("command, values", [
+    ("git log 'unterminated", {}),
+    ("git checkout {branch}", {}),
+])
+def test_render_errors(command, values):
+    with pytest.raises(CommandError):
+        render(tokenize(command), CommandContext(extra=values))
+
+
+def test_cancel_stops_running_and_queued_commands():
+    executor = CommandExecutor(EventBus(), max_workers=1)
+    command = CustomCommand("sleep", f"{sys.executable} -c 'import time; time.sleep(30)'")
+    futures = executor.run_many(command, [CommandContext(), CommandContext()])
+    deadline = time.monotonic() + 10
+    while not executor._processes and time.monotonic() < deadline:
+        time.sleep(0.01)
+    
+    executor.cancel()
+    assert futures[0].result(timeout=5) != 0
+    assert futures[1].cancelled()
+    executor.shutdown()
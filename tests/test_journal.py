@@ -0,0 +1,116 @@
+import json
+
+import pytest
+
+from gittui.git.journal import Journal, JournalError, RefState, transaction
+from gittui.git.repository import Repository
+
+from conftest import commit_file, git
+
+A, B, C = "a" * 40, "b" * 40, "c" * 40
+
+
+@pytest.mark.parametrize("target, current, lines", [
+    # moving the current branch back
+    (RefState("refs/heads/main", {"refs/heads/main": A}), RefState("refs/heads/main", {"refs/heads/main": B}),
+     ["update refs/heads/main " + A + " " + B]),
+    # restoring a deleted branch and deleting a created one, verifying the rest
+    (RefState("refs/heads/main", {"refs/heads/main": A, "refs/heads/old": B, "refs/heads/new": None}),
+     RefState("refs/heads/main", {"refs/heads/main": A, "refs/heads/old": None, "refs/heads/new": C}),
+     ["verify refs/heads/main " + A, "delete refs/heads/new " + C, "create refs/heads/old " + B]),
+    # back to a detached HEAD: HEAD itself is rewritten and its old branch is not verified
+    (RefState(None, {"HEAD": A, "refs/heads/main": B}), RefState("refs/heads/main", {"refs/heads/main": B}),
+     ["option no-deref", "update HEAD " + A]),
+    (RefState(None, {"HEAD": A}), RefState(None, {"HEAD": B}),
+     ["option no-deref", "update HEAD " + A + " " + B]),
+])
+def test_transaction(target, current, lines):
+    assert transaction(target, current).decode().splitlines() == ["start", *lines, "prepare", "commit"]
+
+
+@pytest.fixture
+def journal(repo_dir):
+    commit_file(repo_dir, "f", "one\n")
+    return Journal(Repository(str(repo_dir)))
+
+
+def head(repo_dir):
+    return git(repo_dir, "rev-parse", "HEAD").strip()
+
+
+def test_undo_and_redo_a_commit(repo_dir, journal):
+    first = head(repo_dir)
+    with journal.record("commit"):
+        second = commit_file(repo_dir, "f", "two\n")
+    (repo_dir / "other").write_text("local edit\n")
+    
+    assert journal.undo().label == "commit"
+    assert head(repo_dir) == first and (repo_dir / "f").read_text() == "one\n"
+    assert (repo_dir / "other").read_text() == "local edit\n"
+    assert not journal.can_undo() and journal.can_redo()
+    
+    journal.redo()
+    assert head(repo_dir) == second and (repo_dir / "f").read_text() == "two\n"
+    with pytest.raises(JournalError, match="Nothing to redo"):
+        journal.redo()
+    
+    # the journal survives a restart
+    reloaded = Journal(Repository(str(repo_dir)))
+    assert reloaded.can_undo() and not reloaded.can_redo()
+
+
+def test_undo_branch_delete_and_checkout(repo_dir, journal):
+    git(repo_dir, "branch", "topic")
+    topic = git(repo_dir, "rev-parse", "topic").strip()
+    with journal.record("delete topic", ("refs/heads/topic",)):
+        git(repo_dir, "branch", "-D", "topic")
+    with journal.record("checkout"):
+        git(repo_dir, "checkout", "-q", "-b", "work")
+    
+    journal.undo()
+    assert git(repo_dir, "symbolic-ref", "HEAD").strip() == "refs/heads/main"
+    journal.undo()
+    assert git(repo_dir, "rev-parse", "topic").strip() == topic
+
+
+def test_unchanged_refs_are_not_recorded(journal):
+    with journal.record("nothing"):
+        pass
+    assert not journal.can_undo()
+
+
+def test_new_record_drops_the_redo_tail(repo_dir, journal):
+    with journal.record("first"):
+        commit_file(repo_dir, "f", "two\n")
+    journal.undo()
+    with journal.record("second"):
+        commit_file(repo_dir, "g", "g\n")
+    assert [entry.label for entry in journal.entries] == ["second"] and not journal.can_redo()
+
+
+def test_refuses_when_refs_moved_or_an_operation_is_in_progress(repo_dir, journal):
+    with journal.record("commit"):
+        commit_file(repo_dir, "f", "two\n")
+    moved = commit_file(repo_dir, "f", "three\n")
+    with pytest.raises(JournalError, match="Refs have moved"):
+        journal.undo()
+    assert head(repo_dir) == moved
+    
+    git(repo_dir, "reset", "-q", "--hard", "HEAD~")
+    (repo_dir / ".git" / "MERGE_HEAD").write_text(moved + "\n")
+    with pytest.raises(JournalError, match="in progress"):
+        journal.undo()
+
+
+def test_journal_file_with_unknown_fields_loads(repo_dir, journal):
+    with journal.record("commit"):
+        commit_file(repo_dir, "f", "two\n")
+    path = journal._path()
+    with open(path) as f:
+        data = json.load(f)
+    data["entries"][0]["before"]["extra"] = 1
+    with open(path, "w") as f:
+        json.dump(data, f)
+    
+    reloaded = Journal(Repository(str(repo_dir)))
+    assert reloaded.can_undo() and reloaded.entries[0].label == "commit"
@@ -0,0 +1,73 @@
+import pytest
+
+from gittui.git.rebase import DROP, FIXUP, PICK, SQUASH, RebasePlan, RebasePlanError, split_autosquash
+from gittui.git.repository import Repository
+
+from conftest import commit_file, git
+
+
+@pytest.mark.parametrize("subject, expected", [
+    ("Add parser", (None, "Add parser")),
+    ("fixup! Add parser", (FIXUP, "Add parser")),
+    ("squash! Add parser", (SQUASH, "Add parser")),
+    ("fixup! fixup! Add parser", (FIXUP, "Add parser")),
+    ("squash! fixup! Add parser", (SQUASH, "Add parser")),
+    ("fixup!Add parser", (None, "fixup!Add parser")),
+    ("Revert \"fixup! Add parser\"", (None, "Revert \"fixup! Add parser\"")),
+    ("", (None, "")),
+])
+def test_split_autosquash(subject, expected):
+    assert split_autosquash(subject) == expected
+
+
+@pytest.fixture
+def plan(repo_dir):
+    commit_file(repo_dir, "base", "base\n", "Base")
+    commit_file(repo_dir, "a", "a\n", "Add a")
+    commit_file(repo_dir, "b", "b\n", "Add b")
+    commit_file(repo_dir, "a", "a fixed\n", "fixup! Add a")
+    commit_file(repo_dir, "c", "c\n", "Add c")
+    plan = RebasePlan(Repository(str(repo_dir)), "HEAD~4")
+    plan.load()
+    return plan
+
+
+def subjects(plan):
+    return [(item.action, item.commit.subject) for item in plan.items]
+
+
+def test_autosquash_and_run(repo_dir, plan):
+    assert not plan.changed()
+    assert plan.autosquash() == 1
+    assert subjects(plan) == [(PICK, "Add a"), (FIXUP, "fixup! Add a"), (PICK, "Add b"), (PICK, "Add c")]
+    plan.set_action(3, DROP)
+    assert plan.changed()
+    
+    assert plan.run().success
+    assert git(repo_dir, "log", "--format=%s", "HEAD~2..").split("\n")[:-1] == ["Add b", "Add a"]
+    assert (repo_dir / "a").read_text() == "a fixed\n" and not (repo_dir / "c").exists()
+
+
+@pytest.mark.parametrize("actions, message", [
+    ([DROP, DROP, DROP, DROP], "Every commit is dropped"),
+    ([FIXUP, PICK, PICK, PICK], "Cannot fixup without a previous commit"),
+    ([DROP, SQUASH, PICK, PICK], "Cannot squash without a previous commit"),
+])
+def test_validate(plan, actions, message):
+    for index, action in enumerate(actions):
+        plan.set_action(index, action)
+    with pytest.raises(RebasePlanError, match=message):
+        plan.validate()
+
+
+def test_todo_moves_branches_after_their_fixups(repo_dir, plan):
+    git(repo_dir, "branch", "first", "HEAD~3")
+    plan.load()
+    plan.autosquash()
+    plan.update_refs = True
+    assert plan.todo().decode().split("\n")[:4] == [
+        f"pick {plan.items[0].commit.sha} Add a",
+        f"fixup {plan.items[1].commit.sha} fixup! Add a",
+        "update-ref refs/heads/first",
+        f"pick {plan.items[2].commit.sha} Add b",
+    ]
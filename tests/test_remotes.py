@@ -0,0 +1,155 @@
+import json
+import os
+
+import pytest
+
+from gittui.git.remotes import (CHANGED, GONE, NEW, SNAPSHOT_FILE, UP_TO_DATE, RemoteInfo, RemoteSet,
+                                RemoteSnapshot, parse_ls_remote, parse_remote_config)
+from gittui.git.repository import Repository
+
+from conftest import commit_file, git
+
+
+def config(*pairs):
+    return b"".join(f"{key}\n{value}\0".encode() for key, value in pairs)
+
+
+@pytest.mark.parametrize("data, remotes, upstreams", [
+    (b"", {}, {}),
+    (config(("remote.origin.url", "git@host:a.git"),
+            ("remote.origin.fetch", "+refs/heads/*:refs/remotes/origin/*"),
+            ("branch.main.remote", "origin"),
+            ("branch.main.merge", "refs/heads/main")),
+     {"origin": (["git@host:a.git"], [], ["+refs/heads/*:refs/remotes/origin/*"])},
+     {"main": ("origin", "refs/heads/main")}),
+    # two-level keys name no remote or branch
+    (config(("remote.pushDefault", "origin"),
+            ("branch.autoSetupMerge", "always"),
+            ("remote.origin.url", "/srv/a.git")),
+     {"origin": (["/srv/a.git"], [], [])},
+     {}),
+    # remote and branch names may contain slashes and dots
+    (config(("remote.up/stream.url", "/srv/b.git"),
+            ("remote.my.fork.url", "/srv/c.git"),
+            ("remote.my.fork.pushurl", "/srv/c-push.git"),
+            ("remote.my.fork.url", "/srv/c-mirror.git"),
+            ("branch.release/1.0.remote", "my.fork"),
+            ("branch.topic.merge", "refs/heads/topic")),
+     {"up/stream": (["/srv/b.git"], [], []),
+      "my.fork": (["/srv/c.git", "/srv/c-mirror.git"], ["/srv/c-push.git"], [])},
+     {"release/1.0": ("my.fork", "")}),
+])
+def test_parse_remote_config(data, remotes, upstreams):
+    parsed, parsed_upstreams = parse_remote_config(data)
+    assert {name: (info.urls, info.push_urls, info.fetch) for name, info in parsed.items()} == remotes
+    assert parsed_upstreams == upstreams
+
+
+LS_REMOTE = b"""ref: refs/heads/main\tHEAD
+aaaa\tHEAD
+aaaa\trefs/heads/main
+bbbb\trefs/heads/feature/x
+cccc\trefs/tags/v1
+dddd\trefs/tags/v1^{}
+eeee\trefs/tags/v2
+ffff\trefs/pull/1/head
+"""
+
+
+@pytest.mark.parametrize("data, heads, tags, head", [
+    (b"", {}, 0, None),
+    (LS_REMOTE, {"main": "aaaa", "feature/x": "bbbb"}, 2, "main"),
+    (b"aaaa\tHEAD\naaaa\trefs/heads/main\n", {"main": "aaaa"}, 0, None),
+])
+def test_parse_ls_remote(data, heads, tags, head):
+    snapshot = parse_ls_remote(data)
+    assert (snapshot.heads, snapshot.tags, snapshot.head) == (heads, tags, head)
+    assert snapshot.timestamp and snapshot.checked == snapshot.timestamp and snapshot.error is None
+
+
+def test_branch_states():
+    info = RemoteInfo("origin", tracking={"main": "a", "old": "b", "same": "c"})
+    assert info.branch_states() == [("main", "a", None, ""), ("old", "b", None, ""), ("same", "c", None, "")]
+    
+    info.snapshot = RemoteSnapshot(timestamp=1.0, heads={"main": "z", "same": "c", "new": "d"})
+    assert info.branch_states() == [
+        ("main", "a", "z", CHANGED),
+        ("new", None, "d", NEW),
+        ("old", "b", None, GONE),
+        ("same", "c", "c", UP_TO_DATE),
+    ]
+
+
+@pytest.fixture
+def remote(tmp_path, repo_dir):
+    commit_file(repo_dir, "a.txt", "a\n")
+    git(repo_dir, "branch", "old")
+    git(repo_dir, "branch", "same")
+    bare = tmp_path / "remote.git"
+    git(tmp_path, "clone", "-q", "--bare", str(repo_dir), str(bare))
+    git(repo_dir, "remote", "add", "origin", str(bare))
+    git(repo_dir, "fetch", "-q", "origin")
+    git(repo_dir, "remote", "set-head", "origin", "--auto")
+    git(repo_dir, "branch", "-q", "--set-upstream-to=origin/main", "main")
+    return bare
+
+
+def test_refresh_against_bare_remote(tmp_path, repo_dir, remote):
+    # move, add and delete branches on the remote behind the local tracking refs
+    other = tmp_path / "other"
+    git(tmp_path, "clone", "-q", str(remote), str(other))
+    main = commit_file(other, "b.txt", "b\n")
+    git(other, "push", "-q", "origin", "main", "main:refs/heads/new", ":old")
+    
+    remotes = RemoteSet(Repository(str(repo_dir)))
+    info = remotes.load()["origin"]
+    assert info.url == str(remote)
+    assert info.head == "main"
+    assert [(branch.name, branch.upstream) for branch in info.branches] == [("main", "origin/main")]
+    assert info.snapshot is None
+    assert remotes.stale() == ["origin"]
+    
+    updated = []
+    remotes.refresh(on_update=updated.append)
+    assert updated == ["origin"]
+    assert not remotes.refreshing("origin")
+    assert remotes.stale() == []
+    tracked = info.tracking["main"]
+    assert info.branch_states() == [
+        ("main", tracked, main, CHANGED),
+        ("new", None, main, NEW),
+        ("old", tracked, None, GONE),
+        ("same", tracked, tracked, UP_TO_DATE),
+    ]
+    assert info.snapshot.head == "main"
+
+
+def test_refresh_failure_keeps_last_listing(repo_dir, remote):
+    remotes = RemoteSet(Repository(str(repo_dir)))
+    remotes.load()
+    remotes.refresh()
+    heads = remotes.remotes["origin"].snapshot.heads
+    
+    git(repo_dir, "remote", "set-url", "origin", str(remote) + "-missing")
+    remotes.refresh()
+    snapshot = remotes.remotes["origin"].snapshot
+    assert snapshot.heads == heads
+    assert snapshot.error
+
+
+def test_snapshots_survive_reload(repo_dir, remote):
+    remotes = RemoteSet(Repository(str(repo_dir)))
+    remotes.load()
+    remotes.refresh()
+    expected = remotes.remotes["origin"].snapshot
+    
+    path = os.path.join(git(repo_dir, "rev-parse", "--absolute-git-dir").strip(), SNAPSHOT_FILE)
+    with open(path) as f:
+        data = json.load(f)
+    # a newer version may add fields this one does not know
+    data["origin"]["unknown"] = True
+    with open(path, "w") as f:
+        json.dump(data, f)
+    
+    snapshot = RemoteSet(Repository(str(repo_dir))).load()["origin"].snapshot
+    assert snapshot == expected
@@ -0,0 +1,139 @@
+import os
+import subprocess
+import sys
+from array import array
+
+import pytest
+
+from gittui.git import search
+from gittui.git.repository import Repository
+from gittui.git.search import IndexBusy, SearchIndex, Segment, segment_span, write_segment
+
+from conftest import git
+
+
+def commit(repo_dir, path, message, author="Alice Smith <alice@example.com>"):
+    target = repo_dir / path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(message)
+    git(repo_dir, "add", "--", path)
+    git(repo_dir, "commit", "-q", "--author", author, "-m", message)
+
+
+@pytest.fixture
+def index(repo_dir):
+    commit(repo_dir, "src/parser.py", "Add the parser")
+    commit(repo_dir, "src/lexer.py", "Fix lexer crash on tabs", "Bob Jones <bob@example.com>")
+    commit(repo_dir, "docs/parsing.md", "Document parsing")
+    index = SearchIndex(Repository(str(repo_dir)))
+    assert index.update() == 3
+    yield index
+    index.close()
+
+
+def subjects(index, query):
+    return [index.doc(doc).subject for doc in index.search(query)]
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("parser", ["Add the parser"]),
+    ("pars", ["Document parsing", "Add the parser"]),
+    ("pars add", []),
+    ("add pars", ["Add the parser"]),
+    ("author:bob", ["Fix lexer crash on tabs"]),
+    ("author:alice", ["Document parsing", "Add the parser"]),
+    ("author:example.com", []),
+    ("author:example", ["Document parsing", "Fix lexer crash on tabs", "Add the parser"]),
+    ("path:src/", ["Fix lexer crash on tabs", "Add the parser"]),
+    ("path:src/lexer.py", ["Fix lexer crash on tabs"]),
+    ("path:docs/ document", ["Document parsing"]),
+    ("path:docs/ fix", []),
+    ("", []),
+    ("nothing", []),
+])
+def test_search(index, query, expected):
+    assert subjects(index, query) == expected
+
+
+def test_update_appends_only_new_commits(repo_dir, index):
+    assert index.update() == 0
+    commit(repo_dir, "src/parser.py", "Speed up the parser", "Bob Jones <bob@example.com>")
+    assert index.update() == 1
+    assert subjects(index, "author:bob parser") == ["Speed up the parser"]
+    assert index.count == 4
+
+
+def test_segments_are_merged_by_size(repo_dir, monkeypatch):
+    monkeypatch.setattr(search, "MERGE_FACTOR", 2)
+    index = SearchIndex(Repository(str(repo_dir)))
+    for number in range(9):
+        commit(repo_dir, f"f{number}", f"change number{number}")
+        assert index.update() == 1
+    
+    # nine one-commit updates in tiers of two leave 8 + 1 commits in two segments
+    names = [os.path.basename(segment.path) for segment in index.segments]
+    assert [segment_span(name) for name in names] == [(0, 8), (8, 9)]
+    assert sorted(n for n in os.listdir(index.directory) if n.startswith("seg-")) == names
+    assert len(index.search("change")) == 9
+    assert subjects(index, "number3") == ["change number3"]
+    index.close()
+
+
+def test_segment_lookup_reads_the_directory_in_place(tmp_path):
+    path = str(tmp_path / "seg")
+    terms = ["path:ä/x", "author:bob", "pa", "parse", "parser", "zz"]
+    write_segment(path, {term.encode(): array("I", [number]) for number, term in enumerate(terms)})
+    segment = Segment(path)
+    assert len(segment) == 6
+    assert not hasattr(segment, "terms")
+    assert segment.lookup("parse") == {3}
+    assert segment.lookup("par", prefix=True) == {3, 4}
+    assert segment.lookup("pa", prefix=True) == {0, 2, 3, 4}
+    assert segment.lookup("path:ä", prefix=True) == {0}
+    assert segment.lookup("a") == set() and segment.lookup("zzz", prefix=True) == set()
+    segment.close()
+
+
+def dead_pid() -> int:
+    process = subprocess.Popen([sys.executable, "-c", ""])
+    process.wait()
+    return process.pid
+
+
+def test_stale_lock_is_broken(index, repo_dir):
+    lock = os.path.join(index.directory, "lock")
+    with open(lock, "w") as f:
+        f.write(f"{dead_pid()}\n")
+    commit(repo_dir, "a", "After a crash")
+    assert index.update() == 1
+    assert not os.path.exists(lock)
+
+
+@pytest.mark.parametrize("content", [f"{os.getpid()}\n", "", "not a pid\n"])
+def test_live_or_unknown_lock_is_kept(index, content):
+    lock = os.path.join(index.directory, "lock")
+    with open(lock, "w") as f:
+        f.write(content)
+    with pytest.raises(IndexBusy):
+        index.update()
+    with open(lock) as f:
+        assert f.read() == content
+
+
+def test_breaking_a_lock_taken_meanwhile_gives_it_back(index, monkeypatch):
+    lock = os.path.join(index.directory, "lock")
+    with open(lock, "w") as f:
+        f.write(f"{dead_pid()}\n")
+    
+    def alive(pid):
+        # another process breaks the stale lock and takes it between our check and rename
+        os.unlink(lock)
+        assert SearchIndex._acquire(lock)
+        return False
+    
+    monkeypatch.setattr(SearchIndex, "_alive", staticmethod(alive))
+    assert not SearchIndex._break_stale(lock)
+    with open(lock) as f:
+        assert f.read() == f"{os.getpid()}\n"
+    assert os.listdir(index.directory).count("lock") == 1
+    assert not [name for name in os.listdir(index.directory) if ".stale." in name]
@@ -0,0 +1,52 @@
+import pytest
+
+from gittui.git.repository import Repository
+from gittui.git.sparse import SparseCheckout, SparseTree, parse_ls_tree_dirs
+
+from conftest import commit_file, git
+
+
+@pytest.fixture
+def sparse(repo_dir):
+    for path in ("top.txt", "src/app/main.c", "src/lib/util.c", "docs/guide.md"):
+        commit_file(repo_dir, path, f"{path}\n")
+    return SparseCheckout(Repository(str(repo_dir)))
+
+
+def test_parse_ls_tree_dirs():
+    data = b"040000 tree aaaa\tsrc\x00100644 blob bbbb\ttop.txt\x00160000 commit cccc\tsub\x00040000 tree dddd\ta b\x00"
+    assert parse_ls_tree_dirs(data) == [b"src", b"a b"]
+
+
+def test_cone_selection_round_trip(repo_dir, sparse):
+    assert not sparse.enabled() and sparse.directories() == set()
+    tree = SparseTree(sparse)
+    assert [node.raw_path for node in tree.nodes] == [b"docs", b"src"]
+    
+    tree.expand(1)
+    assert [node.raw_path for node in tree.nodes] == [b"docs", b"src", b"src/app", b"src/lib"]
+    assert tree.toggle_select(2)
+    assert [tree.state(index) for index in range(4)] == [" ", "~", "x", " "]
+    assert tree.apply().success
+    
+    assert sparse.enabled() and sparse.cone()
+    assert sparse.directories() == {b"src/app"}
+    assert (repo_dir / "top.txt").exists() and (repo_dir / "src/app/main.c").exists()
+    assert not (repo_dir / "src/lib").exists() and not (repo_dir / "docs").exists()
+    
+    # selecting a parent replaces its children, and dropping it is a removal
+    assert tree.toggle_select(1) and tree.selected == {b"src"}
+    assert not tree.toggle_select(3)
+    assert tree.removed() == set()
+    assert tree.toggle_select(1) and tree.removed() == {b"src/app"}
+
+
+def test_non_cone_patterns_are_not_converted(repo_dir, sparse):
+    git(repo_dir, "sparse-checkout", "set", "--no-cone", "/*", "!/*/", "*.md")
+    patterns = sparse.patterns()
+    assert patterns == [b"/*", b"!/*/", b"*.md"]
+    assert sparse.non_cone() and sparse.directories() is None
+    
+    result = SparseTree(sparse, {b"src"}).apply()
+    assert not result.success and "non-cone" in result.error
+    assert sparse.patterns() == patterns and not sparse.cone()
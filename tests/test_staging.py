@@ -0,0 +1,74 @@
+import pytest
+
+from gittui.git.repository import FileStatus, Repository
+from gittui.git.staging import StagingEngine, staged_view, unstaged_view
+
+from conftest import commit_file, git
+
+
+@pytest.mark.parametrize("entry, staged, unstaged", [
+    (FileStatus("?", "?", b"new"), ("A", " "), ("?", "?")),
+    (FileStatus(" ", "M", b"f"), ("M", " "), (" ", "M")),
+    (FileStatus(" ", "D", b"f"), ("D", " "), (" ", "D")),
+    (FileStatus("M", " ", b"f"), ("M", " "), (" ", "M")),
+    (FileStatus("M", "M", b"f"), ("M", " "), (" ", "M")),
+    (FileStatus("A", " ", b"f"), ("A", " "), ("?", "?")),
+    (FileStatus("R", " ", b"new", b"old"), ("R", " "), (" ", "M")),
+])
+def test_views(entry, staged, unstaged):
+    assert (staged_view(entry).index, staged_view(entry).worktree) == staged
+    assert (unstaged_view(entry).index, unstaged_view(entry).worktree) == unstaged
+
+
+def status(repo):
+    return {entry.raw_path: entry.index + entry.worktree for entry in repo.status()}
+
+
+def test_toggles_are_batched_until_flush(repo_dir):
+    commit_file(repo_dir, "tracked", "one\n")
+    (repo_dir / "tracked").write_text("two\n")
+    (repo_dir / "new file").write_text("x\n")
+    (repo_dir / "dir").mkdir()
+    (repo_dir / "dir" / "*").write_text("literal\n")
+    repo = Repository(str(repo_dir / "dir"))
+    engine = StagingEngine(repo)
+    entries = repo.status()
+    
+    shown = [engine.toggle(entry) for entry in entries]
+    assert engine.pending
+    assert {e.raw_path: e.index + e.worktree for e in shown} == {b"tracked": "M ", b"new file": "A ", b"dir/*": "A "}
+    # nothing reaches the index before flush
+    assert status(repo) == {b"tracked": " M", b"new file": "??", b"dir/*": "??"}
+    
+    assert all(result.success for result in engine.flush())
+    assert not engine.pending
+    assert status(repo) == {b"tracked": "M ", b"new file": "A ", b"dir/*": "A "}
+    
+    # a later toggle of the same path cancels the earlier one
+    engine.stage([FileStatus(" ", "M", b"tracked")])
+    engine.unstage([FileStatus("M", " ", b"tracked"), FileStatus("A", " ", b"dir/*")])
+    assert {e.raw_path: e.index + e.worktree for e in engine.apply(repo.status())} == {
+        b"tracked": " M", b"new file": "A ", b"dir/*": "??"}
+    assert all(result.success for result in engine.flush())
+    assert status(repo) == {b"tracked": " M", b"new file": "A ", b"dir/*": "??"}
+
+
+def test_unstage_before_the_first_commit(repo_dir):
+    (repo_dir / "a").write_text("a\n")
+    git(repo_dir, "add", "a")
+    repo = Repository(str(repo_dir))
+    engine = StagingEngine(repo)
+    assert engine.toggle(repo.status()[0]).index == "?"
+    assert all(result.success for result in engine.flush())
+    assert status(repo) == {b"a": "??"}
+
+
+def test_renames_stage_both_paths(repo_dir):
+    commit_file(repo_dir, "old", "content\n")
+    git(repo_dir, "mv", "old", "new")
+    git(repo_dir, "reset", "-q")
+    repo = Repository(str(repo_dir))
+    engine = StagingEngine(repo)
+    engine.stage([FileStatus("R", " ", b"new", b"old")])
+    assert all(result.success for result in engine.flush())
+    assert status(repo) == {b"new": "R "}
@@ -0,0 +1,17 @@
+import pytest
+
+from gittui.git.repository import parse_status_z
+
+
+@pytest.mark.parametrize("data, expected", [
+    (b"", []),
+    (b" M a.txt\0", [(" ", "M", b"a.txt", None)]),
+    (b"M  a b.txt\0?? new\0", [("M", " ", b"a b.txt", None), ("?", "?", b"new", None)]),
+    (b"R  new\0old\0 D gone\0", [("R", " ", b"new", b"old"), (" ", "D", b"gone", None)]),
+    (b"C  copy\0src\0", [("C", " ", b"copy", b"src")]),
+    (b"A  dir/f\xffx\0", [("A", " ", b"dir/f\xffx", None)]),
+    (b"M\0 M ok\0", [(" ", "M", b"ok", None)]),
+])
+def test_parse_status_z(data, expected):
+    entries = parse_status_z(data)
+    assert [(e.index, e.worktree, e.raw_path, e.raw_orig_path) for e in entries] == expected
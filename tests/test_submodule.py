@@ -0,0 +1,74 @@
+import pytest
+
+from gittui.git.repository import Repository
+from gittui.git.submodule import SubmoduleSet
+
+from conftest import commit_file, git
+
+
+@pytest.fixture
+def superproject(tmp_path, repo_dir):
+    library = tmp_path / "library"
+    git(tmp_path, "init", "-q", "-b", "main", str(library))
+    commit_file(library, "lib.txt", "one\n")
+    commit_file(repo_dir, "README", "readme\n")
+    # local paths as submodule URLs are refused by default since git 2.38.1
+    git(repo_dir, "-c", "protocol.file.allow=always", "submodule", "add", "-q", str(library), "lib")
+    git(repo_dir, "commit", "-q", "-m", "Add lib")
+    return repo_dir
+
+
+def test_load_and_status(superproject):
+    submodules = SubmoduleSet(Repository(str(superproject)), jobs=2)
+    (lib,) = submodules.load()
+    assert (lib.name, lib.path) == ("lib", "lib")
+    submodules.status()
+    assert lib.initialized and lib.checked
+    assert not lib.dirty and not lib.mismatched
+    assert lib.describe() == ""
+
+
+def test_annotate_modified_gitlink(superproject):
+    repo = Repository(str(superproject))
+    lib = superproject / "lib"
+    (lib / "lib.txt").write_text("changed\n")
+    (lib / "new.txt").write_text("new\n")
+    (superproject / "README").write_text("edited\n")
+    
+    entries = {entry.path: entry for entry in SubmoduleSet(repo).annotate(repo.status())}
+    assert entries["lib"].worktree == "M"
+    assert entries["lib"].submodule == "1 changed, 1 untracked"
+    assert entries["README"].submodule is None
+    
+    git(lib, "add", "-A")
+    head = commit_file(lib, "lib.txt", "committed\n")
+    entries = {entry.path: entry for entry in SubmoduleSet(repo).annotate(repo.status())}
+    assert entries["lib"].submodule.startswith(f"at {head[:7]}, recorded ")
+
+
+def test_annotate_clean_tree(superproject):
+    repo = Repository(str(superproject))
+    assert SubmoduleSet(repo).annotate(repo.status()) == []
+
+
+def test_apply_line(superproject):
+    submodules = SubmoduleSet(Repository(str(superproject)))
+    submodules.load()
+    lib = submodules.apply_line("Submodule path 'lib': checked out '0123abcd'")
+    assert lib is not None and lib.progress == "checked out"
+    assert submodules.apply_line("fatal: Failed to clone 'lib'. Retry scheduled") is lib
+    assert lib.progress == "failed" and lib.error.startswith("fatal:")
+    assert submodules.apply_line("unrelated output") is None
+
+
+def test_stop_terminates_running_command(superproject, tmp_path):
+    submodules = SubmoduleSet(Repository(str(superproject)))
+    submodules.load()
+    cache = tmp_path / "cache"
+    cache.mkdir(mode=0o700)
+    
+    # the credential cache daemon prints "ok" and then serves until it is killed
+    result = submodules._run(["credential-cache--daemon", str(cache / "socket")], "queued",
+                             lambda line: submodules.stop())
+    assert result.returncode < 0
+    assert submodules._process is None
@@ -1,7 +1,10 @@
 import curses
 import json
 import os
-from typing import List, Tuple, Optional
+from typing import List, Sequence, Tuple, Optional
+from gittui.config.loader import ConfigError, load_config
+from gittui.core.loop import DEFAULT_FPS, InputLoop
+from gittui.ui.widgets import WrapCache, printable
 
 
 class Theme:
@@ -61,59 +64,136 @@ class Theme:
 
 
 class ScrollableWindow:
-    def __init__(self, stdscr, lines: List[str], title: str = "Output"):
+    def __init__(self, stdscr, lines: Sequence[str], title: str = "Output"):
         self.stdscr = stdscr
         self.lines = lines
         self.title = title
         self.scroll_pos = 0
+        self.scroll_row = 0
+        self.wrap = False
+        self.wrapped = WrapCache(lines)
         self.theme = Theme()
         self.theme.setup()
     
     def show(self):
         curses.curs_set(0)
-        max_y, max_x = self.stdscr.getmaxyx()
-        visible_lines = max_y - 4
+        self._relayout()
         
-        while True:
-            self.stdscr.clear()
-            
-            self.stdscr.addstr(0, 0, f" {self.title} ".ljust(max_x), self.theme.get('header'))
-            
-            for i in range(visible_lines):
-                line_num = self.scroll_pos + i
-                if line_num < len(self.lines):
-                    line = self.lines[line_num][:max_x - 2]
-                    try:
-                        self.stdscr.addstr(i + 2, 0, line, self.theme.get('normal'))
-                    except curses.error:
-                        pass
-            
-            status = f"Lines {self.scroll_pos + 1}-{min(self.scroll_pos + visible_lines, len(self.lines))} / {len(self.lines)}"
-            self.stdscr.addstr(max_y - 2, 0, status, self.theme.get('info'))
-            
-            footer = "↑↓: Scroll | PgUp/PgDn: Page | Home/End: Jump | q/Esc: Back"
-            self.stdscr.addstr(max_y - 1, 0, footer[:max_x - 1], self.theme.get('footer'))
-            
-            self.stdscr.refresh()
-            
-            key = self.stdscr.getch()
-            
-            if key == ord('q') or key == 27:
+        try:
+            max_fps = load_config().general.max_fps
+        except ConfigError:
+            max_fps = DEFAULT_FPS
+        with InputLoop(self.stdscr, max_fps) as loop:
+            loop.run(self.draw, self._handle_key, on_resize=self._relayout)
+    
+    def _relayout(self):
+        self.max_y, self.max_x = self.stdscr.getmaxyx()
+        self.visible_lines = max(1, self.max_y - 4)
+        self.width = max(1, self.max_x - 2)
+        self.scroll_row = min(self.scroll_row, self._row_count(self.scroll_pos) - 1)
+        if self._fill() < self.visible_lines:
+            self._to_end()
+    
+    def _row_count(self, index: int) -> int:
+        if not self.wrap or index >= len(self.lines):
+            return 1
+        return len(self.wrapped.rows(index, self.width))
+    
+    def _fill(self) -> int:
+        # screen rows available from the top line on, counted no further than one screen
+        rows = -self.scroll_row
+        index = self.scroll_pos
+        while index < len(self.lines) and rows <= self.visible_lines:
+            rows += self._row_count(index)
+            index += 1
+        return rows
+    
+    def _to_end(self):
+        needed = self.visible_lines
+        for index in range(len(self.lines) - 1, -1, -1):
+            count = self._row_count(index)
+            if count >= needed:
+                self.scroll_pos, self.scroll_row = index, count - needed
+                return
+            needed -= count
+        self.scroll_pos, self.scroll_row = 0, 0
+    
+    def _down(self, count: int):
+        for _ in range(count):
+            if self._fill() <= self.visible_lines:
+                break
+            if self.scroll_row + 1 < self._row_count(self.scroll_pos):
+                self.scroll_row += 1
+            else:
+                self.scroll_pos += 1
+                self.scroll_row = 0
+    
+    def _up(self, count: int):
+        for _ in range(count):
+            if self.scroll_row > 0:
+                self.scroll_row -= 1
+            elif self.scroll_pos > 0:
+                self.scroll_pos -= 1
+                self.scroll_row = self._row_count(self.scroll_pos) - 1
+            else:
                 break
-            elif key == curses.KEY_DOWN:
-                if self.scroll_pos < len(self.lines) - visible_lines:
-                    self.scroll_pos += 1
-            elif key == curses.KEY_UP:
-                if self.scroll_pos > 0:
-                    self.scroll_pos -= 1
-            elif key == curses.KEY_NPAGE:
-                self.scroll_pos = min(self.scroll_pos + 10, max(0, len(self.lines) - visible_lines))
-            elif key == curses.KEY_PPAGE:
-                self.scroll_pos = max(self.scroll_pos - 10, 0)
-            elif key == curses.KEY_HOME:
-                self.scroll_pos = 0
-            elif key == curses.KEY_END:
-                self.scroll_pos = max(0, len(self.lines) - visible_lines)
+    
+    def draw(self):
+        max_y, max_x = self.max_y, self.max_x
+        self.stdscr.erase()
+        
+        self.stdscr.addstr(0, 0, f" {self.title} ".ljust(max_x), self.theme.get('header'))
+        
+        # only the lines on screen are truncated or wrapped
+        y = 2
+        index = self.scroll_pos
+        row = self.scroll_row
+        last = index - 1
+        while y < 2 + self.visible_lines and index < len(self.lines):
+            if self.wrap:
+                segments = self.wrapped.rows(index, self.width)[row:]
+            else:
+                segments = [self.lines[index][:self.width]]
+            for segment in segments[:2 + self.visible_lines - y]:
+                try:
+                    self.stdscr.addstr(y, 0, printable(segment), self.theme.get('normal'))
+                except curses.error:
+                    pass
+                y += 1
+            last = index
+            index += 1
+            row = 0
+        
+        status = f"Lines {self.scroll_pos + 1}-{last + 1} / {len(self.lines)}"
+        footer = "↑↓: Scroll | PgUp/PgDn: Page | Home/End: Jump | w: Wrap | q/Esc: Back"
+        try:
+            self.stdscr.addstr(max_y - 2, 0, status[:max_x - 1], self.theme.get('info'))
+            self.stdscr.addstr(max_y - 1, 0, footer[:max_x - 1], self.theme.get('footer'))
+        except curses.error:
+            pass
+        
+        self.stdscr.refresh()
+    
+    def _handle_key(self, key: int) -> bool:
+        if key == ord('q') or key == 27:
+            return False
+        elif key == curses.KEY_DOWN:
+            self._down(1)
+        elif key == curses.KEY_UP:
+            self._up(1)
+        elif key == curses.KEY_NPAGE:
+            self._down(10)
+        elif key == curses.KEY_PPAGE:
+            self._up(10)
+        elif key == curses.KEY_HOME:
+            self.scroll_pos, self.scroll_row = 0, 0
+        elif key == curses.KEY_END:
+            self._to_end()
+        elif key == ord('w'):
+            self.wrap = not self.wrap
+            self.scroll_row = 0
+            self._relayout()
+        return True
 
 
 class InputDialog: